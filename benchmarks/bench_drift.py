@@ -0,0 +1,71 @@
+"""Drift detection throughput and peak memory.
+
+Usage:
+    python benchmarks/bench_drift.py [--lines N] [--window W] [--records-only] [--workers N]
+
+With --records-only, synthetic records are fed straight to
+DriftDetector.detect_records, measuring the sliding window alone.
+With --workers N > 1, the file is scanned with DriftDetector.detect_parallel.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import resource
+from pathlib import Path
+
+from log_sculptor.core.drift import DriftDetector
+from log_sculptor.core.patterns import ParsedRecord, learn_patterns
+
+
+def generate_log(path: Path, lines: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    with path.open("w") as f:
+        for i in range(lines):
+            # The format switches every 20k lines, with some noise.
+            if (i // 20_000) % 2 == 0 or rng.random() < 0.05:
+                f.write(f"2024-01-15 10:{i % 60:02d}:00 INFO request {i} took {rng.randint(1, 999)}ms\n")
+            else:
+                f.write(f"level=info msg=request id={i} duration={rng.randint(1, 999)}\n")
+
+
+def synthetic_records(lines: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(lines):
+        pattern_id = "a" if (i // 20_000) % 2 == 0 or rng.random() < 0.05 else "b"
+        yield ParsedRecord(i + 1, "line", {}, pattern_id, True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--window", type=int, default=100)
+    parser.add_argument("--records-only", action="store_true")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    detector = DriftDetector(window_size=args.window)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.records_only:
+            run = lambda: detector.detect_records(synthetic_records(args.lines))  # noqa: E731
+        else:
+            path = Path(tmp) / "drift.log"
+            generate_log(path, args.lines)
+            patterns = learn_patterns(path, sample_size=50_000)
+            if args.workers > 1:
+                run = lambda: detector.detect_parallel(path, patterns, workers=args.workers)  # noqa: E731
+            else:
+                run = lambda: detector.detect(path, patterns)  # noqa: E731
+
+        start = time.perf_counter()
+        report = run()
+        elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{report.total_lines} lines, {len(report.format_changes)} changes")
+    print(f"detect: {elapsed:.2f}s  {report.total_lines / elapsed:,.0f} lines/s  peak RSS {peak:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
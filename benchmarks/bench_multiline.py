@@ -0,0 +1,84 @@
+"""Multiline joining throughput on a stack-trace-heavy Java log.
+
+Usage:
+    python benchmarks/bench_multiline.py [--entries N] [--repeat R] [--learned] [--workers W]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from log_sculptor.core.reader import iter_lines
+from log_sculptor.parsers.chunking import parallel_join_multiline
+from log_sculptor.parsers.multiline import join_multiline_numbered, learn_entry_start
+
+FRAMES = [
+    "\tat com.example.Service.process(Service.java:{n})",
+    "\tat com.example.Controller.handleRequest(Controller.java:{n})",
+    "\tat org.springframework.web.servlet.FrameworkServlet.service(FrameworkServlet.java:{n})",
+    "\tat sun.reflect.NativeMethodAccessorImpl.invoke0(Native Method)",
+    "\tat java.base/java.lang.Thread.run(Thread.java:{n})",
+]
+
+
+def generate_log(path: Path, entries: int, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    lines = 0
+    with path.open("w") as f:
+        for i in range(entries):
+            ts = f"2024-01-15 10:{i // 60 % 60:02d}:{i % 60:02d}.{rng.randint(0, 999):03d}"
+            kind = rng.random()
+            if kind < 0.6:
+                f.write(f"{ts} INFO [main-{i % 8}] Handled request id={i} in {rng.randint(1, 999)}ms\n")
+                lines += 1
+            elif kind < 0.9:
+                f.write(f"{ts} ERROR [main-{i % 8}] Failed to process request id={i}\n")
+                f.write(f"java.lang.IllegalStateException: bad state '{i}' (code {rng.randint(1, 99)})\n")
+                depth = rng.randint(5, 25)
+                for _ in range(depth):
+                    f.write(rng.choice(FRAMES).format(n=rng.randint(10, 999)) + "\n")
+                f.write("Caused by: java.io.IOException: Connection reset\n")
+                f.write(f"\t... {rng.randint(1, 9)} more\n")
+                lines += depth + 4
+            else:
+                f.write(f'{ts} DEBUG Payload {{"id": {i}, "tags": ["a", "b"],\n')
+                f.write(f'  "note": "x(y) [z]"}}\n')
+                lines += 2
+    return lines
+
+
+def run(path: Path, learned: bool = False, workers: int = 1) -> tuple[float, int]:
+    start = time.perf_counter()
+    entry_start = learn_entry_start(iter_lines(path)) if learned else None
+    if workers > 1:
+        entries = parallel_join_multiline(path, workers=workers, entry_start=entry_start, chunk_bytes=4 << 20)
+    else:
+        entries = join_multiline_numbered(iter_lines(path), entry_start=entry_start)
+    count = sum(1 for _ in entries)
+    return time.perf_counter() - start, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--learned", action="store_true", help="Learn the entry-start signature first")
+    parser.add_argument("--workers", type=int, default=1, help="Join with parallel_join_multiline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "java.log"
+        lines = generate_log(path, args.entries)
+        size = path.stat().st_size
+        best, count = min(run(path, args.learned, args.workers) for _ in range(args.repeat))
+        mode = "learned" if args.learned else "heuristic"
+        if args.workers > 1:
+            mode += f", {args.workers} workers"
+        print(f"{lines} lines, {size / 1e6:.1f} MB -> {count} entries")
+        print(f"{mode}: {best:.2f}s  {size / best / 1e6:.1f} MB/s  {lines / best:,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
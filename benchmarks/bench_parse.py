@@ -0,0 +1,60 @@
+"""End-to-end parse throughput: str pipeline vs bytes mode.
+
+Usage:
+    python benchmarks/bench_parse.py [--lines N] [--repeat R]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from log_sculptor.core.patterns import learn_patterns
+from log_sculptor.core.streaming import stream_parse
+
+
+def generate_log(path: Path, lines: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    levels = ["INFO", "WARN", "ERROR", "DEBUG"]
+    with path.open("w") as f:
+        for i in range(lines):
+            kind = rng.random()
+            if kind < 0.5:
+                f.write(
+                    f"2024-01-15 10:{i % 60:02d}:{i % 60:02d} {rng.choice(levels)} [worker-{i % 8}] "
+                    f"user{rng.randint(1, 500)} request from 10.0.{i % 255}.{rng.randint(1, 254)} took {rng.randint(1, 999)}ms\n"
+                )
+            elif kind < 0.8:
+                f.write(f'10.1.{i % 255}.7 - - "GET /api/items/{i} HTTP/1.1" 200 {rng.randint(100, 9999)}\n')
+            else:
+                f.write(f"{rng.choice(levels)} job {i} finished status=ok retries={rng.randint(0, 3)}\n")
+
+
+def run(path: Path, patterns, bytes_mode: bool) -> float:
+    start = time.perf_counter()
+    for _ in stream_parse(path, patterns, detect_types=False, bytes_mode=bytes_mode):
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.log"
+        generate_log(path, args.lines)
+        size = path.stat().st_size
+        patterns = learn_patterns(path, sample_size=10_000)
+
+        print(f"{args.lines} lines, {size / 1e6:.1f} MB, {len(patterns.patterns)} patterns")
+        for label, bytes_mode in (("str", False), ("bytes", True)):
+            best = min(run(path, patterns, bytes_mode) for _ in range(args.repeat))
+            print(f"{label:>6}: {best:.2f}s  {size / best / 1e9:.4f} GB/s ({size / best / 1e6:.1f} MB/s)  {args.lines / best:,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,17 +12,40 @@ from log_sculptor.outputs.sqlite import write_sqlite
 
 FORMAT_CHOICES = ["jsonl", "sqlite", "duckdb", "parquet"]
 
+MULTILINE_CHOICES = ["heuristic", "learned"]
 
-def _preprocess_lines(logfile: Path, multiline: bool):
-    """Preprocess log file lines, optionally joining multi-line entries."""
-    if multiline:
-        from log_sculptor.parsers.multiline import join_multiline
-        with logfile.open("r", errors="replace") as f:
-            yield from join_multiline(f)
-    else:
-        with logfile.open("r", errors="replace") as f:
-            for line in f:
-                yield line.rstrip("\n\r")
+
+def _multiline_option(f):
+    """Add --multiline/--no-multiline and --multiline-mode to a command."""
+    f = click.option("--multiline-mode", type=click.Choice(MULTILINE_CHOICES), default=None,
+                     help="How entry starts are found (implies --multiline; default heuristic)")(f)
+    return click.option("--multiline/--no-multiline", default=False, help="Handle multi-line log entries")(f)
+
+
+def _multiline_mode(multiline: bool, mode: str | None) -> str | None:
+    """Get the multi-line detector to use, or None to read single lines."""
+    if mode is not None:
+        return mode
+    return "heuristic" if multiline else None
+
+
+def _learn_entry_start(logfile: Path):
+    """Learn the entry-start signature from the head of a log file."""
+    from log_sculptor.core.reader import iter_lines
+    from log_sculptor.parsers.multiline import learn_entry_start
+
+    entry_start = learn_entry_start(iter_lines(logfile))
+    if entry_start is None:
+        raise click.ClickException(f"Cannot learn entry starts from {logfile}: no unindented lines")
+    return entry_start
+
+
+def _multiline_entries(logfile: Path, entry_start=None):
+    """Join multi-line entries into single lines, numbered by the line each starts on."""
+    from log_sculptor.core.reader import iter_lines
+    from log_sculptor.parsers.multiline import join_multiline_numbered
+
+    return join_multiline_numbered(iter_lines(logfile), separator=" ", entry_start=entry_start)
 
 
 @click.group()
@@ -39,31 +62,30 @@ def main() -> None:
 @click.option("--min-frequency", type=int, default=1, help="Minimum pattern frequency")
 @click.option("--cluster/--no-cluster", default=False, help="Use similarity-based clustering")
 @click.option("--cluster-threshold", type=float, default=0.7, help="Clustering similarity threshold")
-@click.option("--multiline/--no-multiline", default=False, help="Handle multi-line log entries")
+@_multiline_option
 @click.option("--update", type=click.Path(exists=True, path_type=Path), help="Update existing patterns file")
 @click.option("--merge-threshold", type=float, default=0.8, help="Similarity threshold for merging patterns")
+@click.option("--literals/--no-literals", default=False, help="Emit low-cardinality tokens as literals")
+@click.option("--max-literal-values", type=int, default=1, help="Max distinct values to split a position into literals")
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output")
 def learn(logfile: Path, output: Path, sample_size: int | None, min_frequency: int,
-          cluster: bool, cluster_threshold: float, multiline: bool, update: Path | None,
-          merge_threshold: float, verbose: bool) -> None:
+          cluster: bool, cluster_threshold: float, multiline: bool, multiline_mode: str | None,
+          update: Path | None, merge_threshold: float, literals: bool, max_literal_values: int,
+          verbose: bool) -> None:
     """Learn patterns from a log file."""
+    multiline_mode = _multiline_mode(multiline, multiline_mode)
     if verbose:
         click.echo(f"Learning patterns from {logfile}...")
 
-    if multiline:
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".log", delete=False) as tmp:
-            for line in _preprocess_lines(logfile, multiline=True):
-                # Collapse multi-line entries into single lines for pattern learning
-                collapsed = line.replace("\n", " ").replace("\r", "")
-                tmp.write(collapsed + "\n")
-            tmp_path = Path(tmp.name)
-        patterns = learn_patterns(tmp_path, sample_size=sample_size, min_frequency=min_frequency,
-                                 use_clustering=cluster, cluster_threshold=cluster_threshold)
-        tmp_path.unlink()
-    else:
-        patterns = learn_patterns(logfile, sample_size=sample_size, min_frequency=min_frequency,
-                                 use_clustering=cluster, cluster_threshold=cluster_threshold)
+    entry_start = _learn_entry_start(logfile) if multiline_mode == "learned" else None
+    if entry_start is not None and verbose:
+        click.echo(f"Entry starts: {' '.join(t.value for t in entry_start.prefix)}")
+
+    source = _multiline_entries(logfile, entry_start) if multiline_mode else logfile
+    patterns = learn_patterns(source, sample_size=sample_size, min_frequency=min_frequency,
+                              use_clustering=cluster, cluster_threshold=cluster_threshold,
+                              detect_literals=literals, max_literal_values=max_literal_values)
+    patterns.entry_start = entry_start
 
     if verbose:
         click.echo(f"Found {len(patterns.patterns)} patterns")
@@ -86,33 +108,123 @@ def learn(logfile: Path, output: Path, sample_size: int | None, min_frequency: i
 @click.option("-o", "--output", required=True, type=click.Path(path_type=Path), help="Output file")
 @click.option("--include-raw", is_flag=True, help="Include raw line")
 @click.option("--include-unmatched/--no-include-unmatched", default=True)
-@click.option("--multiline/--no-multiline", default=False, help="Handle multi-line log entries")
+@_multiline_option
+@click.option("--adaptive/--no-adaptive", default=False, help="Reorder patterns by live hit rate")
+@click.option("--match-stats", type=click.Path(path_type=Path), help="Write pattern hit statistics (JSON)")
+@click.option("--cache-size", type=int, default=0, help="Cache results for up to N distinct lines")
+@click.option("--cache-skeleton", is_flag=True, help="Also cache lines that differ only in digits")
+@click.option("--since", help="Only lines at or after this time (timestamp or duration like 15m)")
+@click.option("--until", help="Only lines before this time (timestamp or duration like 5m)")
+@click.option("--time-tolerance", default="0s", help="How far out of order lines may be (e.g. 30s)")
+@click.option("--timezone", "time_zone", default="UTC", show_default=True,
+              help="Zone of log timestamps without an offset, for --since/--until: UTC, local, or a name "
+                   "like Europe/Berlin (durations like 15m count back from now, so local-time logs need local)")
+@click.option("--resume", is_flag=True, help="Checkpoint progress and continue an interrupted parse")
+@click.option("--checkpoint-every", type=int, default=100_000, show_default=True,
+              help="Lines parsed between checkpoints (with --resume)")
+@click.option("--follow", is_flag=True, help="Keep parsing lines appended to the file (like tail -F)")
+@click.option("--poll-interval", type=float, default=0.25, show_default=True,
+              help="Seconds between checks for new lines (with --follow)")
+@click.option("--idle-timeout", type=float, default=None,
+              help="Stop following after this many seconds without new lines")
 @click.option("-v", "--verbose", is_flag=True)
 def parse(logfile: Path, patterns: Path, output_format: str, output: Path,
-          include_raw: bool, include_unmatched: bool, multiline: bool, verbose: bool) -> None:
+          include_raw: bool, include_unmatched: bool, multiline: bool, multiline_mode: str | None,
+          adaptive: bool, match_stats: Path | None, cache_size: int, cache_skeleton: bool,
+          since: str | None, until: str | None, time_tolerance: str, time_zone: str, resume: bool,
+          checkpoint_every: int, follow: bool, poll_interval: float, idle_timeout: float | None,
+          verbose: bool) -> None:
     """Parse a log file using learned patterns."""
+    multiline_mode = _multiline_mode(multiline, multiline_mode)
+    if follow:
+        if multiline_mode or since or until or resume:
+            raise click.UsageError("--follow cannot be combined with --multiline, --since, --until or --resume")
+        if output_format in ("duckdb", "parquet"):
+            # Parquet would get one part file per poll, all read back on close.
+            raise click.UsageError(f"--follow is not supported for {output_format} output")
+    if resume:
+        if multiline_mode or since or until:
+            raise click.UsageError("--resume cannot be combined with --multiline, --since or --until")
+        if output_format == "duckdb":
+            raise click.UsageError("--resume is not supported for duckdb output")
+        if checkpoint_every < 1:
+            raise click.BadParameter("must be positive", param_hint="--checkpoint-every")
+
+    time_range = None
+    if since or until:
+        from log_sculptor.core.timerange import (
+            parse_duration,
+            parse_time_bound,
+            parse_time_zone,
+        )
+        if multiline_mode:
+            raise click.UsageError("--since/--until cannot be combined with --multiline")
+        try:
+            tz = parse_time_zone(time_zone)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--timezone") from e
+        try:
+            time_range = (
+                parse_time_bound(since) if since else None,
+                parse_time_bound(until) if until else None,
+            )
+        except ValueError as e:
+            raise click.BadParameter(str(e)) from e
+        tolerance = parse_duration(time_tolerance)
+        if tolerance is None:
+            raise click.BadParameter(f"Invalid duration: {time_tolerance!r}", param_hint="--time-tolerance")
+
     pattern_set = PatternSet.load(patterns)
     if verbose:
         click.echo(f"Loaded {len(pattern_set.patterns)} patterns, parsing {logfile}...")
 
-    tmp_path = None
-    if multiline:
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".log", delete=False) as tmp:
-            for line in _preprocess_lines(logfile, multiline=True):
-                collapsed = line.replace("\n", " ").replace("\r", "")
-                tmp.write(collapsed + "\n")
-            tmp_path = Path(tmp.name)
-        records = parse_logs(tmp_path, pattern_set)
+    matcher = adaptive_matcher = cache = None
+    if adaptive or match_stats:
+        from log_sculptor.core.matching import AdaptiveMatcher
+        matcher = adaptive_matcher = AdaptiveMatcher(pattern_set)
+    if cache_size > 0:
+        from log_sculptor.core.matching import CachingMatcher
+        matcher = cache = CachingMatcher(pattern_set, matcher=matcher, max_size=cache_size,
+                                         skeleton=cache_skeleton)
+
+    if follow:
+        _follow_parse(logfile, pattern_set, output_format, output, include_raw, include_unmatched,
+                      poll_interval, idle_timeout, matcher, verbose)
+        return
+
+    if resume:
+        _resume_parse(logfile, pattern_set, output_format, output, include_raw, include_unmatched,
+                      checkpoint_every, matcher, verbose)
+        return
+
+    if multiline_mode:
+        entry_start = None
+        if multiline_mode == "learned":
+            entry_start = pattern_set.entry_start
+            if entry_start is None:
+                if verbose:
+                    click.echo("No entry-start signature in patterns file, learning one from the log")
+                entry_start = _learn_entry_start(logfile)
+        records = parse_logs(_multiline_entries(logfile, entry_start), pattern_set, matcher=matcher)
+    elif time_range is not None:
+        from log_sculptor.core.timerange import parse_time_range
+        records = parse_time_range(logfile, pattern_set, *time_range, tolerance=tolerance, matcher=matcher, tz=tz)
     else:
-        records = parse_logs(logfile, pattern_set)
+        records = parse_logs(logfile, pattern_set, matcher=matcher)
 
-    # Consume iterator to list before cleanup (needed for multiline temp file)
     records_list = list(records)
 
-    # Clean up temp file after records are consumed
-    if tmp_path:
-        tmp_path.unlink()
+    if verbose and cache is not None:
+        click.echo(f"Cache hit ratio: {cache.stats.hit_ratio:.1%}")
+    if adaptive_matcher is not None:
+        if verbose:
+            click.echo(f"Average attempts per line: {adaptive_matcher.stats.avg_attempts:.2f}")
+        if match_stats:
+            from log_sculptor.exceptions import OutputError
+            try:
+                adaptive_matcher.stats.save(match_stats, cache=cache.stats if cache is not None else None)
+            except OutputError as e:
+                raise click.ClickException(str(e)) from e
 
     if not include_unmatched:
         records_list = [r for r in records_list if r.matched]
@@ -133,6 +245,92 @@ def parse(logfile: Path, patterns: Path, output_format: str, output: Path,
     click.echo(f"Parsed {count} records -> {output}")
 
 
+def _resume_parse(logfile: Path, pattern_set: PatternSet, output_format: str, output: Path,
+                  include_raw: bool, include_unmatched: bool, checkpoint_every: int,
+                  matcher, verbose: bool) -> None:
+    """Run a checkpointed parse, continuing from an existing checkpoint if there is one."""
+    from log_sculptor.core.checkpoint import Checkpoint, checkpoint_path, resumable_parse
+    from log_sculptor.exceptions import CheckpointError
+    from log_sculptor.outputs import open_writer
+
+    ckpt_file = checkpoint_path(output)
+    checkpoint = None
+    if ckpt_file.exists():
+        checkpoint = Checkpoint.load(ckpt_file)
+        try:
+            checkpoint.validate(logfile, pattern_set, output_format)
+        except CheckpointError as e:
+            if not checkpoint.complete:
+                raise click.ClickException(f"Cannot resume: {e} (delete {ckpt_file} to start over)")
+            # A finished run for another file or pattern set: start fresh.
+            checkpoint = None
+        if checkpoint is not None and checkpoint.complete:
+            click.echo(f"Nothing to resume: {logfile} already parsed -> {output}")
+            return
+        if checkpoint is not None and verbose:
+            click.echo(f"Resuming at line {checkpoint.line_number + 1} (byte {checkpoint.offset})")
+
+    writer = open_writer(output_format, output, patterns=pattern_set, include_raw=include_raw,
+                         state=checkpoint.output_state if checkpoint else None)
+    result = resumable_parse(logfile, pattern_set, writer, ckpt_file, output_format,
+                             checkpoint=checkpoint, checkpoint_every=checkpoint_every,
+                             detect_types=output_format != "jsonl", matcher=matcher,
+                             include_unmatched=include_unmatched)
+    click.echo(f"Parsed {result.records} records -> {output}")
+
+
+def _follow_parse(logfile: Path, pattern_set: PatternSet, output_format: str, output: Path,
+                  include_raw: bool, include_unmatched: bool, poll_interval: float,
+                  idle_timeout: float | None, matcher, verbose: bool) -> None:
+    """Follow a growing file, writing each batch and checkpointing the position after it."""
+    from log_sculptor.core.checkpoint import Checkpoint, checkpoint_path, patterns_hash
+    from log_sculptor.core.follow import FollowPosition, follow_parse
+    from log_sculptor.outputs import open_writer
+
+    ckpt_file = checkpoint_path(output)
+    checkpoint = None
+    position = None
+    if ckpt_file.exists():
+        checkpoint = Checkpoint.load(ckpt_file)
+        if checkpoint.patterns_hash != patterns_hash(pattern_set) or checkpoint.output_format != output_format:
+            raise click.ClickException(
+                f"Cannot continue: {ckpt_file} was written for other patterns or format (delete it to start over)"
+            )
+        identity = checkpoint.identity
+        position = FollowPosition(checkpoint.offset, checkpoint.line_number,
+                                  identity.get("device", 0), identity.get("inode", 0))
+        if verbose:
+            click.echo(f"Continuing {logfile} at byte {checkpoint.offset}")
+    else:
+        checkpoint = Checkpoint(source=str(logfile), identity={}, patterns_hash=patterns_hash(pattern_set),
+                                output_format=output_format)
+
+    writer = open_writer(output_format, output, patterns=pattern_set, include_raw=include_raw,
+                         state=checkpoint.output_state)
+    batches = follow_parse(logfile, pattern_set, position=position, poll_interval=poll_interval,
+                           detect_types=output_format != "jsonl", matcher=matcher,
+                           include_unmatched=include_unmatched, idle_timeout=idle_timeout)
+    count = 0
+    try:
+        for records, pos in batches:
+            count += writer.write(records)
+            # Output first, position second: a crash in between re-reads the
+            # batch and the writer drops its partial copy on reopen.
+            checkpoint.output_state = writer.flush()
+            checkpoint.offset, checkpoint.line_number = pos.offset, pos.line_number
+            checkpoint.identity = {"device": pos.device, "inode": pos.inode}
+            checkpoint.records += len(records)
+            checkpoint.save(ckpt_file)
+            if verbose and records:
+                click.echo(f"{len(records)} records (line {pos.line_number})")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        batches.close()
+        writer.close()
+    click.echo(f"Parsed {count} records -> {output}")
+
+
 @main.command()
 @click.argument("logfile", type=click.Path(exists=True, path_type=Path))
 @click.option("-f", "--format", "output_format", type=click.Choice(FORMAT_CHOICES), default="jsonl")
@@ -140,39 +338,29 @@ def parse(logfile: Path, patterns: Path, output_format: str, output: Path,
 @click.option("--sample-size", type=int, default=None)
 @click.option("--include-raw", is_flag=True)
 @click.option("--cluster/--no-cluster", default=False)
-@click.option("--multiline/--no-multiline", default=False, help="Handle multi-line log entries")
+@_multiline_option
+@click.option("--literals/--no-literals", default=False, help="Emit low-cardinality tokens as literals")
+@click.option("--max-literal-values", type=int, default=1, help="Max distinct values to split a position into literals")
 @click.option("-v", "--verbose", is_flag=True)
 def auto(logfile: Path, output_format: str, output: Path, sample_size: int | None,
-         include_raw: bool, cluster: bool, multiline: bool, verbose: bool) -> None:
+         include_raw: bool, cluster: bool, multiline: bool, multiline_mode: str | None, literals: bool,
+         max_literal_values: int, verbose: bool) -> None:
     """Learn patterns and parse in one step."""
+    multiline_mode = _multiline_mode(multiline, multiline_mode)
     if verbose:
         click.echo(f"Learning patterns from {logfile}...")
 
-    tmp_path = None
-    if multiline:
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".log", delete=False) as tmp:
-            for line in _preprocess_lines(logfile, multiline=True):
-                collapsed = line.replace("\n", " ").replace("\r", "")
-                tmp.write(collapsed + "\n")
-            tmp_path = Path(tmp.name)
-        pattern_set = learn_patterns(tmp_path, sample_size=sample_size, use_clustering=cluster)
-        if verbose:
-            click.echo(f"Found {len(pattern_set.patterns)} patterns, parsing...")
-        records = parse_logs(tmp_path, pattern_set)
-    else:
-        pattern_set = learn_patterns(logfile, sample_size=sample_size, use_clustering=cluster)
-        if verbose:
-            click.echo(f"Found {len(pattern_set.patterns)} patterns, parsing...")
-        records = parse_logs(logfile, pattern_set)
+    entry_start = _learn_entry_start(logfile) if multiline_mode == "learned" else None
+    # Multiline entries are joined again for parsing rather than kept in memory.
+    source = _multiline_entries(logfile, entry_start) if multiline_mode else logfile
+    pattern_set = learn_patterns(source, sample_size=sample_size, use_clustering=cluster,
+                                 detect_literals=literals, max_literal_values=max_literal_values)
+    if verbose:
+        click.echo(f"Found {len(pattern_set.patterns)} patterns, parsing...")
+    records = parse_logs(_multiline_entries(logfile, entry_start) if multiline_mode else logfile, pattern_set)
 
-    # Consume iterator to list before cleanup (needed for multiline temp file)
     records_list = list(records)
 
-    # Clean up temp file after records are consumed
-    if tmp_path:
-        tmp_path.unlink()
-
     if output_format == "jsonl":
         count = write_jsonl(records_list, output, include_raw=include_raw)
     elif output_format == "sqlite":
@@ -195,6 +383,8 @@ def show(patterns_file: Path) -> None:
     """Display patterns from a patterns file."""
     pattern_set = PatternSet.load(patterns_file)
     click.echo(f"Patterns: {len(pattern_set.patterns)}")
+    if pattern_set.entry_start is not None:
+        click.echo(f"Entry starts: {' '.join(t.value for t in pattern_set.entry_start.prefix)}")
     for i, p in enumerate(pattern_set.patterns, 1):
         click.echo(f"\nPattern {i}: {p.id}")
         click.echo(f"  Frequency: {p.frequency}, Confidence: {p.confidence:.2f}")
@@ -244,16 +434,54 @@ def merge(patterns_file: Path, output: Path | None, threshold: float, verbose: b
 @click.argument("logfile", type=click.Path(exists=True, path_type=Path))
 @click.option("-p", "--patterns", required=True, type=click.Path(exists=True, path_type=Path), help="Patterns file")
 @click.option("--window", type=int, default=100, help="Window size for drift detection")
+@click.option("--follow", is_flag=True, help="Monitor lines appended to the file instead of analyzing it once")
+@click.option("--change-threshold", type=float, default=0.5, show_default=True,
+              help="Window share a new dominant pattern needs (with --follow)")
+@click.option("--unmatched-threshold", type=float, default=0.2, show_default=True,
+              help="Unmatched share of the window that raises an alert (with --follow)")
+@click.option("--events", type=click.Path(path_type=Path), help="Append events as JSON lines (default: stdout)")
+@click.option("--poll-interval", type=float, default=0.25, show_default=True,
+              help="Seconds between checks for new lines (with --follow)")
+@click.option("--idle-timeout", type=float, default=None,
+              help="Stop following after this many seconds without new lines")
+@click.option("--bucket", help="Compare pattern mixes of time buckets of this width (e.g. 1m, 1h)")
+@click.option("--method", type=click.Choice(["js", "chi2"]), default="js", show_default=True,
+              help="Divergence between buckets: Jensen-Shannon or normalized chi-square (with --bucket)")
+@click.option("--divergence-threshold", type=float, default=0.3, show_default=True,
+              help="Divergence that counts as drift (with --bucket)")
+@click.option("--histogram", type=click.Path(path_type=Path), help="Write bucket histograms here (with --bucket)")
+@click.option("--histogram-format", type=click.Choice(["sqlite", "parquet"]), default="sqlite", show_default=True)
+@click.option("--workers", type=int, default=1, show_default=True, help="Scan the file with parallel workers")
 @click.option("-v", "--verbose", is_flag=True)
-def drift(logfile: Path, patterns: Path, window: int, verbose: bool) -> None:
+def drift(logfile: Path, patterns: Path, window: int, follow: bool, change_threshold: float,
+          unmatched_threshold: float, events: Path | None, poll_interval: float,
+          idle_timeout: float | None, bucket: str | None, method: str, divergence_threshold: float,
+          histogram: Path | None, histogram_format: str, workers: int, verbose: bool) -> None:
     """Detect format changes in a log file."""
     from log_sculptor.core.drift import detect_drift
 
+    if workers < 1:
+        raise click.BadParameter("must be positive", param_hint="--workers")
+    if workers > 1 and (follow or bucket):
+        raise click.UsageError("--workers cannot be combined with --follow or --bucket")
     pattern_set = PatternSet.load(patterns)
+    if bucket:
+        if follow:
+            raise click.UsageError("--bucket cannot be combined with --follow")
+        _bucket_drift(logfile, pattern_set, bucket, method, divergence_threshold, histogram,
+                      histogram_format, verbose)
+        return
+    if histogram:
+        raise click.UsageError("--histogram requires --bucket")
+    if follow:
+        _follow_drift(logfile, pattern_set, window, change_threshold, unmatched_threshold, events,
+                      poll_interval, idle_timeout, verbose)
+        return
     if verbose:
-        click.echo(f"Analyzing {logfile} for format changes...")
+        click.echo(f"Analyzing {logfile} for format changes..."
+                   + (f" using {workers} workers" if workers > 1 else ""))
 
-    report = detect_drift(logfile, pattern_set, window_size=window)
+    report = detect_drift(logfile, pattern_set, window_size=window, workers=workers)
 
     click.echo(report.summary())
 
@@ -262,6 +490,149 @@ def drift(logfile: Path, patterns: Path, window: int, verbose: bool) -> None:
     sys.exit(0)
 
 
+def _bucket_drift(logfile: Path, pattern_set: PatternSet, bucket: str, method: str, threshold: float,
+                  histogram: Path | None, histogram_format: str, verbose: bool) -> None:
+    """Report drift as divergence between the pattern mixes of adjacent time buckets."""
+    from log_sculptor.core.histogram import build_histogram
+    from log_sculptor.core.timerange import parse_duration
+
+    width = parse_duration(bucket)
+    if width is None or width.total_seconds() < 1:
+        raise click.BadParameter(f"Invalid duration: {bucket!r}", param_hint="--bucket")
+    if verbose:
+        click.echo(f"Building {bucket} pattern histograms for {logfile}...")
+
+    hist = build_histogram(logfile, pattern_set, bucket_seconds=int(width.total_seconds()))
+    shifts = hist.shifts(threshold, method)
+
+    click.echo(f"Lines: {hist.records} ({hist.untimed} before the first timestamp)")
+    click.echo(f"Buckets: {len(hist.buckets)}")
+    click.echo(f"Distribution shifts: {len(shifts)}")
+    if shifts:
+        click.echo("\nShifts detected at:")
+        for shift in shifts[:5]:
+            click.echo(f"  {shift.bucket_start.isoformat()}: {shift.old_pattern_id} -> {shift.new_pattern_id}"
+                       f" ({method} {shift.divergence:.3f})")
+        if len(shifts) > 5:
+            click.echo(f"  ... and {len(shifts) - 5} more")
+
+    if histogram:
+        if histogram_format == "parquet":
+            from log_sculptor.outputs.parquet import (
+                write_histogram_parquet as write_histogram,
+            )
+        else:
+            from log_sculptor.outputs.sqlite import (
+                write_histogram_sqlite as write_histogram,
+            )
+        from log_sculptor.exceptions import OutputError
+        try:
+            rows = write_histogram(hist, histogram)
+        except OutputError as e:
+            raise click.ClickException(str(e)) from e
+        if verbose:
+            click.echo(f"Wrote {rows} histogram rows to {histogram}")
+
+    sys.exit(1 if shifts else 0)
+
+
+def _follow_drift(logfile: Path, pattern_set: PatternSet, window: int, change_threshold: float,
+                  unmatched_threshold: float, events: Path | None, poll_interval: float,
+                  idle_timeout: float | None, verbose: bool) -> None:
+    """Follow a growing file and report drift events as they happen."""
+    import orjson
+
+    from log_sculptor.core.drift import DriftMonitor
+    from log_sculptor.core.follow import follow_parse
+
+    out = events.open("ab") if events else None
+
+    def report(event) -> None:
+        line = orjson.dumps(event.to_dict())
+        if out is None:
+            click.echo(line.decode())
+        else:
+            out.write(line + b"\n")
+            out.flush()
+
+    try:
+        monitor = DriftMonitor(report, window_size=window, change_threshold=change_threshold,
+                               unmatched_threshold=unmatched_threshold)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--window") from e
+    if verbose:
+        click.echo(f"Monitoring {logfile} for format changes...", err=True)
+    batches = follow_parse(logfile, pattern_set, poll_interval=poll_interval, detect_types=False,
+                           idle_timeout=idle_timeout)
+    try:
+        for records, _ in batches:
+            monitor.update_many(records)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        batches.close()
+        if out is not None:
+            out.close()
+    if verbose:
+        click.echo(f"{monitor.records} records, {monitor.events} events", err=True)
+    sys.exit(1 if monitor.events else 0)
+
+
+@main.command()
+@click.argument("logfile", type=click.Path(exists=True, path_type=Path))
+@click.option("-p", "--patterns", required=True, type=click.Path(exists=True, path_type=Path), help="Patterns file")
+@click.option("-o", "--output", type=click.Path(path_type=Path), help="Write JSON here (default: stdout)")
+@click.option("--top", "top_k", type=int, default=10, show_default=True, help="Most frequent values per field")
+@click.option("--quantiles", default="0.5,0.9,0.99", show_default=True,
+              help="Comma-separated quantiles reported for numeric fields")
+@click.option("--sketches", type=click.Path(path_type=Path),
+              help="Also save the numeric fields' mergeable quantile sketches here")
+@click.option("-v", "--verbose", is_flag=True)
+def stats(
+    logfile: Path,
+    patterns: Path,
+    output: Path | None,
+    top_k: int,
+    quantiles: str,
+    sketches: Path | None,
+    verbose: bool,
+) -> None:
+    """Summarize patterns and field values in one pass, without writing records."""
+    import orjson
+
+    from log_sculptor.core.stats import compute_stats
+    from log_sculptor.exceptions import OutputError
+
+    try:
+        qs = [float(q) for q in quantiles.split(",") if q.strip()]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--quantiles") from e
+    if not all(0 <= q <= 1 for q in qs):
+        raise click.BadParameter("quantiles must be between 0 and 1", param_hint="--quantiles")
+    if top_k < 1:
+        raise click.BadParameter("must be positive", param_hint="--top")
+
+    pattern_set = PatternSet.load(patterns)
+    if verbose:
+        click.echo(f"Computing statistics for {logfile}...", err=True)
+    result = compute_stats(logfile, pattern_set, top_k=top_k)
+    data = orjson.dumps(result.to_dict(qs))
+    if sketches:
+        try:
+            result.quantiles.save(sketches)
+        except OutputError as e:
+            raise click.ClickException(str(e)) from e
+    if output:
+        try:
+            output.write_bytes(data + b"\n")
+        except OSError as e:
+            raise click.ClickException(f"Failed to write statistics to {output}: {e}") from e
+        if verbose:
+            click.echo(f"{result.lines} lines, {len(result.pattern_counts)} patterns -> {output}", err=True)
+    else:
+        click.echo(data.decode())
+
+
 @main.command()
 @click.argument("logfile", type=click.Path(exists=True, path_type=Path))
 @click.option("-o", "--output", required=True, type=click.Path(path_type=Path))
@@ -284,6 +655,107 @@ def fast_learn(logfile: Path, output: Path, workers: int, chunk_size: int, verbo
     click.echo(f"Learned {len(patterns.patterns)} patterns -> {output}")
 
 
+@main.command()
+@click.argument("logfile", type=click.Path(exists=True, path_type=Path))
+@click.option("-o", "--output", type=click.Path(path_type=Path), help="Index file (defaults to LOGFILE.lsidx)")
+@click.option("--interval", type=int, default=65536, help="Lines between checkpoints")
+@click.option("--line", "line_number", type=int, default=None, help="Print line N using the index")
+@click.option("-v", "--verbose", is_flag=True)
+def index(logfile: Path, output: Path | None, interval: int, line_number: int | None, verbose: bool) -> None:
+    """Build a line-offset index for random access into a log file."""
+    from log_sculptor.core.index import LineIndex, load_index, read_line, sidecar_path
+
+    index_path = output or sidecar_path(logfile)
+    line_index = load_index(logfile, index_path)
+    if line_index is None or line_index.interval != interval:
+        if verbose:
+            click.echo(f"Indexing {logfile}...")
+        line_index = LineIndex.build(logfile, interval=interval)
+        line_index.save(index_path)
+        click.echo(f"Indexed {line_index.line_count} lines ({len(line_index.offsets)} checkpoints) -> {index_path}")
+    elif verbose:
+        click.echo(f"Index is up to date: {index_path}")
+
+    if line_number is not None:
+        line = read_line(logfile, line_number, line_index) if line_number >= 1 else None
+        if line is None:
+            click.echo(f"Line {line_number} out of range (1-{line_index.line_count})", err=True)
+            sys.exit(1)
+        click.echo(line)
+
+
+def _parse_address(value: str, param_hint: str) -> tuple[str, int]:
+    """Parse HOST:PORT, :PORT or PORT (host defaults to 127.0.0.1)."""
+    host, _, port = value.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError:
+        raise click.BadParameter(f"Expected HOST:PORT, got {value!r}", param_hint=param_hint) from None
+
+
+@main.command()
+@click.option("-p", "--patterns", required=True, type=click.Path(exists=True, path_type=Path), help="Patterns file")
+@click.option("-o", "--output", required=True, type=click.Path(path_type=Path),
+              help="Base output path (segments are numbered)")
+@click.option("-f", "--format", "output_format", type=click.Choice(["jsonl", "parquet"]), default="jsonl")
+@click.option("--tcp", help="Listen for TCP lines on HOST:PORT")
+@click.option("--udp", help="Listen for UDP datagrams on HOST:PORT")
+@click.option("--unix", type=click.Path(path_type=Path), help="Listen on a Unix stream socket")
+@click.option("--queue-size", type=int, default=10_000, show_default=True, help="Lines buffered before parsing")
+@click.option("--batch-size", type=int, default=500, show_default=True, help="Lines parsed per batch")
+@click.option("--roll-records", type=int, default=100_000, show_default=True, help="Records per output segment")
+@click.option("--roll-seconds", type=float, default=None, help="Also start a new segment after N seconds")
+@click.option("--include-raw", is_flag=True, help="Include raw line")
+@click.option("--keep-priority", is_flag=True, help="Keep a leading syslog <PRI> on each line")
+@click.option("--stats", "stats_file", type=click.Path(path_type=Path), help="Write final counters (JSON)")
+@click.option("--stats-interval", type=float, default=10.0, show_default=True,
+              help="Seconds between counter reports (0 disables)")
+@click.option("--duration", type=float, default=None, help="Stop after N seconds (default: until interrupted)")
+def serve(patterns: Path, output: Path, output_format: str, tcp: str | None, udp: str | None, unix: Path | None,
+          queue_size: int, batch_size: int, roll_records: int, roll_seconds: float | None, include_raw: bool,
+          keep_priority: bool, stats_file: Path | None, stats_interval: float, duration: float | None) -> None:
+    """Parse syslog-style lines received on local sockets."""
+    import asyncio
+
+    import orjson
+
+    from log_sculptor.core.serve import LogServer
+    from log_sculptor.outputs.rolling import RollingSink
+
+    if not (tcp or udp or unix):
+        raise click.UsageError("Give at least one of --tcp, --udp or --unix")
+
+    pattern_set = PatternSet.load(patterns)
+    sink = RollingSink(output, output_format, roll_records=roll_records, roll_seconds=roll_seconds,
+                       patterns=pattern_set, include_raw=include_raw)
+    server = LogServer(
+        pattern_set,
+        sink,
+        tcp=_parse_address(tcp, "--tcp") if tcp else None,
+        udp=_parse_address(udp, "--udp") if udp else None,
+        unix=unix,
+        queue_size=queue_size,
+        batch_size=batch_size,
+        strip_priority=not keep_priority,
+        detect_types=output_format != "jsonl",
+    )
+
+    def report(stats) -> None:
+        data = stats.to_dict()
+        click.echo(f"{data['parsed']} parsed, {data['dropped']} dropped, {data['lines_per_second']} lines/s, "
+                   f"p99 latency {data['latency_ms']['p99']} ms")
+
+    click.echo(f"Serving {len(pattern_set.patterns)} patterns -> {output}")
+    stats = asyncio.run(server.run(duration=duration, report=report if stats_interval > 0 else None,
+                                   report_interval=stats_interval or 10.0))
+    if stats_file:
+        try:
+            stats_file.write_bytes(orjson.dumps(stats.to_dict(), option=orjson.OPT_INDENT_2))
+        except OSError as e:
+            raise click.ClickException(f"Failed to write serve statistics to {stats_file}: {e}") from e
+    click.echo(f"Parsed {stats.parsed} records ({stats.dropped} dropped) -> {len(sink.segments)} segment(s)")
+
+
 @main.command()
 @click.argument("output", type=click.Path(path_type=Path))
 @click.option("-t", "--type", "log_type", type=click.Choice(["app", "apache", "syslog", "json", "mixed"]), default="app", help="Log format type")
@@ -3,7 +3,15 @@
 from log_sculptor.core.tokenizer import Token, tokenize
 from log_sculptor.core.patterns import Pattern, PatternElement, PatternSet, ParsedRecord, learn_patterns, parse_logs
 from log_sculptor.core.clustering import Cluster, cluster_lines, cluster_by_exact_signature
-from log_sculptor.core.drift import DriftDetector, DriftReport, FormatChange, detect_drift
+from log_sculptor.core.drift import (
+    DriftDetector,
+    DriftEvent,
+    DriftMonitor,
+    DriftReport,
+    FormatChange,
+    detect_drift,
+)
+from log_sculptor.core.histogram import PatternHistogram, build_histogram
 
 __all__ = [
     "Token",
@@ -18,7 +26,11 @@ __all__ = [
     "cluster_lines",
     "cluster_by_exact_signature",
     "DriftDetector",
+    "DriftEvent",
+    "DriftMonitor",
     "DriftReport",
     "FormatChange",
     "detect_drift",
+    "PatternHistogram",
+    "build_histogram",
 ]
@@ -0,0 +1,149 @@
+"""asyncio API for parsing log lines from async sources."""
+
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterable, AsyncIterator
+
+from log_sculptor.core.patterns import ParsedRecord, PatternSet, _build_record
+from log_sculptor.di import PatternMatcher
+
+# Lines matched per executor call; bounds the work done per batch.
+DEFAULT_BATCH_SIZE = 1000
+
+# Batches of lines buffered ahead of matching before the source is paused.
+DEFAULT_MAX_PENDING = 4
+
+# Seconds to wait for a partial batch to fill before matching it anyway.
+DEFAULT_LINGER = 0.05
+
+_EOF = object()
+
+
+def _decode(line: str | bytes, encoding: str, errors: str) -> str:
+    if isinstance(line, bytes):
+        line = line.decode(encoding, errors)
+    return line.removesuffix("\n").removesuffix("\r")
+
+
+def parse_batch(
+    patterns: PatternSet,
+    lines: list[str],
+    first_line: int,
+    detect_types: bool = True,
+    matcher: PatternMatcher | None = None,
+) -> list[ParsedRecord]:
+    """
+    Match a batch of lines (runs on the executor).
+
+    Args:
+        patterns: PatternSet for matching.
+        lines: Lines without terminators.
+        first_line: Line number of lines[0].
+        detect_types: Whether to detect field types.
+        matcher: Optional matcher used instead of patterns.match.
+
+    Returns:
+        Records for the non-empty lines.
+    """
+    match = matcher.match if matcher is not None else patterns.match
+    records = []
+    for i, line in enumerate(lines, start=first_line):
+        if not line:
+            continue
+        pattern, fields = match(line)
+        records.append(_build_record(i, line, pattern, fields, detect_types))
+    return records
+
+
+async def aparse(
+    source: AsyncIterable[str | bytes],
+    patterns: PatternSet,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Executor | None = None,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    linger: float = DEFAULT_LINGER,
+    detect_types: bool = True,
+    matcher: PatternMatcher | None = None,
+    encoding: str = "utf-8",
+    errors: str = "replace",
+) -> AsyncIterator[ParsedRecord]:
+    """
+    Parse lines from an async source without blocking the event loop.
+
+    Lines are read by a background task into a bounded queue and matched
+    in batches of at most ``batch_size`` on ``executor``, so the loop only
+    moves lines between queues. When the consumer falls behind, the queue
+    fills and the reader stops pulling from the source (backpressure).
+
+    With a process pool, patterns (and matcher, if given) must be picklable
+    and a matcher's state is not shared back.
+
+    Args:
+        source: Async iterable of lines, e.g. an asyncio.StreamReader.
+            Trailing ``\\n`` / ``\\r\\n`` are stripped; bytes are decoded.
+        patterns: PatternSet for matching.
+        batch_size: Maximum lines matched per executor call.
+        executor: Executor for matching (defaults to the loop's default executor).
+        max_pending: Batches buffered ahead of matching.
+        linger: Seconds to wait for more lines before matching a partial batch.
+        detect_types: Whether to detect field types.
+        matcher: Optional matcher used instead of patterns.match.
+        encoding: Encoding for bytes lines.
+        errors: Decode error handling.
+
+    Yields:
+        ParsedRecord for each non-empty line, in order.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size * max_pending)
+
+    async def read() -> None:
+        try:
+            async for line in source:
+                await queue.put(_decode(line, encoding, errors))
+        except Exception:
+            await queue.put(_EOF)
+            raise
+        await queue.put(_EOF)
+
+    reader = asyncio.create_task(read())
+    line_number = 1
+    done = False
+    try:
+        while not done:
+            item = await queue.get()
+            if item is _EOF:
+                break
+            batch = [item]
+            deadline = loop.time() + linger
+            while len(batch) < batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _EOF:
+                    done = True
+                    break
+                batch.append(item)
+
+            records = await loop.run_in_executor(
+                executor, parse_batch, patterns, batch, line_number, detect_types, matcher
+            )
+            line_number += len(batch)
+            for record in records:
+                yield record
+        # Surface errors raised by the source.
+        await reader
+    finally:
+        if not reader.done():
+            reader.cancel()
+            try:
+                await reader
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,251 @@
+"""Checkpointed, resumable parsing of large log files."""
+
+import hashlib
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+import orjson
+
+from log_sculptor.core.patterns import ParsedRecord, PatternSet, _build_record
+from log_sculptor.core.reader import iter_line_chunks
+from log_sculptor.di import PatternMatcher
+from log_sculptor.exceptions import CheckpointError, OutputError
+
+CHECKPOINT_VERSION = 1
+
+# Sidecar file suffix appended to the output file name.
+CHECKPOINT_SUFFIX = ".ckpt"
+
+# Bytes hashed from the start of the log to recognise the same file.
+HEAD_BYTES = 4096
+
+# Lines parsed between checkpoints.
+DEFAULT_CHECKPOINT_EVERY = 100_000
+
+# Bytes read per block; checkpoints are taken on block boundaries.
+CHECKPOINT_BLOCK_SIZE = 1024 * 1024
+
+
+class RecordWriter(Protocol):
+    """Incremental output writer used by resumable_parse."""
+
+    def write(self, records: list[ParsedRecord]) -> int: ...
+
+    def flush(self) -> dict: ...
+
+    def close(self) -> None: ...
+
+
+def checkpoint_path(output: str | Path) -> Path:
+    """Get the checkpoint sidecar path for an output file."""
+    output = Path(output)
+    return output.with_name(output.name + CHECKPOINT_SUFFIX)
+
+
+def file_identity(source: str | Path, head_size: int = HEAD_BYTES) -> dict:
+    """
+    Identify a log file so a checkpoint is not applied to a different file.
+
+    Uses the device and inode plus a hash of the first ``head_size`` bytes
+    (fewer if the file is shorter), so appends to the file keep its identity
+    but replacing it does not.
+    """
+    stat = os.stat(source)
+    with open(source, "rb") as f:
+        head = f.read(head_size)
+    return {
+        "device": stat.st_dev,
+        "inode": stat.st_ino,
+        "head_size": len(head),
+        "head": hashlib.sha256(head).hexdigest(),
+    }
+
+
+def patterns_hash(patterns: PatternSet) -> str:
+    """Hash a pattern set's contents."""
+    data = {"version": patterns.version, "patterns": [p.to_dict() for p in patterns.patterns]}
+    return hashlib.sha256(orjson.dumps(data, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+@dataclass
+class Checkpoint:
+    """
+    Position reached by a parse and the output state at that position.
+
+    ``offset`` is the byte offset of the next unparsed line and
+    ``line_number`` the number of the last parsed line. ``output_state`` is
+    the writer state returned by its flush() at the same point.
+    """
+    source: str
+    identity: dict
+    patterns_hash: str
+    output_format: str
+    offset: int = 0
+    line_number: int = 0
+    records: int = 0
+    output_state: dict | None = None
+    complete: bool = False
+    version: int = field(default=CHECKPOINT_VERSION)
+
+    def validate(self, source: str | Path, patterns: PatternSet, output_format: str) -> None:
+        """
+        Check the checkpoint applies to this source, pattern set and format.
+
+        Raises:
+            CheckpointError: If anything changed in a way that makes resuming unsafe.
+        """
+        source = Path(source)
+        try:
+            identity = file_identity(source, self.identity.get("head_size", HEAD_BYTES))
+        except OSError as e:
+            raise CheckpointError(f"Cannot read {source}: {e}") from e
+        if identity != self.identity:
+            raise CheckpointError(f"{source} is not the file this checkpoint was taken on")
+        if source.stat().st_size < self.offset:
+            raise CheckpointError(f"{source} is shorter than the checkpoint offset (truncated?)")
+        if patterns_hash(patterns) != self.patterns_hash:
+            raise CheckpointError("Patterns changed since the checkpoint was taken")
+        if output_format != self.output_format:
+            raise CheckpointError(
+                f"Checkpoint was taken for {self.output_format} output, not {output_format}"
+            )
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "identity": self.identity,
+            "patterns_hash": self.patterns_hash,
+            "output_format": self.output_format,
+            "offset": self.offset,
+            "line_number": self.line_number,
+            "records": self.records,
+            "output_state": self.output_state,
+            "complete": self.complete,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Checkpoint":
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise CheckpointError(f"Unsupported checkpoint version: {data.get('version')}")
+        return cls(
+            source=data["source"],
+            identity=data["identity"],
+            patterns_hash=data["patterns_hash"],
+            output_format=data["output_format"],
+            offset=data["offset"],
+            line_number=data["line_number"],
+            records=data["records"],
+            output_state=data["output_state"],
+            complete=data["complete"],
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Write the checkpoint atomically (a crash leaves the old or new one)."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(orjson.dumps(self.to_dict()))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except Exception as e:
+            raise OutputError(f"Failed to write checkpoint to {path}: {e}") from e
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Checkpoint":
+        path = Path(path)
+        try:
+            return cls.from_dict(orjson.loads(path.read_bytes()))
+        except CheckpointError:
+            raise
+        except Exception as e:
+            raise CheckpointError(f"Failed to load checkpoint from {path}: {e}") from e
+
+
+def resumable_parse(
+    source: str | Path,
+    patterns: PatternSet,
+    writer: RecordWriter,
+    checkpoint_file: str | Path,
+    output_format: str,
+    checkpoint: Checkpoint | None = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    detect_types: bool = True,
+    matcher: PatternMatcher | None = None,
+    include_unmatched: bool = True,
+    block_size: int = CHECKPOINT_BLOCK_SIZE,
+) -> Checkpoint:
+    """
+    Parse a log file into a writer, checkpointing progress as it goes.
+
+    At a checkpoint the writer is flushed first and the checkpoint saved
+    second, so a saved checkpoint never points past durable output. A crash
+    between the two leaves extra output that the writer discards when it is
+    reopened with the previous checkpoint's state. The writer is closed
+    before the checkpoint is marked complete.
+
+    Args:
+        source: Path to log file.
+        patterns: PatternSet for matching.
+        writer: Output writer, opened with ``checkpoint.output_state`` when resuming.
+        checkpoint_file: Where to save checkpoints.
+        output_format: Output format name, recorded to reject mismatched resumes.
+        checkpoint: Validated checkpoint to resume from, or None to start fresh.
+        checkpoint_every: Minimum lines parsed between checkpoints.
+        detect_types: Whether to detect field types.
+        matcher: Optional matcher used instead of patterns.match.
+        include_unmatched: Write records for lines no pattern matched.
+        block_size: Bytes read per block.
+
+    Returns:
+        The final (complete) checkpoint.
+    """
+    if checkpoint is None:
+        checkpoint = Checkpoint(
+            source=str(source),
+            identity=file_identity(source),
+            patterns_hash=patterns_hash(patterns),
+            output_format=output_format,
+        )
+    match = matcher.match if matcher is not None else patterns.match
+
+    line_number = checkpoint.line_number
+    records = checkpoint.records
+    position = checkpoint.offset
+    pending = 0
+
+    def save() -> None:
+        checkpoint.output_state = writer.flush()
+        checkpoint.offset, checkpoint.line_number, checkpoint.records = position, line_number, records
+        checkpoint.save(checkpoint_file)
+
+    if checkpoint.output_state is None:
+        save()
+
+    for lines, position in iter_line_chunks(source, block_size, start=checkpoint.offset):
+        batch: list[ParsedRecord] = []
+        for line in lines:
+            line_number += 1
+            if not line:
+                continue
+            pattern, fields = match(line)
+            if pattern is None and not include_unmatched:
+                continue
+            batch.append(_build_record(line_number, line, pattern, fields, detect_types))
+        records += writer.write(batch)
+        pending += len(lines)
+        if pending >= checkpoint_every:
+            save()
+            pending = 0
+
+    # Checkpoint before close() so an interrupted close (e.g. Parquet part
+    # concatenation) is redone on resume.
+    save()
+    writer.close()
+    checkpoint.complete = True
+    checkpoint.save(checkpoint_file)
+    return checkpoint
@@ -1,10 +1,23 @@
 """Format change (drift) detection for log files."""
 
+import os
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
+from typing import Callable, Iterable
 
-from log_sculptor.core.patterns import PatternSet, parse_logs
+from log_sculptor.core.patterns import ParsedRecord, PatternSet, parse_logs
+from log_sculptor.core.reader import iter_lines
+from log_sculptor.core.timerange import _next_line_start
+
+# Default number of worker processes for detect_parallel.
+DEFAULT_WORKERS = 4
+
+# Target bytes per range scanned by one worker task.
+DEFAULT_CHUNK_BYTES = 32 * 1024 * 1024
 
 
 @dataclass
@@ -50,6 +63,238 @@ class DriftReport:
         return "\n".join(lines)
 
 
+class _WindowCounts:
+    """
+    Pattern counts over a sliding window, with the window's dominant pattern.
+
+    The dominant pattern is the most frequent one; ties go to the pattern
+    that occurs first in the window. Adding or removing a pattern is O(1).
+    """
+
+    def __init__(self):
+        # Window positions of each pattern, oldest first.
+        self._positions: dict[str | None, deque[int]] = {}
+        # Patterns grouped by count.
+        self._by_count: dict[int, dict[str | None, None]] = {}
+        self._max = 0
+
+    def add(self, pattern_id: str | None, position: int) -> None:
+        """Add the pattern at a window position (positions must increase)."""
+        positions = self._positions.get(pattern_id)
+        if positions is None:
+            positions = self._positions[pattern_id] = deque()
+        count = len(positions)
+        if count:
+            self._unbucket(pattern_id, count)
+        positions.append(position)
+        self._by_count.setdefault(count + 1, {})[pattern_id] = None
+        self._max = max(self._max, count + 1)
+
+    def remove(self, pattern_id: str | None) -> None:
+        """Remove the pattern's oldest position (the window's first line)."""
+        positions = self._positions[pattern_id]
+        count = len(positions)
+        self._unbucket(pattern_id, count)
+        positions.popleft()
+        if count > 1:
+            self._by_count.setdefault(count - 1, {})[pattern_id] = None
+        else:
+            del self._positions[pattern_id]
+        if count == self._max and count not in self._by_count:
+            self._max -= 1
+
+    def _unbucket(self, pattern_id: str | None, count: int) -> None:
+        bucket = self._by_count[count]
+        del bucket[pattern_id]
+        if not bucket:
+            del self._by_count[count]
+
+    def dominant(self) -> tuple[str | None, int]:
+        """Get the dominant pattern and its count (None, 0 for an empty window)."""
+        if not self._max:
+            return None, 0
+        bucket = self._by_count[self._max]
+        if len(bucket) == 1:
+            return next(iter(bucket)), self._max
+        return min(bucket, key=lambda p: self._positions[p][0]), self._max
+
+
+# (record index, dominant pattern, confidence, context before, context after)
+_Transition = tuple[int, str, float, str | None, str | None]
+
+
+class _DriftScan:
+    """
+    Single pass over records computing a DriftReport.
+
+    Line i's window is lines [i - w/2, i + w/2), so each line is evaluated
+    once w/2 more records have arrived. Only the window's pattern IDs and
+    the raw lines needed for change context are kept.
+
+    The scan records each line where the dominant pattern changes; the
+    report's regions and changes are built from those transitions. Lines
+    outside [first, last) still fill windows but are not evaluated, which
+    lets a worker scan one range of a file (see DriftDetector.detect_parallel).
+    """
+
+    def __init__(self, detector: "DriftDetector", first: int = 0):
+        self.detector = detector
+        self.half = detector.window_size // 2
+        self.last = sys.maxsize  # lowered by _scan_range once its range is read
+        self.total = 0
+        self.matched = 0
+        self.distribution: dict[str, int] = defaultdict(int)
+        self.transitions: list[_Transition] = []
+        self.counts = _WindowCounts()
+        self._window: deque[str | None] = deque()   # IDs of lines [start, end)
+        self._pending: deque[str | None] = deque()  # IDs of lines [end, total)
+        self._raw: deque[str] = deque(maxlen=self.half + 2)
+        self._start = 0
+        self._end = 0
+        self._next = first  # next line to evaluate
+        self._dominant: str | None = None
+
+    def add(self, record: ParsedRecord, counted: bool = True) -> None:
+        """Add the next record (counted=False only fills windows, for halo lines)."""
+        self.total += 1
+        if counted:
+            if record.matched:
+                self.matched += 1
+            if record.pattern_id:
+                self.distribution[record.pattern_id] += 1
+        self._pending.append(record.pattern_id)
+        self._raw.append(record.raw)
+        while self._next < self.last and self._next + max(self.half, 1) <= self.total:
+            self._evaluate(self._next + self.half)
+
+    def _raw_at(self, i: int) -> str:
+        return self._raw[i - (self.total - len(self._raw))]
+
+    def _evaluate(self, window_end: int) -> None:
+        i = self._next
+        self._next += 1
+        while self._end < window_end:
+            pattern_id = self._pending.popleft()
+            self._window.append(pattern_id)
+            self.counts.add(pattern_id, self._end)
+            self._end += 1
+        while self._start < max(0, i - self.half):
+            self.counts.remove(self._window.popleft())
+            self._start += 1
+
+        dominant, count = self.counts.dominant()
+        if dominant == self._dominant or dominant is None:
+            return
+        # Confidence is the new pattern's share of the window
+        confidence = count / (self._end - self._start)
+        before = after = None
+        if confidence >= self.detector.min_confidence:
+            before = self._raw_at(i - 1) if i > 0 else None
+            after = self._raw_at(i)
+        self.transitions.append((i, dominant, confidence, before, after))
+        self._dominant = dominant
+
+    def finish(self) -> None:
+        """Evaluate the remaining lines, whose windows are cut short by the end of input."""
+        while self._next < min(self.total, self.last):
+            self._evaluate(min(self.total, self._next + self.half))
+
+    def report(self) -> DriftReport:
+        self.finish()
+        return _build_report(self.total, self.matched, dict(self.distribution), self.transitions,
+                             self.detector.min_confidence)
+
+
+def _build_report(
+    total: int,
+    matched: int,
+    distribution: dict[str, int],
+    transitions: Iterable[_Transition],
+    min_confidence: float,
+) -> DriftReport:
+    """Turn dominant-pattern transitions (in line order) into regions and format changes."""
+    changes: list[FormatChange] = []
+    regions: list[tuple[int, int, str]] = []
+    dominant: str | None = None
+    region_start = 1
+    for i, pattern_id, confidence, before, after in transitions:
+        # A range scanned separately restates the dominant pattern it starts in.
+        if pattern_id == dominant:
+            continue
+        if dominant is not None:
+            # Record the completed region
+            regions.append((region_start, i, dominant))
+            if confidence >= min_confidence:
+                changes.append(FormatChange(
+                    line_number=i + 1,  # 1-indexed
+                    old_pattern_id=dominant,
+                    new_pattern_id=pattern_id,
+                    confidence=confidence,
+                    context_before=before,
+                    context_after=after,
+                ))
+        dominant = pattern_id
+        region_start = i + 1
+    if dominant is not None:
+        regions.append((region_start, total, dominant))
+    return DriftReport(
+        total_lines=total,
+        matched_lines=matched,
+        pattern_distribution=distribution,
+        format_changes=changes,
+        dominant_patterns=regions,
+    )
+
+
+def _plan_ranges(source: str | Path, parts: int) -> list[tuple[int, int]]:
+    """Split a file into byte ranges that begin at line starts."""
+    size = os.path.getsize(source)
+    starts = [0]
+    for k in range(1, parts):
+        start = _next_line_start(source, size * k // parts, size)
+        if starts[-1] < start < size:
+            starts.append(start)
+    return [(start, end) for start, end in zip(starts, starts[1:] + [size])] if size else []
+
+
+def _scan_range(
+    source: str | Path,
+    patterns: PatternSet,
+    start: int,
+    end: int,
+    window_size: int,
+    min_confidence: float,
+    first: bool,
+) -> tuple[int, int, dict[str, int], list[_Transition]]:
+    """
+    Scan one byte range of a file for transitions (runs on a worker).
+
+    The range's records are followed by up to 2 * (window_size // 2) halo
+    records from after it, so every line the range is responsible for sees
+    its full window. A range is responsible for its lines shifted by half a
+    window ([h, n + h), or [0, n + h) for the first range), so the ranges'
+    responsibilities tile the file without gaps.
+
+    Returns:
+        (records, matched, distribution, transitions), with transitions
+        numbered from the range's first record.
+    """
+    detector = DriftDetector(window_size=window_size, min_confidence=min_confidence)
+    half = detector.window_size // 2
+    own = parse_logs(iter_lines(source, start=start, end=end), patterns, detect_types=False)
+    halo = islice(parse_logs(iter_lines(source, start=end), patterns, detect_types=False), 2 * half)
+    scan = _DriftScan(detector, first=0 if first else half)
+    for record in own:
+        scan.add(record)
+    records = scan.total
+    # Lines up to records - half have been evaluated; stop half a window past the range.
+    scan.last = records + half
+    for record in halo:
+        scan.add(record, counted=False)
+    scan.finish()
+    return records, scan.matched, dict(scan.distribution), scan.transitions
+
+
 class DriftDetector:
     """Detect format changes in log files."""
 
@@ -71,15 +316,6 @@ class DriftDetector:
         self.change_threshold = change_threshold
         self.min_confidence = min_confidence
 
-    def _get_dominant_pattern(self, window: list[str | None]) -> str | None:
-        """Get the most common pattern in a window."""
-        if not window:
-            return None
-        counts: dict[str | None, int] = defaultdict(int)
-        for p in window:
-            counts[p] += 1
-        return max(counts.keys(), key=lambda k: counts[k])
-
     def detect(
         self,
         source: str | Path,
@@ -95,85 +331,205 @@ class DriftDetector:
         Returns:
             DriftReport with detected changes.
         """
-        source = Path(source)
-
-        # Collect all records
-        records = list(parse_logs(source, patterns))
-
-        total_lines = len(records)
-        matched_lines = sum(1 for r in records if r.matched)
-
-        # Count pattern distribution
-        pattern_dist: dict[str, int] = defaultdict(int)
-        for r in records:
-            if r.pattern_id:
-                pattern_dist[r.pattern_id] += 1
-
-        # Detect format changes using sliding window
-        format_changes: list[FormatChange] = []
-        dominant_patterns: list[tuple[int, int, str]] = []
-
-        if total_lines == 0:
-            return DriftReport(
-                total_lines=0,
-                matched_lines=0,
-                pattern_distribution=dict(pattern_dist),
-                format_changes=[],
-                dominant_patterns=[],
-            )
-
-        # Build pattern sequence
-        pattern_seq = [r.pattern_id for r in records]
-
-        # Track dominant pattern regions
-        current_dominant: str | None = None
-        region_start = 1
-
-        for i in range(total_lines):
-            # Get window around current position
-            window_start = max(0, i - self.window_size // 2)
-            window_end = min(total_lines, i + self.window_size // 2)
-            window = pattern_seq[window_start:window_end]
-
-            dominant = self._get_dominant_pattern(window)
-
-            if dominant != current_dominant and dominant is not None:
-                if current_dominant is not None:
-                    # Record the completed region
-                    dominant_patterns.append((region_start, i, current_dominant))
-
-                    # Detect format change
-                    context_before = records[i - 1].raw if i > 0 else None
-                    context_after = records[i].raw if i < total_lines else None
-
-                    # Calculate confidence based on how dominant the new pattern is
-                    new_count = sum(1 for p in window if p == dominant)
-                    confidence = new_count / len(window) if window else 0
-
-                    if confidence >= self.min_confidence:
-                        format_changes.append(FormatChange(
-                            line_number=i + 1,  # 1-indexed
-                            old_pattern_id=current_dominant,
-                            new_pattern_id=dominant,
-                            confidence=confidence,
-                            context_before=context_before,
-                            context_after=context_after,
-                        ))
-
-                current_dominant = dominant
-                region_start = i + 1
-
-        # Record final region
-        if current_dominant is not None:
-            dominant_patterns.append((region_start, total_lines, current_dominant))
-
-        return DriftReport(
-            total_lines=total_lines,
-            matched_lines=matched_lines,
-            pattern_distribution=dict(pattern_dist),
-            format_changes=format_changes,
-            dominant_patterns=dominant_patterns,
-        )
+        # Field types do not affect the report.
+        return self.detect_records(parse_logs(Path(source), patterns, detect_types=False))
+
+    def detect_records(self, records: Iterable[ParsedRecord]) -> DriftReport:
+        """
+        Detect format changes in a stream of parsed records.
+
+        Runs in one pass with memory bounded by the window size, so the
+        records can come straight from parse_logs or stream_parse.
+
+        Args:
+            records: Parsed records in line order.
+
+        Returns:
+            DriftReport with detected changes (line numbers count records).
+        """
+        scan = _DriftScan(self)
+        for record in records:
+            scan.add(record)
+        return scan.report()
+
+    def detect_parallel(
+        self,
+        source: str | Path,
+        patterns: PatternSet,
+        workers: int = DEFAULT_WORKERS,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        executor: Executor | None = None,
+    ) -> DriftReport:
+        """
+        Detect format changes in a log file using several worker processes.
+
+        The file is split into byte ranges on line starts. Each worker
+        parses its range plus a halo of one window past it and reports
+        where the dominant pattern changes; the transitions are stitched
+        across range boundaries in order. The report is identical to
+        detect() with the same settings.
+
+        Args:
+            source: Path to log file.
+            patterns: PatternSet to use for matching (pickled to workers).
+            workers: Number of worker processes (ignored if executor is given).
+            chunk_bytes: Target bytes per range.
+            executor: Executor to run ranges on (defaults to a process pool).
+
+        Returns:
+            DriftReport with detected changes.
+        """
+        size = os.path.getsize(source)
+        ranges = _plan_ranges(source, max(workers, -(-size // chunk_bytes)))
+        if len(ranges) <= 1:
+            return self.detect(source, patterns)
+
+        own = executor is None
+        if own:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        pending: deque[Future] = deque()
+        submitted = 0
+        total = matched = 0
+        distribution: dict[str, int] = {}
+        transitions: list[_Transition] = []
+        try:
+            for i in range(len(ranges)):
+                # Keep a bounded number of ranges in flight.
+                while submitted < len(ranges) and submitted < i + 2 * workers:
+                    start, end = ranges[submitted]
+                    pending.append(executor.submit(
+                        _scan_range, source, patterns, start, end,
+                        self.window_size, self.min_confidence, submitted == 0,
+                    ))
+                    submitted += 1
+                records, range_matched, range_distribution, range_transitions = pending.popleft().result()
+                transitions.extend((total + j, *rest) for j, *rest in range_transitions)
+                for pattern_id, count in range_distribution.items():
+                    distribution[pattern_id] = distribution.get(pattern_id, 0) + count
+                total += records
+                matched += range_matched
+        finally:
+            for future in pending:
+                future.cancel()
+            if own:
+                executor.shutdown(wait=True, cancel_futures=True)
+        return _build_report(total, matched, distribution, transitions, self.min_confidence)
+
+
+@dataclass
+class DriftEvent:
+    """A change noticed by DriftMonitor on a live stream."""
+    kind: str  # "pattern_change", "unmatched_high" or "unmatched_normal"
+    line_number: int
+    share: float  # new pattern's share of the window, or the unmatched rate
+    old_pattern_id: str | None = None
+    new_pattern_id: str | None = None
+    raw: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "line_number": self.line_number,
+            "share": round(self.share, 4),
+            "old_pattern_id": self.old_pattern_id,
+            "new_pattern_id": self.new_pattern_id,
+            "raw": self.raw,
+        }
+
+
+class DriftMonitor:
+    """
+    Watch a live stream of records for format drift.
+
+    Keeps counts over the last ``window_size`` records only, so state is
+    bounded and each record costs O(1). Events are passed to ``on_event``:
+
+    - ``pattern_change`` when a different pattern becomes dominant and
+      holds at least ``change_threshold`` of the window;
+    - ``unmatched_high`` / ``unmatched_normal`` when the share of unmatched
+      records in the window rises to ``unmatched_threshold`` or falls back
+      below it.
+
+    Nothing is reported until the window has filled once. The monitor is
+    callable, so it can be passed as a stream_parse callback.
+    """
+
+    def __init__(
+        self,
+        on_event: Callable[[DriftEvent], None] | None = None,
+        window_size: int = 100,
+        change_threshold: float = 0.5,
+        unmatched_threshold: float = 0.2,
+    ):
+        """
+        Initialize drift monitor.
+
+        Args:
+            on_event: Called with each DriftEvent.
+            window_size: Number of recent records considered.
+            change_threshold: Share of the window a new dominant pattern needs.
+            unmatched_threshold: Unmatched share that raises an alert.
+        """
+        if window_size < 1:
+            raise ValueError(f"window_size must be positive, got {window_size}")
+        self.on_event = on_event
+        self.window_size = window_size
+        self.change_threshold = change_threshold
+        self.unmatched_threshold = unmatched_threshold
+        self.records = 0
+        self.events = 0
+        self.dominant: str | None = None
+        self.unmatched_alert = False
+        self._counts = _WindowCounts()
+        self._window: deque[tuple[str | None, bool]] = deque()
+        self._unmatched = 0
+
+    @property
+    def unmatched_rate(self) -> float:
+        """Share of unmatched records in the current window."""
+        return self._unmatched / len(self._window) if self._window else 0.0
+
+    def __call__(self, record: ParsedRecord) -> None:
+        self.update(record)
+
+    def update(self, record: ParsedRecord) -> None:
+        """Add a record and report any change it completes."""
+        self.records += 1
+        self._window.append((record.pattern_id, record.matched))
+        self._counts.add(record.pattern_id, self.records)
+        if not record.matched:
+            self._unmatched += 1
+        if len(self._window) > self.window_size:
+            pattern_id, matched = self._window.popleft()
+            self._counts.remove(pattern_id)
+            if not matched:
+                self._unmatched -= 1
+        if len(self._window) < self.window_size:
+            return
+
+        dominant, count = self._counts.dominant()
+        share = count / self.window_size
+        if dominant is not None and dominant != self.dominant and share >= self.change_threshold:
+            if self.dominant is not None:
+                self._emit(DriftEvent("pattern_change", record.line_number, share,
+                                      self.dominant, dominant, record.raw))
+            self.dominant = dominant
+
+        rate = self._unmatched / self.window_size
+        if (rate >= self.unmatched_threshold) != self.unmatched_alert:
+            self.unmatched_alert = not self.unmatched_alert
+            kind = "unmatched_high" if self.unmatched_alert else "unmatched_normal"
+            self._emit(DriftEvent(kind, record.line_number, rate, raw=record.raw))
+
+    def update_many(self, records: Iterable[ParsedRecord]) -> None:
+        """Add records in order (e.g. a batch from follow_parse)."""
+        for record in records:
+            self.update(record)
+
+    def _emit(self, event: DriftEvent) -> None:
+        self.events += 1
+        if self.on_event is not None:
+            self.on_event(event)
 
 
 def detect_drift(
@@ -181,6 +537,7 @@ def detect_drift(
     patterns: PatternSet,
     window_size: int = 100,
     change_threshold: float = 0.5,
+    workers: int = 1,
 ) -> DriftReport:
     """
     Convenience function to detect format drift.
@@ -190,9 +547,12 @@ def detect_drift(
         patterns: PatternSet to use.
         window_size: Lines to consider for dominance.
         change_threshold: Change fraction threshold.
+        workers: Worker processes to scan the file with (1 scans in-process).
 
     Returns:
         DriftReport with analysis results.
     """
     detector = DriftDetector(window_size=window_size, change_threshold=change_threshold)
+    if workers > 1:
+        return detector.detect_parallel(source, patterns, workers=workers)
     return detector.detect(source, patterns)
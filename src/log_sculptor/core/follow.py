@@ -0,0 +1,269 @@
+"""Follow a growing log file like ``tail -F``, across rotation and truncation."""
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
+
+from log_sculptor.core.patterns import ParsedRecord, PatternSet, _build_record
+from log_sculptor.core.reader import _split_lines
+from log_sculptor.di import PatternMatcher
+
+# Seconds to wait before polling again when no new data arrived.
+DEFAULT_POLL_INTERVAL = 0.25
+
+# Bytes read per poll; bounds batch size and therefore output latency.
+DEFAULT_MAX_READ = 256 * 1024
+
+
+@dataclass
+class FollowPosition:
+    """
+    Position reached in a followed file.
+
+    ``offset`` is the byte offset of the next unread line and
+    ``line_number`` the number of the last line read from that file.
+    ``device`` and ``inode`` identify the file, so a restart can tell
+    whether it was rotated in the meantime.
+    """
+    offset: int
+    line_number: int
+    device: int
+    inode: int
+
+
+class LogFollower:
+    """
+    Read complete lines as they are appended to a file.
+
+    The path is re-checked whenever the open file has no new data. If it now
+    names a different file (rotation), the old file is drained to its end
+    and the new one is read from the start. If the file shrank below the
+    read offset (truncation, e.g. copytruncate), reading restarts at 0.
+    Line numbers restart at 1 for each new file.
+
+    When resuming from a position whose file was rotated in the meantime,
+    the old file is looked up by device and inode in the same directory
+    (e.g. renamed to ``app.log.1``) and drained first. If it was moved
+    elsewhere, compressed or deleted, its unread tail is lost and the new
+    file is read from the start.
+    """
+
+    def __init__(
+        self,
+        source: str | Path,
+        position: FollowPosition | None = None,
+        max_read: int = DEFAULT_MAX_READ,
+        encoding: str = "utf-8",
+        errors: str = "replace",
+    ):
+        """
+        Initialize follower.
+
+        Args:
+            source: Path to the log file (need not exist yet).
+            position: Position to resume from; ignored if its file is gone
+                or shorter than the offset.
+            max_read: Maximum bytes consumed per read() call.
+            encoding: Text encoding.
+            errors: Decode error handling.
+        """
+        self.source = Path(source)
+        self.max_read = max_read
+        self.encoding = encoding
+        self.errors = errors
+        self.offset = 0
+        self.line_number = 0
+        self._f: BinaryIO | None = None
+        self._carry = b""
+        self._rotated = False
+        self._open(position)
+
+    def _rotated_path(self, position: FollowPosition) -> Path | None:
+        """Find the position's file if the path now names another one but it is still in the directory."""
+        try:
+            current = os.stat(self.source)
+            if (current.st_dev, current.st_ino) == (position.device, position.inode):
+                return None
+        except FileNotFoundError:
+            pass
+        try:
+            entries = os.scandir(self.source.parent)
+        except OSError:
+            return None
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.inode() != position.inode or not entry.is_file(follow_symlinks=False):
+                        continue
+                    if entry.stat(follow_symlinks=False).st_dev == position.device:
+                        return Path(entry.path)
+                except OSError:
+                    continue
+        return None
+
+    def _open(self, position: FollowPosition | None = None) -> bool:
+        """Open the path, resuming at position if it is still the same file."""
+        path = self.source
+        if position is not None:
+            # The normal rotation check switches to the path once this is drained.
+            path = self._rotated_path(position) or path
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(f.fileno())
+        self.offset = self.line_number = 0
+        if (
+            position is not None
+            and (stat.st_dev, stat.st_ino) == (position.device, position.inode)
+            and stat.st_size >= position.offset
+        ):
+            self.offset, self.line_number = position.offset, position.line_number
+        f.seek(self.offset)
+        self._f = f
+        self._carry = b""
+        return True
+
+    @property
+    def position(self) -> FollowPosition | None:
+        """Current position, or None if the file has not appeared yet."""
+        if self._f is None:
+            return None
+        stat = os.fstat(self._f.fileno())
+        return FollowPosition(self.offset, self.line_number, stat.st_dev, stat.st_ino)
+
+    def _read(self, final: bool = False) -> list[str]:
+        """Read up to max_read bytes; final=True also returns an unterminated tail."""
+        data = self._carry + self._f.read(self.max_read)
+        # Split through the last \n only: a trailing \r may be half of \r\n
+        # and a trailing partial line is still being written.
+        cut = len(data) if final else data.rfind(b"\n") + 1
+        self._carry = data[cut:]
+        if not cut:
+            return []
+        self.offset += cut
+        lines = _split_lines(data[:cut].decode(self.encoding, self.errors))
+        self.line_number += len(lines)
+        return lines
+
+    def read(self) -> list[str]:
+        """
+        Return complete lines appended since the last call.
+
+        All returned lines come from a single file, and ``line_number`` and
+        ``position`` describe that file until the next call. After a
+        rotation the rest of the old file is returned before the new file
+        is read.
+
+        Returns:
+            Lines without terminators (empty if there is nothing new).
+        """
+        if self._rotated:
+            self._rotated = False
+            self.close()
+        if self._f is None and not self._open():
+            return []
+
+        stat = os.fstat(self._f.fileno())
+        if stat.st_size < self._f.tell():
+            # Truncated in place: the unread data is gone, start over.
+            self._f.seek(0)
+            self.offset = self.line_number = 0
+            self._carry = b""
+
+        lines = self._read()
+        # A line longer than max_read needs several reads.
+        while not lines and self._f.tell() < os.fstat(self._f.fileno()).st_size:
+            lines = self._read()
+        if lines:
+            return lines
+
+        try:
+            current = os.stat(self.source)
+        except FileNotFoundError:
+            # Rotated away and not yet recreated; keep the old file.
+            return []
+        if (current.st_dev, current.st_ino) == (stat.st_dev, stat.st_ino):
+            return []
+
+        # Rotated: drain whatever was appended to the old file before the
+        # switch, including an unterminated last line.
+        while True:
+            chunk = self._read(final=True)
+            if not chunk:
+                break
+            lines.extend(chunk)
+        if lines:
+            self._rotated = True
+            return lines
+        self.close()
+        if not self._open():
+            return []
+        return self._read()
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+def follow_parse(
+    source: str | Path,
+    patterns: PatternSet,
+    position: FollowPosition | None = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_read: int = DEFAULT_MAX_READ,
+    detect_types: bool = True,
+    matcher: PatternMatcher | None = None,
+    include_unmatched: bool = True,
+    idle_timeout: float | None = None,
+    stop: Callable[[], bool] | None = None,
+) -> Iterator[tuple[list[ParsedRecord], FollowPosition]]:
+    """
+    Parse lines as they are appended to a log file.
+
+    Yields one small batch per read, together with the position after it;
+    persisting that position once the batch is written lets a restarted
+    follower continue without gaps or duplicates.
+
+    Args:
+        source: Path to log file.
+        patterns: PatternSet for matching.
+        position: Position to resume from (see LogFollower).
+        poll_interval: Seconds to sleep when no new data arrived.
+        max_read: Maximum bytes read per batch.
+        detect_types: Whether to detect field types.
+        matcher: Optional matcher used instead of patterns.match.
+        include_unmatched: Yield records for lines no pattern matched.
+        idle_timeout: Stop after this many seconds without new lines.
+        stop: Called between polls; following stops when it returns True.
+
+    Yields:
+        (records, position) for each batch of new lines.
+    """
+    match = matcher.match if matcher is not None else patterns.match
+    follower = LogFollower(source, position, max_read=max_read)
+    last_data = time.monotonic()
+    try:
+        while not (stop and stop()):
+            lines = follower.read()
+            if not lines:
+                if idle_timeout is not None and time.monotonic() - last_data >= idle_timeout:
+                    return
+                time.sleep(poll_interval)
+                continue
+            last_data = time.monotonic()
+
+            records: list[ParsedRecord] = []
+            for i, line in enumerate(lines, start=follower.line_number - len(lines) + 1):
+                if not line:
+                    continue
+                pattern, fields = match(line)
+                if pattern is None and not include_unmatched:
+                    continue
+                records.append(_build_record(i, line, pattern, fields, detect_types))
+            yield records, follower.position
+    finally:
+        follower.close()
@@ -0,0 +1,282 @@
+"""Per-time-bucket pattern histograms and distribution drift between buckets."""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import pairwise
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from log_sculptor.core.models import Pattern
+from log_sculptor.core.patterns import ParsedRecord, PatternSet, parse_logs
+from log_sculptor.core.timerange import _value_time
+from log_sculptor.core.tokenizer import TokenType
+
+# Default bucket width in seconds.
+DEFAULT_BUCKET_SECONDS = 60
+
+# Parsed timestamp values remembered before the cache is cleared.
+TIME_CACHE_SIZE = 4096
+
+_TIME_TOKENS = (TokenType.TIMESTAMP, TokenType.BRACKET)
+
+
+def js_divergence(p: dict, q: dict) -> float:
+    """
+    Jensen-Shannon divergence between two count histograms, in bits.
+
+    Counts are normalized first, so the result is in [0, 1]: 0 for the
+    same distribution, 1 for histograms with no key in common.
+    """
+    p_total = sum(p.values())
+    q_total = sum(q.values())
+    if not p_total or not q_total:
+        return 0.0
+    total = 0.0
+    for key in p.keys() | q.keys():
+        a = p.get(key, 0) / p_total
+        b = q.get(key, 0) / q_total
+        m = (a + b) / 2
+        if a:
+            total += a * math.log2(a / m)
+        if b:
+            total += b * math.log2(b / m)
+    return max(0.0, min(1.0, total / 2))
+
+
+def chi_square_distance(p: dict, q: dict) -> float:
+    """
+    Chi-square statistic of two count histograms, divided by their total count.
+
+    This is phi squared for the 2 x k contingency table (Cramer's V
+    squared), so like js_divergence it is in [0, 1] and does not grow
+    with bucket size.
+    """
+    p_total = sum(p.values())
+    q_total = sum(q.values())
+    n = p_total + q_total
+    if not p_total or not q_total:
+        return 0.0
+    chi2 = 0.0
+    for key in p.keys() | q.keys():
+        a = p.get(key, 0)
+        b = q.get(key, 0)
+        column = a + b
+        expected_a = column * p_total / n
+        expected_b = column * q_total / n
+        chi2 += (a - expected_a) ** 2 / expected_a + (b - expected_b) ** 2 / expected_b
+    return min(1.0, chi2 / n)
+
+
+_DIVERGENCES = {"js": js_divergence, "chi2": chi_square_distance}
+
+
+@dataclass
+class DistributionShift:
+    """A bucket whose pattern mix differs from the bucket before it."""
+    bucket_start: datetime
+    previous_start: datetime
+    divergence: float
+    old_pattern_id: str | None  # most frequent pattern in the previous bucket
+    new_pattern_id: str | None  # most frequent pattern in this bucket
+
+    def to_dict(self) -> dict:
+        return {
+            "bucket_start": self.bucket_start.isoformat(),
+            "previous_start": self.previous_start.isoformat(),
+            "divergence": round(self.divergence, 4),
+            "old_pattern_id": self.old_pattern_id,
+            "new_pattern_id": self.new_pattern_id,
+        }
+
+
+def _top(counts: dict[str | None, int]) -> str | None:
+    return max(counts, key=counts.get) if counts else None
+
+
+class PatternHistogram:
+    """
+    Pattern counts per time bucket, built in one pass over parsed records.
+
+    A record's time comes from the first timestamp (or bracketed
+    timestamp) field of its pattern. Records without one (unmatched lines,
+    continuation lines, patterns without a time field) are counted in the
+    bucket of the last timestamp seen, or as untimed before the first one.
+    Buckets are kept by start time, so records may arrive out of order;
+    memory grows with the number of buckets, not lines.
+
+    The histogram is callable, so it can be passed as a stream_parse callback.
+    """
+
+    def __init__(self, patterns: PatternSet, bucket_seconds: int = DEFAULT_BUCKET_SECONDS):
+        """
+        Initialize histogram.
+
+        Args:
+            patterns: PatternSet the records were parsed with.
+            bucket_seconds: Bucket width in seconds.
+        """
+        if bucket_seconds < 1:
+            raise ValueError(f"bucket_seconds must be positive, got {bucket_seconds}")
+        self.bucket_seconds = bucket_seconds
+        self.buckets: dict[int, dict[str | None, int]] = {}
+        self.records = 0
+        self.untimed = 0
+        self._patterns = {p.id: p for p in patterns.patterns}
+        self._time_fields: dict[str | None, list[tuple[str, TokenType]]] = {}
+        self._times: dict[tuple[TokenType, str], int | None] = {}
+        self._current: int | None = None
+
+    def _fields_for(self, pattern_id: str | None) -> list[tuple[str, TokenType]]:
+        fields = self._time_fields.get(pattern_id)
+        if fields is None:
+            pattern: Pattern | None = self._patterns.get(pattern_id)
+            fields = [] if pattern is None else [
+                (e.field_name, e.token_type) for e in pattern.elements
+                if e.type == "field" and e.token_type in _TIME_TOKENS
+            ]
+            self._time_fields[pattern_id] = fields
+        return fields
+
+    def _bucket_of(self, token_type: TokenType, value: str) -> int | None:
+        key = (token_type, value)
+        if key in self._times:
+            return self._times[key]
+        dt = _value_time(token_type, value)
+        bucket = None
+        if dt is not None:
+            bucket = int(dt.timestamp()) // self.bucket_seconds * self.bucket_seconds
+        if len(self._times) >= TIME_CACHE_SIZE:
+            self._times.clear()
+        self._times[key] = bucket
+        return bucket
+
+    def __call__(self, record: ParsedRecord) -> None:
+        self.add(record)
+
+    def add(self, record: ParsedRecord) -> None:
+        """Count a record in its time bucket."""
+        self.records += 1
+        bucket = None
+        for name, token_type in self._fields_for(record.pattern_id):
+            value = record.fields.get(name)
+            if value:
+                bucket = self._bucket_of(token_type, value)
+                if bucket is not None:
+                    break
+        if bucket is None:
+            bucket = self._current
+            if bucket is None:
+                self.untimed += 1
+                return
+        self._current = bucket
+        counts = self.buckets.get(bucket)
+        if counts is None:
+            counts = self.buckets[bucket] = {}
+        counts[record.pattern_id] = counts.get(record.pattern_id, 0) + 1
+
+    def update_many(self, records: Iterable[ParsedRecord]) -> None:
+        """Count records (e.g. a batch from follow_parse)."""
+        for record in records:
+            self.add(record)
+
+    def merge(self, other: "PatternHistogram") -> None:
+        """Add another histogram's counts (same bucket width) into this one."""
+        if other.bucket_seconds != self.bucket_seconds:
+            raise ValueError("Cannot merge histograms with different bucket widths")
+        for start, counts in other.buckets.items():
+            mine = self.buckets.setdefault(start, {})
+            for pattern_id, count in counts.items():
+                mine[pattern_id] = mine.get(pattern_id, 0) + count
+        self.records += other.records
+        self.untimed += other.untimed
+
+    def _start(self, bucket: int) -> datetime:
+        return datetime.fromtimestamp(bucket, tz=timezone.utc)
+
+    def rows(self) -> Iterator[tuple[datetime, str | None, int]]:
+        """Yield (bucket_start, pattern_id, count) in time order."""
+        for bucket in sorted(self.buckets):
+            for pattern_id, count in sorted(self.buckets[bucket].items(), key=lambda kv: -kv[1]):
+                yield self._start(bucket), pattern_id, count
+
+    def divergences(self, method: str = "js") -> list[tuple[datetime, float]]:
+        """
+        Divergence of each bucket from the previous non-empty bucket.
+
+        Args:
+            method: "js" (Jensen-Shannon) or "chi2" (normalized chi-square).
+
+        Returns:
+            (bucket_start, divergence) for every bucket after the first.
+        """
+        divergence = _DIVERGENCES.get(method)
+        if divergence is None:
+            raise ValueError(f"Unknown divergence method: {method!r}")
+        ordered = sorted(self.buckets)
+        return [
+            (self._start(b), divergence(self.buckets[a], self.buckets[b]))
+            for a, b in pairwise(ordered)
+        ]
+
+    def shifts(self, threshold: float = 0.3, method: str = "js", min_count: int = 1) -> list[DistributionShift]:
+        """
+        Buckets whose pattern distribution diverges from the previous bucket.
+
+        Args:
+            threshold: Minimum divergence to report.
+            method: "js" (Jensen-Shannon) or "chi2" (normalized chi-square).
+            min_count: Buckets with fewer records are skipped (compared
+                neither as the previous nor the current bucket).
+
+        Returns:
+            List of DistributionShift in time order.
+        """
+        divergence = _DIVERGENCES.get(method)
+        if divergence is None:
+            raise ValueError(f"Unknown divergence method: {method!r}")
+        ordered = [b for b in sorted(self.buckets) if sum(self.buckets[b].values()) >= min_count]
+        shifts = []
+        for a, b in pairwise(ordered):
+            score = divergence(self.buckets[a], self.buckets[b])
+            if score >= threshold:
+                shifts.append(DistributionShift(
+                    bucket_start=self._start(b),
+                    previous_start=self._start(a),
+                    divergence=score,
+                    old_pattern_id=_top(self.buckets[a]),
+                    new_pattern_id=_top(self.buckets[b]),
+                ))
+        return shifts
+
+    def to_dict(self) -> dict:
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "records": self.records,
+            "untimed": self.untimed,
+            "buckets": [
+                {"start": self._start(b).isoformat(), "counts": dict(self.buckets[b])}
+                for b in sorted(self.buckets)
+            ],
+        }
+
+
+def build_histogram(
+    source: str | Path,
+    patterns: PatternSet,
+    bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+) -> PatternHistogram:
+    """
+    Build a per-time-bucket pattern histogram for a log file.
+
+    Args:
+        source: Path to log file.
+        patterns: PatternSet to use.
+        bucket_seconds: Bucket width in seconds.
+
+    Returns:
+        PatternHistogram for the file.
+    """
+    histogram = PatternHistogram(patterns, bucket_seconds)
+    histogram.update_many(parse_logs(Path(source), patterns, detect_types=False))
+    return histogram
@@ -0,0 +1,311 @@
+"""Sparse line-number to byte-offset index for random access into log files."""
+
+import os
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import orjson
+
+from log_sculptor.core.reader import DEFAULT_BLOCK_SIZE, iter_lines, read_blocks
+from log_sculptor.exceptions import LineIndexError, OutputError
+
+# Lines between checkpoints.
+DEFAULT_INTERVAL = 65536
+
+INDEX_VERSION = 1
+
+# Sidecar file suffix appended to the log file name.
+SIDECAR_SUFFIX = ".lsidx"
+
+# Line terminators as split by the block reader (universal newlines).
+_TERMINATOR = re.compile(rb"\r\n?|\n")
+
+
+def _count_terminators(data: bytes, pos: int = 0) -> int:
+    """Count line terminators in data[pos:] (data must not end in a lone \\r)."""
+    newlines = data.count(b"\n", pos)
+    if b"\r" not in data:
+        return newlines
+    return newlines + data.count(b"\r", pos) - data.count(b"\r\n", pos)
+
+
+@dataclass
+class LineIndex:
+    """
+    Byte offsets of every ``interval``-th line of a file.
+
+    ``offsets[k]`` is the byte offset where line ``k * interval + 1`` starts
+    (line numbers are 1-based and count empty lines, as parse_logs does).
+    The file size and mtime are recorded to detect stale indexes.
+    """
+    interval: int
+    offsets: list[int]
+    line_count: int
+    size: int
+    mtime_ns: int
+    version: int = field(default=INDEX_VERSION)
+
+    @classmethod
+    def build(
+        cls,
+        source: str | Path,
+        interval: int = DEFAULT_INTERVAL,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> "LineIndex":
+        """
+        Scan a file and record its line checkpoints.
+
+        Args:
+            source: Path to log file.
+            interval: Lines between checkpoints.
+            block_size: Bytes read per block while scanning.
+
+        Returns:
+            LineIndex for the file.
+        """
+        if interval < 1:
+            raise ValueError(f"interval must be positive, got {interval}")
+        stat = os.stat(source)
+        size = stat.st_size
+
+        offsets = [0] if size else []
+        line = 1            # number of the line being scanned
+        target = 1 + interval
+        base = 0            # file offset of data[0]
+        carry = b""
+        last = b""
+        for block in read_blocks(source, block_size):
+            data = carry + block if carry else block
+            # A trailing \r may be the first half of \r\n.
+            if data.endswith(b"\r"):
+                carry, data = data[-1:], data[:-1]
+            else:
+                carry = b""
+            if data:
+                last = data[-1:]
+
+            pos = 0
+            while line + _count_terminators(data, pos) >= target:
+                if b"\r" in data:
+                    m = None
+                    for m in _TERMINATOR.finditer(data, pos):
+                        line += 1
+                        if line == target:
+                            break
+                    pos = m.end()
+                else:
+                    for _ in range(target - line):
+                        pos = data.index(b"\n", pos) + 1
+                    line = target
+                if base + pos < size:
+                    offsets.append(base + pos)
+                target += interval
+            line += _count_terminators(data, pos)
+            base += len(data)
+
+        if carry:
+            # File ends with \r.
+            line += 1
+            if line == target and base + 1 < size:
+                offsets.append(base + 1)
+            last = carry
+
+        line_count = line - 1 if not size or last in (b"\n", b"\r") else line
+        return cls(interval=interval, offsets=offsets, line_count=line_count, size=size, mtime_ns=stat.st_mtime_ns)
+
+    def matches(self, source: str | Path) -> bool:
+        """Whether the index still describes the file (same size and mtime)."""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def checkpoint(self, line_number: int) -> tuple[int, int]:
+        """
+        Get the nearest checkpoint at or before a line.
+
+        Args:
+            line_number: 1-based line number.
+
+        Returns:
+            (checkpoint_line_number, byte_offset).
+        """
+        if not self.offsets:
+            return 1, 0
+        k = min(max(line_number - 1, 0) // self.interval, len(self.offsets) - 1)
+        return k * self.interval + 1, self.offsets[k]
+
+    def split(self, parts: int) -> list[tuple[int, int, int]]:
+        """
+        Split the file into byte-balanced ranges on checkpoint boundaries.
+
+        Args:
+            parts: Desired number of ranges (fewer are returned for small files).
+
+        Returns:
+            List of (first_line_number, start_offset, end_offset).
+        """
+        if not self.offsets:
+            return []
+        cuts = [0]
+        for k in range(1, parts):
+            i = bisect_right(self.offsets, self.size * k // parts) - 1
+            if i > cuts[-1]:
+                cuts.append(i)
+        bounds = [self.offsets[i] for i in cuts] + [self.size]
+        return [(i * self.interval + 1, bounds[j], bounds[j + 1]) for j, i in enumerate(cuts)]
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.version,
+            "interval": self.interval,
+            "line_count": self.line_count,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "offsets": self.offsets,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LineIndex":
+        if data.get("version") != INDEX_VERSION:
+            raise LineIndexError(f"Unsupported index version: {data.get('version')}")
+        return cls(
+            interval=data["interval"],
+            offsets=list(data["offsets"]),
+            line_count=data["line_count"],
+            size=data["size"],
+            mtime_ns=data["mtime_ns"],
+        )
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        try:
+            path.write_bytes(orjson.dumps(self.to_dict()))
+        except Exception as e:
+            raise OutputError(f"Failed to write line index to {path}: {e}") from e
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LineIndex":
+        path = Path(path)
+        try:
+            return cls.from_dict(orjson.loads(path.read_bytes()))
+        except LineIndexError:
+            raise
+        except Exception as e:
+            raise LineIndexError(f"Failed to load line index from {path}: {e}") from e
+
+
+def line_number_at(source: str | Path, offset: int, index: LineIndex | None = None) -> int:
+    """
+    Get the number of the line starting at a byte offset.
+
+    Counts line terminators from the nearest index checkpoint (or from the
+    start of the file without an index).
+
+    Args:
+        source: Path to log file.
+        offset: Byte offset of a line start.
+        index: Up-to-date line index, if available.
+
+    Returns:
+        1-based line number.
+    """
+    line, start = 1, 0
+    if index is not None and index.offsets:
+        k = bisect_right(index.offsets, offset) - 1
+        if k >= 0:
+            line, start = k * index.interval + 1, index.offsets[k]
+    return line + _count_lines(source, start, offset)
+
+
+def _count_lines(source: str | Path, start: int, end: int) -> int:
+    """Count line terminators between two line-start offsets."""
+    count = 0
+    carry = b""
+    for block in read_blocks(source, start=start, end=end):
+        data = carry + block if carry else block
+        if data.endswith(b"\r"):
+            carry, data = data[-1:], data[:-1]
+        else:
+            carry = b""
+        count += _count_terminators(data)
+    return count + len(carry)
+
+
+def sidecar_path(source: str | Path) -> Path:
+    """Get the default sidecar index path for a log file."""
+    source = Path(source)
+    return source.with_name(source.name + SIDECAR_SUFFIX)
+
+
+def load_index(source: str | Path, path: str | Path | None = None) -> LineIndex | None:
+    """
+    Load a log file's sidecar index if it exists and is up to date.
+
+    Args:
+        source: Path to log file.
+        path: Index path (defaults to the sidecar next to the log file).
+
+    Returns:
+        LineIndex, or None if missing, unreadable or stale.
+    """
+    path = Path(path) if path is not None else sidecar_path(source)
+    if not path.exists():
+        return None
+    try:
+        index = LineIndex.load(path)
+    except LineIndexError:
+        return None
+    return index if index.matches(source) else None
+
+
+def iter_lines_from(
+    source: str | Path,
+    line_number: int = 1,
+    index: LineIndex | None = None,
+    **kwargs,
+) -> Iterator[tuple[int, str]]:
+    """
+    Iterate over a file's lines starting at a given line number.
+
+    Seeks to the nearest checkpoint when an up-to-date index is available,
+    otherwise reads from the beginning.
+
+    Args:
+        source: Path to log file.
+        line_number: First 1-based line number to yield.
+        index: Line index (defaults to a valid sidecar index, if any).
+        **kwargs: Passed to iter_lines.
+
+    Yields:
+        (line_number, line) pairs with global line numbers.
+    """
+    if index is None and line_number > 1:
+        index = load_index(source)
+    if index is not None and not index.matches(source):
+        raise LineIndexError(f"Line index is stale for {source}")
+    first, offset = index.checkpoint(line_number) if index is not None else (1, 0)
+    for i, line in enumerate(iter_lines(source, start=offset, **kwargs), start=first):
+        if i >= line_number:
+            yield i, line
+
+
+def read_line(source: str | Path, line_number: int, index: LineIndex | None = None) -> str | None:
+    """
+    Read a single line by number.
+
+    Args:
+        source: Path to log file.
+        line_number: 1-based line number.
+        index: Line index (defaults to a valid sidecar index, if any).
+
+    Returns:
+        The line, or None if the file has fewer lines.
+    """
+    for _, line in iter_lines_from(source, line_number, index):
+        return line
+    return None
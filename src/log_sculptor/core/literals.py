@@ -0,0 +1,117 @@
+"""Literal-vs-variable detection from per-position value statistics."""
+
+from log_sculptor.core.sketches import CardinalityCounter
+from log_sculptor.core.tokenizer import Token, TokenType
+
+# Token types that may be emitted as literals. Timestamps, numbers, IPs and
+# quoted/bracketed payloads stay fields even when constant in a small sample.
+LITERAL_TOKEN_TYPES = frozenset({TokenType.WORD, TokenType.PUNCT})
+
+Member = tuple[list[Token], str]
+
+
+def _non_ws(tokens: list[Token]) -> list[Token]:
+    return [t for t in tokens if t.type != TokenType.WHITESPACE]
+
+
+def position_stats(
+    rows: list[list[Token]],
+    skip: set[int] | None = None,
+    exact_limit: int = 64,
+) -> dict[int, CardinalityCounter]:
+    """
+    Collect value cardinality for each literal-eligible token position.
+
+    Args:
+        rows: Non-whitespace tokens per line (all the same length).
+        skip: Positions to leave out.
+        exact_limit: Distinct values tracked exactly before switching to HyperLogLog.
+
+    Returns:
+        Mapping of position to its value counter.
+    """
+    stats: dict[int, CardinalityCounter] = {}
+    if not rows:
+        return stats
+    for pos, token in enumerate(rows[0]):
+        if token.type in LITERAL_TOKEN_TYPES and not (skip and pos in skip):
+            stats[pos] = CardinalityCounter(exact_limit=exact_limit)
+    for row in rows:
+        for pos, counter in stats.items():
+            counter.add(row[pos].value)
+    return stats
+
+
+def literal_groups(
+    members: list[Member],
+    max_values: int = 1,
+    min_support: int = 2,
+    exact_limit: int = 64,
+) -> list[tuple[list[Member], dict[int, str]]]:
+    """
+    Split a cluster into groups with their literal positions.
+
+    A position whose value is constant across at least ``min_support`` lines
+    becomes a literal. A position with at most ``max_values`` distinct values
+    splits the cluster by value, so each sub-group carries that value as a
+    literal; values seen fewer than ``min_support`` times stay in a residual
+    group where the position remains a field.
+
+    Args:
+        members: Cluster members as (tokens, line) pairs.
+        max_values: Maximum distinct values for a position to split on.
+        min_support: Minimum lines backing a literal.
+        exact_limit: Distinct values tracked exactly per position.
+
+    Returns:
+        List of (members, literals) where literals maps non-whitespace token
+        position to literal value.
+    """
+    rows = [_non_ws(tokens) for tokens, _ in members]
+    if not rows or any(len(row) != len(rows[0]) for row in rows):
+        # Similarity clusters may mix lengths; positions are not comparable.
+        return [(members, {})]
+
+    return _split(list(range(len(members))), members, rows, {}, max_values, min_support, exact_limit)
+
+
+def _split(
+    indices: list[int],
+    members: list[Member],
+    rows: list[list[Token]],
+    fixed: dict[int, str],
+    max_values: int,
+    min_support: int,
+    exact_limit: int,
+) -> list[tuple[list[Member], dict[int, str]]]:
+    if len(indices) < min_support:
+        return [([members[i] for i in indices], fixed)]
+
+    stats = position_stats([rows[i] for i in indices], skip=set(fixed), exact_limit=exact_limit)
+    literals = dict(fixed)
+    candidates: list[tuple[int, int]] = []
+    for pos, counter in stats.items():
+        if not counter.exact:
+            continue
+        if counter.cardinality == 1:
+            literals[pos] = next(iter(counter.counts))
+        elif counter.cardinality <= max_values:
+            candidates.append((counter.cardinality, pos))
+
+    for _, pos in sorted(candidates):
+        supported = [v for v, c in stats[pos].counts.items() if c >= min_support]
+        if not supported:
+            continue
+        groups: dict[str, list[int]] = {v: [] for v in supported}
+        residual: list[int] = []
+        for i in indices:
+            groups.get(rows[i][pos].value, residual).append(i)
+
+        result: list[tuple[list[Member], dict[int, str]]] = []
+        for value, group in groups.items():
+            result.extend(_split(group, members, rows, {**literals, pos: value}, max_values, min_support, exact_limit))
+        if residual:
+            result.extend(_split(residual, members, rows, literals, max_values, min_support, exact_limit))
+        return result
+
+    return [([members[i] for i in indices], literals)]
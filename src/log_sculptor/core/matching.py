@@ -0,0 +1,438 @@
+"""Runtime pattern matchers with live statistics."""
+
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+import orjson
+
+from log_sculptor.core.models import Pattern, signature_compatible
+from log_sculptor.core.patterns import PatternSet
+from log_sculptor.core.tokenizer import (
+    TOKEN_TYPE_CODES,
+    TOKEN_TYPES,
+    Token,
+    TokenSpans,
+    TokenType,
+    token_signature,
+    tokenize,
+)
+from log_sculptor.di import PatternMatcher
+from log_sculptor.exceptions import OutputError
+
+
+@dataclass
+class MatchStats:
+    """Hit-rate statistics collected while matching."""
+    lines: int = 0
+    matched: int = 0
+    attempts: int = 0
+    reorders: int = 0
+    hits: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def match_rate(self) -> float:
+        return self.matched / self.lines if self.lines > 0 else 0.0
+
+    @property
+    def avg_attempts(self) -> float:
+        """Average Pattern.match calls per line."""
+        return self.attempts / self.lines if self.lines > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "lines": self.lines,
+            "matched": self.matched,
+            "match_rate": self.match_rate,
+            "attempts": self.attempts,
+            "avg_attempts": self.avg_attempts,
+            "reorders": self.reorders,
+            "hits": dict(sorted(self.hits.items(), key=lambda kv: kv[1], reverse=True)),
+        }
+
+    def save(self, path: str | Path, cache: "CacheStats | None" = None) -> None:
+        """
+        Write statistics as JSON.
+
+        Args:
+            path: Output path.
+            cache: Statistics of a CachingMatcher in front of the matcher,
+                written under "cache".
+        """
+        data = self.to_dict()
+        if cache is not None:
+            data["cache"] = cache.to_dict()
+        try:
+            Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        except Exception as e:
+            raise OutputError(f"Failed to write match statistics to {path}: {e}") from e
+
+
+def _exclusive(p1: Pattern, p2: Pattern) -> bool:
+    """Whether two same-signature patterns can never match the same line."""
+    e1 = [e for e in p1.elements if not (e.type == "literal" and e.token_type == TokenType.WHITESPACE)]
+    e2 = [e for e in p2.elements if not (e.type == "literal" and e.token_type == TokenType.WHITESPACE)]
+    return any(
+        a.type == "literal" and b.type == "literal" and a.value != b.value
+        for a, b in zip(e1, e2)
+    )
+
+
+class _Bucket:
+    """Candidate patterns for one line signature, in adaptive order."""
+
+    __slots__ = ("_before", "order")
+
+    def __init__(self, indices: list[int], patterns: list[Pattern]):
+        self.order = list(indices)
+        # _before[j] = patterns that must stay ahead of j because both can
+        # match the same line (first-match semantics).
+        self._before: dict[int, set[int]] = {j: set() for j in indices}
+        for a, i in enumerate(indices):
+            for j in indices[a + 1:]:
+                if not _exclusive(patterns[i], patterns[j]):
+                    self._before[j].add(i)
+
+    def reorder(self, hits: list[int]) -> bool:
+        """Order by hit count, respecting precedence constraints."""
+        pending = {j: len(deps) for j, deps in self._before.items()}
+        after: dict[int, list[int]] = {j: [] for j in pending}
+        for j, deps in self._before.items():
+            for i in deps:
+                after[i].append(j)
+        heap = [(-hits[j], j) for j, n in pending.items() if n == 0]
+        heapq.heapify(heap)
+        order: list[int] = []
+        while heap:
+            _, i = heapq.heappop(heap)
+            order.append(i)
+            for j in after[i]:
+                pending[j] -= 1
+                if pending[j] == 0:
+                    heapq.heappush(heap, (-hits[j], j))
+        changed = order != self.order
+        self.order = order
+        return changed
+
+
+class AdaptiveMatcher:
+    """
+    Pattern matcher that adapts its try-order to live traffic.
+
+    Patterns are bucketed by the token signature they can match, so a line
+    only tries patterns of its own shape. Within a bucket, patterns are
+    periodically reordered by hit count so the hottest are tried first.
+    Patterns that could both match the same line keep their original
+    relative order, so results are identical to PatternSet.match.
+    """
+
+    def __init__(self, patterns: PatternSet, reorder_interval: int = 1000, max_signatures: int = 10000):
+        """
+        Initialize matcher.
+
+        Args:
+            patterns: PatternSet to match against.
+            reorder_interval: Lines between reorderings (0 disables reordering).
+            max_signatures: Maximum line signatures kept in the bucket cache.
+        """
+        self.patterns = patterns
+        self.reorder_interval = reorder_interval
+        self.max_signatures = max_signatures
+        self.stats = MatchStats()
+        self._key: tuple | None = None
+        self._since_reorder = 0
+        self._build()
+
+    def _build(self) -> None:
+        self._pattern_list = list(self.patterns.patterns)
+        self._pattern_sigs = [p.type_signature() for p in self._pattern_list]
+        self._hits = [0] * len(self._pattern_list)
+        self._buckets: dict[tuple[TokenType, ...], _Bucket] = {}
+        self._key = self.patterns._state_key()
+
+    def _bucket(self, sig: tuple[TokenType, ...]) -> _Bucket:
+        bucket = self._buckets.get(sig)
+        if bucket is None:
+            if len(self._buckets) >= self.max_signatures:
+                self._buckets.clear()
+            indices = [i for i, p_sig in enumerate(self._pattern_sigs) if signature_compatible(p_sig, sig)]
+            bucket = _Bucket(indices, self._pattern_list)
+            if indices:
+                bucket.reorder(self._hits)
+            self._buckets[sig] = bucket
+        return bucket
+
+    def reorder(self) -> None:
+        """Reorder all buckets by current hit counts."""
+        for bucket in self._buckets.values():
+            if len(bucket.order) > 1 and bucket.reorder(self._hits):
+                self.stats.reorders += 1
+        self._since_reorder = 0
+
+    def match(self, line: str, tokens: list[Token] | None = None) -> tuple[Pattern | None, dict | None]:
+        """
+        Match a line against the pattern set.
+
+        Args:
+            line: Log line.
+            tokens: Pre-computed tokens for the line, if available.
+
+        Returns:
+            (pattern, fields) or (None, None).
+        """
+        if self.patterns._state_key() != self._key:
+            self._build()
+
+        stats = self.stats
+        stats.lines += 1
+        if self.reorder_interval:
+            self._since_reorder += 1
+            if self._since_reorder >= self.reorder_interval:
+                self.reorder()
+
+        if tokens is None:
+            tokens = tokenize(line)
+        bucket = self._bucket(token_signature(tokens))
+        for idx in bucket.order:
+            stats.attempts += 1
+            pattern = self._pattern_list[idx]
+            fields = pattern.match(tokens)
+            if fields is not None:
+                self._hits[idx] += 1
+                stats.matched += 1
+                stats.hits[pattern.id] = stats.hits.get(pattern.id, 0) + 1
+                return pattern, fields
+        return None, None
+
+
+@dataclass
+class CacheStats:
+    """Hit-ratio statistics for CachingMatcher."""
+    lookups: int = 0
+    exact_hits: int = 0
+    skeleton_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.exact_hits + self.skeleton_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "skeleton_hits": self.skeleton_hits,
+            "hit_ratio": self.hit_ratio,
+            "evictions": self.evictions,
+        }
+
+
+# Masks ASCII digits so lines differing only in numbers share a key.
+_DIGIT_MASK = str.maketrans("123456789", "000000000")
+
+_MISS = (None, None)
+
+
+class CachingMatcher:
+    """
+    Bounded result cache in front of a matcher.
+
+    Repeated lines are answered from an exact-line cache. With ``skeleton``
+    enabled, lines that differ only in their digits (e.g. timestamps and
+    counters in health checks) share an entry keyed on the digit-masked line;
+    fields are re-sliced from the cached token offsets. Digits never change
+    token boundaries or types, so skeleton hits are exact as long as no
+    pattern literal contains a digit; otherwise only exact hits are used.
+    """
+
+    def __init__(
+        self,
+        patterns: PatternSet,
+        matcher: PatternMatcher | None = None,
+        max_size: int = 10000,
+        skeleton: bool = False,
+        eviction: Literal["lru", "fifo"] = "lru",
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            patterns: PatternSet being matched (used for invalidation).
+            matcher: Matcher to consult on misses (defaults to patterns.match).
+            max_size: Maximum entries per cache.
+            skeleton: Also cache by digit-masked line.
+            eviction: "lru" refreshes entries on hit; "fifo" evicts oldest inserted.
+        """
+        if eviction not in ("lru", "fifo"):
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.patterns = patterns
+        self.matcher = matcher
+        self.max_size = max_size
+        self.skeleton = skeleton
+        self.eviction = eviction
+        self.stats = CacheStats()
+        self._exact: OrderedDict[str, tuple] = OrderedDict()
+        self._skeletons: OrderedDict[str, tuple] = OrderedDict()
+        self._key: tuple | None = None
+        self._skeleton_safe = False
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._exact.clear()
+        self._skeletons.clear()
+        self._key = self.patterns._state_key()
+        self._skeleton_safe = not any(
+            e.type == "literal" and e.value and any(c.isdigit() for c in e.value)
+            for p in self.patterns.patterns for e in p.elements
+        )
+
+    def _put(self, cache: OrderedDict, key: str, value: tuple) -> None:
+        cache[key] = value
+        if len(cache) > self.max_size:
+            cache.popitem(last=False)
+            self.stats.evictions += 1
+
+    def match(self, line: str) -> tuple[Pattern | None, dict | None]:
+        """Match a line, answering from cache when possible."""
+        if self.patterns._state_key() != self._key:
+            self.clear()
+        self.stats.lookups += 1
+        lru = self.eviction == "lru"
+
+        cached = self._exact.get(line)
+        if cached is not None:
+            self.stats.exact_hits += 1
+            if lru:
+                self._exact.move_to_end(line)
+            pattern, fields = cached
+            return (pattern, dict(fields)) if pattern else _MISS
+
+        use_skeleton = self.skeleton and self._skeleton_safe
+        if use_skeleton:
+            skeleton = line.translate(_DIGIT_MASK)
+            cached = self._skeletons.get(skeleton)
+            if cached is not None:
+                self.stats.skeleton_hits += 1
+                if lru:
+                    self._skeletons.move_to_end(skeleton)
+                pattern, spans = cached
+                if pattern is None:
+                    return _MISS
+                return pattern, {name: line[start:end] for name, start, end in spans}
+
+        pattern, fields = self.matcher.match(line) if self.matcher is not None else self.patterns.match(line)
+        if self.max_size > 0:
+            self._put(self._exact, line, (pattern, dict(fields) if fields is not None else None))
+            if use_skeleton:
+                spans = pattern.match_spans(tokenize(line)) if pattern else None
+                self._put(self._skeletons, skeleton, (pattern, spans))
+        return pattern, fields
+
+
+_WHITESPACE_CODE = TOKEN_TYPE_CODES[TokenType.WHITESPACE]
+_DROP_WHITESPACE = bytes([_WHITESPACE_CODE])
+
+# Compiled non-whitespace element: (type code or -1, literal str, literal bytes, field name)
+_SpanElement = tuple[int, str | None, bytes | None, str | None]
+
+
+def _compile_elements(pattern: Pattern) -> list[_SpanElement]:
+    compiled = []
+    for e in pattern.elements:
+        if e.type == "literal":
+            if e.token_type == TokenType.WHITESPACE:
+                continue
+            value = e.value or ""
+            encoded = value.encode("ascii") if value.isascii() else None
+            compiled.append((-1, value, encoded, None))
+        else:
+            code = TOKEN_TYPE_CODES[e.token_type] if e.token_type else -1
+            compiled.append((code, None, None, e.field_name))
+    return compiled
+
+
+class SpanMatcher:
+    """
+    Pattern matcher over TokenSpans instead of Token lists.
+
+    Works on str spans and on ASCII byte spans (tokenize_bytes) alike:
+    types are compared as codes, literals in place, and only field offsets
+    are returned, so callers slice (or decode) just the values they emit.
+    Results are identical to PatternSet.match on the same line.
+    """
+
+    def __init__(self, patterns: PatternSet, max_signatures: int = 10000):
+        """
+        Initialize matcher.
+
+        Args:
+            patterns: PatternSet to match against.
+            max_signatures: Maximum line signatures kept in the bucket cache.
+        """
+        self.patterns = patterns
+        self.max_signatures = max_signatures
+        self._key: tuple | None = None
+        self._build()
+
+    def _build(self) -> None:
+        self._pattern_list = list(self.patterns.patterns)
+        self._compiled = [_compile_elements(p) for p in self._pattern_list]
+        self._pattern_sigs = [p.type_signature() for p in self._pattern_list]
+        self._buckets: dict[bytes, list[int]] = {}
+        self._key = self.patterns._state_key()
+
+    def _bucket(self, sig: bytes) -> list[int]:
+        bucket = self._buckets.get(sig)
+        if bucket is None:
+            if len(self._buckets) >= self.max_signatures:
+                self._buckets.clear()
+            line_sig = tuple(TOKEN_TYPES[c] for c in sig)
+            bucket = [i for i, p_sig in enumerate(self._pattern_sigs) if signature_compatible(p_sig, line_sig)]
+            self._buckets[sig] = bucket
+        return bucket
+
+    def match_spans(self, spans: TokenSpans) -> tuple[Pattern | None, list[tuple[str, int, int]] | None]:
+        """
+        Match tokenized spans.
+
+        Args:
+            spans: Line tokens from tokenize_spans or tokenize_bytes.
+
+        Returns:
+            (pattern, [(field_name, start, end), ...]) or (None, None).
+        """
+        if self.patterns._state_key() != self._key:
+            self._build()
+
+        bucket = self._bucket(bytes(spans.types).translate(None, _DROP_WHITESPACE))
+        if not bucket:
+            return None, None
+
+        line = spans.line
+        is_bytes = not isinstance(line, str)
+        types, starts, ends = spans.types, spans.starts, spans.ends
+        positions = [k for k, code in enumerate(types) if code != _WHITESPACE_CODE]
+        for idx in bucket:
+            fields: list[tuple[str, int, int]] = []
+            for k, (code, literal, encoded, name) in zip(positions, self._compiled[idx]):
+                start, end = starts[k], ends[k]
+                if literal is not None:
+                    if is_bytes:
+                        literal = encoded
+                        if literal is None:
+                            break
+                    if end - start != len(literal) or not line.startswith(literal, start):
+                        break
+                elif code >= 0 and types[k] != code:
+                    break
+                elif name:
+                    fields.append((name, start, end))
+            else:
+                return self._pattern_list[idx], fields
+        return None, None
@@ -1,9 +1,8 @@
 """Pattern merging for log-sculptor."""
 
-import hashlib
-
-from log_sculptor.core.tokenizer import TokenType
 from log_sculptor.core.models import Pattern, PatternElement
+from log_sculptor.core.patterns import _generate_pattern_id
+from log_sculptor.core.tokenizer import TokenType
 
 
 def _get_type_signature(pattern: Pattern) -> tuple[TokenType | None, ...]:
@@ -122,12 +121,7 @@ def merge_two(p1: Pattern, p2: Pattern) -> Pattern:
         field_index += 1
 
     # Generate new ID
-    sig = "|".join(
-        f"{e.type}:{e.token_type.value if e.token_type else e.value}"
-        for e in new_elements
-        if not (e.type == "literal" and e.token_type == TokenType.WHITESPACE)
-    )
-    new_id = hashlib.md5(sig.encode()).hexdigest()[:12]
+    new_id = _generate_pattern_id(new_elements)
 
     # Combine metadata
     total_freq = p1.frequency + p2.frequency
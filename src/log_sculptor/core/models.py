@@ -32,6 +32,13 @@ class PatternElement:
         )
 
 
+def signature_compatible(pattern_sig: tuple[TokenType | None, ...], line_sig: tuple[TokenType, ...]) -> bool:
+    """Whether a pattern with the given type signature could match a line of line_sig."""
+    if len(pattern_sig) != len(line_sig):
+        return False
+    return all(p is None or p == t for p, t in zip(pattern_sig, line_sig))
+
+
 @dataclass
 class Pattern:
     """A pattern for matching log lines."""
@@ -41,6 +48,13 @@ class Pattern:
     confidence: float = 1.0
     example: str | None = None
 
+    def type_signature(self) -> tuple[TokenType | None, ...]:
+        """Token types of non-whitespace elements (None matches any type)."""
+        return tuple(
+            e.token_type for e in self.elements
+            if not (e.type == "literal" and e.token_type == TokenType.WHITESPACE)
+        )
+
     def match(self, tokens: list[Token]) -> dict | None:
         non_ws_tokens = [t for t in tokens if t.type != TokenType.WHITESPACE]
         non_ws_elements = [e for e in self.elements if not (e.type == "literal" and e.token_type == TokenType.WHITESPACE)]
@@ -61,6 +75,27 @@ class Pattern:
 
         return fields
 
+    def match_spans(self, tokens: list[Token]) -> list[tuple[str, int, int]] | None:
+        """Like match(), but return (field_name, start, end) offsets into the line."""
+        non_ws_tokens = [t for t in tokens if t.type != TokenType.WHITESPACE]
+        non_ws_elements = [e for e in self.elements if not (e.type == "literal" and e.token_type == TokenType.WHITESPACE)]
+
+        if len(non_ws_tokens) != len(non_ws_elements):
+            return None
+
+        spans: list[tuple[str, int, int]] = []
+        for token, element in zip(non_ws_tokens, non_ws_elements):
+            if element.type == "literal":
+                if token.value != element.value:
+                    return None
+            else:
+                if element.token_type and token.type != element.token_type:
+                    return None
+                if element.field_name:
+                    spans.append((element.field_name, token.start, token.end))
+
+        return spans
+
     def to_dict(self) -> dict:
         return {
             "id": self.id,
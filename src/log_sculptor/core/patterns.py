@@ -1,39 +1,134 @@
 """Pattern representation, learning, and matching."""
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterator, Any
+from itertools import chain
+from typing import Iterable, Iterator, Any
 import hashlib
 import orjson
 
-from log_sculptor.core.tokenizer import Token, TokenType, tokenize
-from log_sculptor.core.models import Pattern, PatternElement
+from log_sculptor.core.tokenizer import Token, TokenType, token_signature, tokenize, tokenize_signature
+from log_sculptor.core.models import Pattern, PatternElement, signature_compatible
+from log_sculptor.core.reader import iter_lines
 from log_sculptor.exceptions import PatternLoadError, PatternSaveError
+from log_sculptor.di import PatternMatcher
+from log_sculptor.parsers.multiline import LearnedEntryStart
+
+# A log file path, an iterable of lines, or an iterable of (line_number, line) pairs.
+LineSource = str | Path | Iterable[str] | Iterable[tuple[int, str]]
 
 # Re-export for backwards compatibility
 __all__ = ["Pattern", "PatternElement", "PatternSet", "ParsedRecord", "learn_patterns", "parse_logs"]
 
 
+# Minimum number of patterns before match() consults the literal prefilter.
+PREFILTER_MIN_PATTERNS = 32
+
+# Maximum token signatures remembered as matching no pattern.
+NEGATIVE_CACHE_SIZE = 4096
+
+
 @dataclass
 class PatternSet:
     """Collection of patterns for parsing logs."""
     patterns: list[Pattern] = field(default_factory=list)
     version: str = "1.0"
+    # Learned multi-line entry-start signature, if one was learned.
+    entry_start: LearnedEntryStart | None = None
+    _revision: int = field(default=0, init=False, repr=False, compare=False)
+    _index_key: tuple | None = field(default=None, init=False, repr=False, compare=False)
+    _prefilter: Any = field(default=None, init=False, repr=False, compare=False)
+    _signatures: list | None = field(default=None, init=False, repr=False, compare=False)
+    _negative: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False, compare=False)
 
     def add(self, pattern: Pattern) -> None:
         self.patterns.append(pattern)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop cached match structures (call after mutating patterns in place)."""
+        self._revision += 1
+
+    def _state_key(self) -> tuple:
+        """Key identifying the current pattern list, for derived caches."""
+        return (self._revision, id(self.patterns), len(self.patterns))
+
+    def _refresh_index(self) -> None:
+        """Reset derived match structures if the patterns changed."""
+        key = self._state_key()
+        if key != self._index_key:
+            self._prefilter = None
+            self._signatures = None
+            self._negative = OrderedDict()
+            self._index_key = key
+
+    def compile(self) -> "PatternSet":
+        """Build derived match structures now instead of on first match (for long-lived parsers)."""
+        self._refresh_index()
+        if len(self.patterns) >= PREFILTER_MIN_PATTERNS and self._prefilter is None:
+            from log_sculptor.core.prefilter import LiteralPrefilter
+            self._prefilter = LiteralPrefilter(self.patterns)
+        if self._signatures is None:
+            self._signatures = [p.type_signature() for p in self.patterns]
+        return self
+
+    # match() may run on several threads at once (aio, serve): derived
+    # structures are built into locals and published with one assignment,
+    # and the negative cache is only read by membership and evicted FIFO,
+    # so concurrent callers at worst build or evict something twice.
+
+    def _candidates(self, line: str) -> list[Pattern]:
+        """Get patterns worth trying for a line, in priority order."""
+        if len(self.patterns) < PREFILTER_MIN_PATTERNS:
+            return self.patterns
+        prefilter = self._prefilter
+        if prefilter is None:
+            from log_sculptor.core.prefilter import LiteralPrefilter
+            prefilter = self._prefilter = LiteralPrefilter(self.patterns)
+        return prefilter.candidates(line)
+
+    def _remember_miss(self, sig: tuple[TokenType, ...]) -> None:
+        """Cache a signature that no pattern can structurally match."""
+        signatures = self._signatures
+        if signatures is None:
+            signatures = self._signatures = [p.type_signature() for p in self.patterns]
+        # A literal mismatch only rules out this line, not its whole shape.
+        if any(signature_compatible(p_sig, sig) for p_sig in signatures):
+            return
+        negative = self._negative
+        negative[sig] = None
+        if len(negative) > NEGATIVE_CACHE_SIZE:
+            try:
+                negative.popitem(last=False)
+            except KeyError:
+                pass  # emptied by another thread
+
+    def match(self, line: str, tokens: list[Token] | None = None) -> tuple[Pattern | None, dict | None]:
+        self._refresh_index()
+        candidates = self._candidates(line)
+        if not candidates:
+            return None, None
+        if tokens is None:
+            tokens = tokenize(line)
 
-    def match(self, line: str) -> tuple[Pattern | None, dict | None]:
-        tokens = tokenize(line)
-        for pattern in self.patterns:
+        sig = token_signature(tokens)
+        if sig in self._negative:
+            return None, None
+
+        for pattern in candidates:
             fields = pattern.match(tokens)
             if fields is not None:
                 return pattern, fields
+
+        self._remember_miss(sig)
         return None, None
 
     def save(self, path: str | Path) -> None:
         path = Path(path)
         data = {"version": self.version, "patterns": [p.to_dict() for p in self.patterns]}
+        if self.entry_start is not None:
+            data["entry_start"] = self.entry_start.to_dict()
         try:
             path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         except Exception as e:
@@ -44,7 +139,12 @@ class PatternSet:
         path = Path(path)
         try:
             data = orjson.loads(path.read_bytes())
-            return cls(version=data.get("version", "1.0"), patterns=[Pattern.from_dict(p) for p in data["patterns"]])
+            entry_start = data.get("entry_start")
+            return cls(
+                version=data.get("version", "1.0"),
+                patterns=[Pattern.from_dict(p) for p in data["patterns"]],
+                entry_start=LearnedEntryStart.from_dict(entry_start) if entry_start else None,
+            )
         except Exception as e:
             raise PatternLoadError(f"Failed to load patterns from {path}: {e}") from e
 
@@ -77,12 +177,16 @@ class PatternSet:
                 self.patterns.append(new_p)
                 existing_ids[new_p.id] = len(self.patterns) - 1
 
+        if new_patterns.entry_start is not None:
+            self.entry_start = new_patterns.entry_start
+
         # Optionally merge similar patterns
         if merge:
             self.merge_similar(threshold)
 
         # Re-sort by frequency
         self.patterns.sort(key=lambda p: p.frequency, reverse=True)
+        self.invalidate()
 
     def merge_similar(self, threshold: float = 0.8) -> None:
         """
@@ -94,21 +198,44 @@ class PatternSet:
         from log_sculptor.core.merging import merge_patterns
         self.patterns = merge_patterns(self.patterns, threshold)
         self.patterns.sort(key=lambda p: p.frequency, reverse=True)
+        self.invalidate()
+
+
+def _element_key(e: PatternElement) -> str:
+    key = f"{e.type}:{e.token_type.value if e.token_type else e.value}"
+    if e.type == "literal" and e.token_type:
+        key += f"={e.value}"
+    return key
 
 
 def _generate_pattern_id(elements: list[PatternElement]) -> str:
     sig = "|".join(
-        f"{e.type}:{e.token_type.value if e.token_type else e.value}"
+        _element_key(e)
         for e in elements
         if not (e.type == "literal" and e.token_type == TokenType.WHITESPACE)
     )
     return hashlib.md5(sig.encode()).hexdigest()[:12]
 
 
-def _pattern_from_tokens(tokens: list[Token], line: str, smart_naming: bool = True) -> Pattern:
+def _pattern_from_tokens(
+    tokens: list[Token],
+    line: str,
+    smart_naming: bool = True,
+    literals: dict[int, str] | None = None,
+) -> Pattern:
+    """
+    Build a pattern from a tokenized line.
+
+    Args:
+        tokens: Tokens of the representative line.
+        line: The representative line (stored as example).
+        smart_naming: Use context-based field naming.
+        literals: Non-whitespace token positions to emit as literal elements.
+    """
     from log_sculptor.core.naming import generate_field_names
 
     elements: list[PatternElement] = []
+    literals = literals or {}
 
     if smart_naming:
         field_names = generate_field_names(tokens)
@@ -116,6 +243,9 @@ def _pattern_from_tokens(tokens: list[Token], line: str, smart_naming: bool = Tr
         for token in tokens:
             if token.type == TokenType.WHITESPACE:
                 elements.append(PatternElement(type="literal", value=token.value, token_type=TokenType.WHITESPACE))
+            elif name_idx in literals:
+                elements.append(PatternElement(type="literal", value=literals[name_idx], token_type=token.type))
+                name_idx += 1
             else:
                 field_name = field_names[name_idx] if name_idx < len(field_names) else f"field_{name_idx}"
                 elements.append(PatternElement(type="field", token_type=token.type, field_name=field_name))
@@ -127,6 +257,10 @@ def _pattern_from_tokens(tokens: list[Token], line: str, smart_naming: bool = Tr
         for token in tokens:
             if token.type == TokenType.WHITESPACE:
                 elements.append(PatternElement(type="literal", value=token.value, token_type=TokenType.WHITESPACE))
+            elif field_index in literals:
+                elements.append(PatternElement(type="literal", value=literals[field_index], token_type=token.type))
+                field_index += 1
+                prev_non_ws = token
             else:
                 if prev_non_ws and prev_non_ws.type == TokenType.WORD:
                     field_name = prev_non_ws.value.lower()
@@ -149,29 +283,89 @@ def _pattern_from_tokens(tokens: list[Token], line: str, smart_naming: bool = Tr
     return Pattern(id=pattern_id, elements=elements, frequency=1, example=line)
 
 
+def _numbered_lines(source: LineSource) -> Iterator[tuple[int, str]]:
+    """Number the lines of a source (pairs are passed through as numbered)."""
+    if isinstance(source, (str, Path)):
+        return enumerate(iter_lines(source), start=1)
+    it = iter(source)
+    first = next(it, None)
+    if first is None:
+        return iter(())
+    if isinstance(first, tuple):
+        return chain([first], it)
+    return enumerate(chain([first], it), start=1)
+
+
+def _learn_by_signature(lines: list[str], min_frequency: int = 1) -> PatternSet:
+    """
+    Learn one pattern per exact token signature.
+
+    Same result as cluster_by_exact_signature, but groups lines by their
+    signature alone and only builds tokens for each group's first line.
+    """
+    # signature -> [first line, line count]
+    groups: dict[tuple[TokenType, ...], list] = {}
+    for line in lines:
+        sig = tokenize_signature(line)
+        group = groups.get(sig)
+        if group is None:
+            groups[sig] = [line, 1]
+        else:
+            group[1] += 1
+
+    pattern_set = PatternSet()
+    for line, count in groups.values():
+        if count < min_frequency:
+            continue
+        pattern = _pattern_from_tokens(tokenize(line), line)
+        pattern.frequency = count
+        pattern.confidence = 1.0
+        pattern_set.add(pattern)
+
+    pattern_set.patterns.sort(key=lambda p: p.frequency, reverse=True)
+    pattern_set.invalidate()
+    return pattern_set
+
+
 def learn_patterns(
-    source: str | Path,
+    source: LineSource,
     sample_size: int | None = None,
     min_frequency: int = 1,
     use_clustering: bool = False,
     cluster_threshold: float = 0.7,
+    detect_literals: bool = False,
+    max_literal_values: int = 1,
+    min_literal_support: int = 2,
 ) -> PatternSet:
-    """Learn patterns from a log file."""
+    """
+    Learn patterns from a log file or an in-memory line source.
+
+    Args:
+        source: Path to log file, iterable of lines, or iterable of
+            (line_number, line) pairs (e.g. from join_multiline_numbered).
+        sample_size: Max lines to sample.
+        min_frequency: Minimum lines per pattern.
+        use_clustering: Use similarity-based clustering instead of exact signatures.
+        cluster_threshold: Similarity threshold for clustering.
+        detect_literals: Emit low-cardinality token positions as literal elements.
+        max_literal_values: Maximum distinct values at a position for it to be
+            split into per-value literal patterns (1 = only constant positions).
+        min_literal_support: Minimum lines backing a literal value.
+    """
     from log_sculptor.core.clustering import cluster_lines, cluster_by_exact_signature
+    from log_sculptor.core.literals import literal_groups
 
-    source = Path(source)
-    lines: list[tuple[list[Token], str]] = []
+    raw_lines: list[str] = []
+    for i, (_, line) in enumerate(_numbered_lines(source)):
+        if sample_size and i >= sample_size:
+            break
+        if line:
+            raw_lines.append(line)
 
-    with source.open("r", errors="replace") as f:
-        for i, line in enumerate(f):
-            if sample_size and i >= sample_size:
-                break
-            line = line.rstrip("\n\r")
-            if not line:
-                continue
-            tokens = tokenize(line)
-            lines.append((tokens, line))
+    if not use_clustering and not detect_literals:
+        return _learn_by_signature(raw_lines, min_frequency)
 
+    lines = [(tokenize(line), line) for line in raw_lines]
     if use_clustering:
         clusters = cluster_lines(lines, threshold=cluster_threshold)
     else:
@@ -179,15 +373,21 @@ def learn_patterns(
 
     pattern_set = PatternSet()
     for cluster in clusters:
-        if len(cluster.members) < min_frequency:
-            continue
-        tokens, line = cluster.members[0]
-        pattern = _pattern_from_tokens(tokens, line)
-        pattern.frequency = len(cluster.members)
-        pattern.confidence = cluster.cohesion
-        pattern_set.add(pattern)
+        if detect_literals:
+            groups = literal_groups(cluster.members, max_values=max_literal_values, min_support=min_literal_support)
+        else:
+            groups = [(cluster.members, {})]
+        for members, literals in groups:
+            if len(members) < min_frequency:
+                continue
+            tokens, line = members[0]
+            pattern = _pattern_from_tokens(tokens, line, literals=literals)
+            pattern.frequency = len(members)
+            pattern.confidence = cluster.cohesion
+            pattern_set.add(pattern)
 
     pattern_set.patterns.sort(key=lambda p: p.frequency, reverse=True)
+    pattern_set.invalidate()
     return pattern_set
 
 
@@ -203,38 +403,56 @@ class ParsedRecord:
     typed_fields: dict[str, Any] | None = None
 
 
+def _build_record(
+    line_number: int,
+    line: str,
+    pattern: Pattern | None,
+    fields: dict | None,
+    detect_types: bool = True,
+) -> ParsedRecord:
+    """Build a ParsedRecord from a match result."""
+    typed_fields = None
+    if detect_types and fields:
+        from log_sculptor.types.detector import detect_type
+
+        typed_fields = {}
+        for name, value in fields.items():
+            typed = detect_type(value)
+            typed_fields[name] = {"value": typed.normalized, "type": typed.type.value}
+
+    return ParsedRecord(
+        line_number=line_number,
+        raw=line,
+        fields=fields or {},
+        pattern_id=pattern.id if pattern else None,
+        matched=pattern is not None,
+        confidence=pattern.confidence if pattern else 0.0,
+        typed_fields=typed_fields,
+    )
+
+
 def parse_logs(
-    source: str | Path,
+    source: LineSource,
     patterns: PatternSet,
     detect_types: bool = True,
+    matcher: PatternMatcher | None = None,
 ) -> Iterator[ParsedRecord]:
-    """Parse a log file using learned patterns."""
-    from log_sculptor.types.detector import detect_type
-
-    source = Path(source)
-
-    with source.open("r", errors="replace") as f:
-        for i, line in enumerate(f, start=1):
-            line = line.rstrip("\n\r")
-            if not line:
-                continue
+    """
+    Parse a log file or an in-memory line source using learned patterns.
+
+    Args:
+        source: Path to log file, iterable of lines, or iterable of
+            (line_number, line) pairs whose numbers are kept in the records.
+        patterns: PatternSet for matching.
+        detect_types: Whether to detect field types.
+        matcher: Optional matcher used instead of patterns.match
+            (e.g. an AdaptiveMatcher collecting statistics).
+    """
+    match = matcher.match if matcher is not None else patterns.match
+
+    for i, line in _numbered_lines(source):
+        if not line:
+            continue
 
-            pattern, fields = patterns.match(line)
-            confidence = pattern.confidence if pattern else 0.0
-
-            typed_fields = None
-            if detect_types and fields:
-                typed_fields = {}
-                for name, value in fields.items():
-                    typed = detect_type(value)
-                    typed_fields[name] = {"value": typed.normalized, "type": typed.type.value}
-
-            yield ParsedRecord(
-                line_number=i,
-                raw=line,
-                fields=fields or {},
-                pattern_id=pattern.id if pattern else None,
-                matched=pattern is not None,
-                confidence=confidence,
-                typed_fields=typed_fields,
-            )
+        pattern, fields = match(line)
+        yield _build_record(i, line, pattern, fields, detect_types)
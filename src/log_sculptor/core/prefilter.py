@@ -0,0 +1,205 @@
+"""Literal-anchor prefiltering for candidate pattern selection."""
+
+from collections import deque
+from typing import Iterable, Iterator
+
+from log_sculptor.core.models import Pattern
+from log_sculptor.core.tokenizer import TokenType
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton for finding many keywords in one pass."""
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        """
+        Initialize automaton.
+
+        Args:
+            keywords: Initial keywords to add.
+        """
+        self.keywords: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._own: list[tuple[int, ...]] = [()]
+        self._out: list[tuple[int, ...]] = [()]
+        self._built = True
+        for keyword in keywords:
+            self.add(keyword)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def add(self, keyword: str) -> int:
+        """
+        Add a keyword.
+
+        Args:
+            keyword: Non-empty string to search for.
+
+        Returns:
+            Keyword id (index into ``keywords``).
+        """
+        if not keyword:
+            raise ValueError("Keyword must be non-empty")
+        if keyword in self._ids:
+            return self._ids[keyword]
+
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append(())
+                self._out.append(())
+                self._goto[state][char] = nxt
+            state = nxt
+
+        keyword_id = len(self.keywords)
+        self.keywords.append(keyword)
+        self._ids[keyword] = keyword_id
+        self._own[state] = self._own[state] + (keyword_id,)
+        self._built = False
+        return keyword_id
+
+    def _build(self) -> None:
+        """Compute failure links and merged outputs (breadth-first)."""
+        goto, fail, out, own = self._goto, self._fail, self._out, self._own
+        queue: deque[int] = deque()
+        for state in goto[0].values():
+            fail[state] = 0
+            out[state] = own[state]
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(char, 0)
+                out[nxt] = own[nxt] + out[fail[nxt]]
+                queue.append(nxt)
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """
+        Find all keyword occurrences, including overlapping ones.
+
+        Args:
+            text: Text to scan.
+
+        Yields:
+            (end_index, keyword_id) for each occurrence; end_index is exclusive.
+        """
+        if not self._built:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_id in out[state]:
+                yield i + 1, keyword_id
+
+    def find_all(self, text: str) -> set[int]:
+        """Return the ids of all keywords occurring in text."""
+        if not self._built:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+def pattern_anchors(pattern: Pattern, min_length: int = 2) -> set[str]:
+    """
+    Get the distinctive literals that must occur in any line a pattern matches.
+
+    Args:
+        pattern: Pattern to inspect.
+        min_length: Minimum literal length worth anchoring on.
+
+    Returns:
+        Set of literal strings.
+    """
+    return {
+        e.value for e in pattern.elements
+        if e.type == "literal" and e.token_type != TokenType.WHITESPACE
+        and e.value and len(e.value) >= min_length
+    }
+
+
+class LiteralPrefilter:
+    """Select candidate patterns by scanning a raw line for their literals."""
+
+    def __init__(self, patterns: list[Pattern], min_length: int = 2):
+        """
+        Build prefilter.
+
+        Args:
+            patterns: Patterns in match priority order.
+            min_length: Minimum literal length used as an anchor.
+        """
+        self.patterns = list(patterns)
+        self.automaton = AhoCorasick()
+        self._required: list[int] = []
+        self._keyword_patterns: list[list[int]] = []
+        self._unanchored: list[int] = []
+
+        for idx, pattern in enumerate(self.patterns):
+            anchors = pattern_anchors(pattern, min_length)
+            self._required.append(len(anchors))
+            if not anchors:
+                self._unanchored.append(idx)
+            for anchor in sorted(anchors):
+                keyword_id = self.automaton.add(anchor)
+                if keyword_id == len(self._keyword_patterns):
+                    self._keyword_patterns.append([])
+                self._keyword_patterns[keyword_id].append(idx)
+
+        self._unanchored_patterns = [self.patterns[i] for i in self._unanchored]
+
+    @property
+    def anchored_count(self) -> int:
+        """Number of patterns with at least one anchor."""
+        return len(self.patterns) - len(self._unanchored)
+
+    def candidates(self, line: str) -> list[Pattern]:
+        """
+        Get patterns whose anchors all occur in a line.
+
+        Patterns without anchors are always candidates. The result keeps the
+        original pattern order, so first-match semantics are preserved.
+
+        Args:
+            line: Raw log line.
+
+        Returns:
+            Candidate patterns in priority order.
+        """
+        if not self.automaton:
+            return self.patterns
+        found = self.automaton.find_all(line)
+        if not found:
+            return self._unanchored_patterns
+
+        hits: dict[int, int] = {}
+        for keyword_id in found:
+            for idx in self._keyword_patterns[keyword_id]:
+                hits[idx] = hits.get(idx, 0) + 1
+        required = self._required
+        selected = [idx for idx, count in hits.items() if count == required[idx]]
+        if not selected:
+            return self._unanchored_patterns
+        selected.extend(self._unanchored)
+        selected.sort()
+        return [self.patterns[i] for i in selected]
@@ -0,0 +1,181 @@
+"""Block-based line reading for large log files."""
+
+import mmap
+from pathlib import Path
+from typing import Iterator
+
+# Bytes read per block.
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+def read_blocks(
+    source: str | Path,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    use_mmap: bool = False,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[bytes]:
+    """
+    Read a file as raw byte blocks.
+
+    Args:
+        source: Path to file.
+        block_size: Bytes per block.
+        use_mmap: Slice blocks from a memory map instead of read() calls.
+        start: Byte offset to start reading at.
+        end: Byte offset to stop reading at (defaults to end of file).
+
+    Yields:
+        Byte blocks of at most block_size bytes.
+    """
+    with open(source, "rb") as f:
+        size = f.seek(0, 2)
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+        if use_mmap:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for pos in range(start, end, block_size):
+                    yield mm[pos:min(pos + block_size, end)]
+            return
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                return
+            remaining -= len(block)
+            yield block
+
+
+def _split_lines(text: str) -> list[str]:
+    """Split on universal newlines (\\n, \\r\\n, \\r), like text-mode files."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def iter_line_chunks(
+    source: str | Path,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    encoding: str = "utf-8",
+    errors: str = "replace",
+    use_mmap: bool = False,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[tuple[list[str], int]]:
+    """
+    Read a file as lists of lines, with the byte offset reached after each list.
+
+    A line cut by a block boundary is carried over into the next block, so
+    every line is yielded whole. Lines are split exactly as iterating over a
+    text-mode file would split them, without their terminators.
+
+    Args:
+        source: Path to file.
+        block_size: Bytes read per block.
+        encoding: Text encoding.
+        errors: Decode error handling.
+        use_mmap: Read blocks through a memory map.
+        start: Byte offset to start at (should be a line start).
+        end: Byte offset to stop at (should be a line start).
+
+    Yields:
+        (lines, offset) where offset is the byte offset just past the last
+        line's terminator (a line start, usable as a resume point).
+    """
+    carry = b""
+    pos = start
+    for block in read_blocks(source, block_size, use_mmap, start, end):
+        data = carry + block if carry else block
+        pos += len(block)
+        # A trailing \r may be the first half of \r\n, so split only
+        # through the last \n and carry the rest.
+        cut = data.rfind(b"\n") + 1
+        carry = data[cut:]
+        if cut:
+            yield _split_lines(data[:cut].decode(encoding, errors)), pos - len(carry)
+    if carry:
+        yield _split_lines(carry.decode(encoding, errors)), pos
+
+
+def iter_line_blocks(
+    source: str | Path,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    encoding: str = "utf-8",
+    errors: str = "replace",
+    use_mmap: bool = False,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[list[str]]:
+    """
+    Read a file as lists of lines, decoding and splitting one block at a time.
+
+    Args:
+        source: Path to file.
+        block_size: Bytes read per block.
+        encoding: Text encoding.
+        errors: Decode error handling.
+        use_mmap: Read blocks through a memory map.
+        start: Byte offset to start at (should be a line start).
+        end: Byte offset to stop at (should be a line start).
+
+    Yields:
+        Lists of lines (see iter_line_chunks).
+    """
+    for lines, _ in iter_line_chunks(source, block_size, encoding, errors, use_mmap, start, end):
+        yield lines
+
+
+def iter_lines(source: str | Path, block_size: int = DEFAULT_BLOCK_SIZE, **kwargs) -> Iterator[str]:
+    """
+    Iterate over the lines of a file using the block reader.
+
+    Args:
+        source: Path to file.
+        block_size: Bytes read per block.
+        **kwargs: Passed to iter_line_blocks.
+
+    Yields:
+        Lines without terminators.
+    """
+    for lines in iter_line_blocks(source, block_size, **kwargs):
+        yield from lines
+
+
+def iter_line_batches(
+    source: str | Path,
+    batch_size: int = 10000,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    **kwargs,
+) -> Iterator[list[str]]:
+    """
+    Iterate over a file in batches of a fixed number of lines.
+
+    Args:
+        source: Path to file.
+        batch_size: Lines per batch (the last batch may be shorter).
+        block_size: Bytes read per block.
+        **kwargs: Passed to iter_line_blocks.
+
+    Yields:
+        Lists of up to batch_size lines.
+    """
+    batch: list[str] = []
+    for lines in iter_line_blocks(source, block_size, **kwargs):
+        if not batch and len(lines) == batch_size:
+            yield lines
+            continue
+        start = 0
+        while start < len(lines):
+            take = min(batch_size - len(batch), len(lines) - start)
+            batch.extend(lines[start:start + take])
+            start += take
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,316 @@
+"""Long-running ingestion server that parses lines received on local sockets."""
+
+import asyncio
+import re
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from log_sculptor.core.aio import parse_batch
+from log_sculptor.core.patterns import PatternSet
+from log_sculptor.outputs.rolling import RollingSink
+
+# Lines buffered between the listeners and the parser.
+DEFAULT_QUEUE_SIZE = 10_000
+
+# Maximum lines parsed and written per executor call.
+DEFAULT_BATCH_SIZE = 500
+
+# Seconds between sink flushes.
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Recent latencies kept for percentiles.
+LATENCY_WINDOW = 10_000
+
+# RFC 3164/5424 priority prefix, e.g. "<34>".
+_PRIORITY = re.compile(r"<\d{1,3}>")
+
+_STOP = object()
+
+
+@dataclass
+class ServeStats:
+    """Throughput and latency counters for a running server."""
+    received: int = 0
+    parsed: int = 0
+    matched: int = 0
+    dropped: int = 0
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+    started: float = field(default_factory=time.monotonic)
+    _recent: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW), repr=False)
+
+    def record_latency(self, seconds: float) -> None:
+        """Record the time from a line's arrival to it being written."""
+        self.total_latency += seconds
+        self.max_latency = max(self.max_latency, seconds)
+        self._recent.append(seconds)
+
+    @property
+    def lines_per_second(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.parsed / elapsed if elapsed > 0 else 0.0
+
+    def latency_percentile(self, q: float) -> float:
+        """Latency percentile (0-100) over the most recent lines, in seconds."""
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    def to_dict(self) -> dict:
+        return {
+            "received": self.received,
+            "parsed": self.parsed,
+            "matched": self.matched,
+            "dropped": self.dropped,
+            "lines_per_second": round(self.lines_per_second, 1),
+            "latency_ms": {
+                "avg": round(1000 * self.total_latency / self.parsed, 3) if self.parsed else 0.0,
+                "p50": round(1000 * self.latency_percentile(50), 3),
+                "p99": round(1000 * self.latency_percentile(99), 3),
+                "max": round(1000 * self.max_latency, 3),
+            },
+        }
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: "LogServer"):
+        self.server = server
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        for line in data.decode("utf-8", "replace").splitlines():
+            self.server._offer(line)
+
+
+class LogServer:
+    """
+    Parse syslog-style lines from TCP, UDP or Unix socket listeners.
+
+    Patterns are compiled once at start. Listeners put lines on a bounded
+    queue; a single consumer matches and writes them in batches on an
+    executor. TCP and Unix stream clients are paused while the queue is full
+    (their socket buffers absorb the burst); UDP datagrams that arrive
+    while it is full are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        patterns: PatternSet,
+        sink: RollingSink,
+        tcp: tuple[str, int] | None = None,
+        udp: tuple[str, int] | None = None,
+        unix: str | Path | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        strip_priority: bool = True,
+        detect_types: bool = True,
+    ):
+        """
+        Initialize server.
+
+        Args:
+            patterns: PatternSet for matching.
+            sink: Where parsed records are written.
+            tcp: (host, port) to listen on for TCP (port 0 picks a free port).
+            udp: (host, port) to listen on for UDP datagrams.
+            unix: Unix stream socket path.
+            queue_size: Maximum lines buffered before parsing.
+            batch_size: Maximum lines parsed per batch.
+            flush_interval: Seconds between sink flushes.
+            strip_priority: Remove a leading syslog "<PRI>" from each line.
+            detect_types: Whether to detect field types.
+        """
+        if tcp is None and udp is None and unix is None:
+            raise ValueError("At least one of tcp, udp or unix must be given")
+        self.patterns = patterns
+        self.sink = sink
+        self.tcp = tcp
+        self.udp = udp
+        self.unix = unix
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.strip_priority = strip_priority
+        self.detect_types = detect_types
+        self.stats = ServeStats()
+        self.addresses: dict[str, object] = {}
+        self._queue: asyncio.Queue | None = None
+        self._servers: list[asyncio.AbstractServer] = []
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._transport: asyncio.DatagramTransport | None = None
+        self._consumer: asyncio.Task | None = None
+        self._line_number = 0
+
+    def _prepare(self, line: str) -> str:
+        line = line.rstrip("\r\n")
+        if self.strip_priority and line.startswith("<"):
+            m = _PRIORITY.match(line)
+            if m:
+                line = line[m.end():]
+        return line
+
+    def _offer(self, line: str) -> None:
+        """Queue a datagram line, dropping it if the queue is full."""
+        line = self._prepare(line)
+        if not line:
+            return
+        self.stats.received += 1
+        try:
+            self._queue.put_nowait((line, time.monotonic()))
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+
+    async def _handle_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._clients.add(writer)
+        try:
+            async for raw in reader:
+                line = self._prepare(raw.decode("utf-8", "replace"))
+                if not line:
+                    continue
+                self.stats.received += 1
+                await self._queue.put((line, time.monotonic()))
+        except (ConnectionError, ValueError):
+            # Reset connection or a line longer than the stream limit.
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    def _process(self, batch: list[tuple[str, float]], first_line: int, flush: bool) -> int:
+        """Parse and write a batch (runs on the executor); returns matched count."""
+        records = parse_batch(self.patterns, [line for line, _ in batch], first_line, self.detect_types)
+        self.sink.write(records)
+        if flush:
+            self.sink.flush()
+        return sum(1 for r in records if r.matched)
+
+    async def _consume(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        last_flush = loop.time()
+        stopping = False
+        while not stopping:
+            try:
+                item = await asyncio.wait_for(queue.get(), self.flush_interval)
+            except asyncio.TimeoutError:
+                await loop.run_in_executor(None, self.sink.flush)
+                last_flush = loop.time()
+                continue
+            if item is _STOP:
+                break
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            flush = loop.time() - last_flush >= self.flush_interval
+            matched = await loop.run_in_executor(None, self._process, batch, self._line_number + 1, flush)
+            if flush:
+                last_flush = loop.time()
+            self._line_number += len(batch)
+
+            now = time.monotonic()
+            self.stats.parsed += len(batch)
+            self.stats.matched += matched
+            for _, arrived in batch:
+                self.stats.record_latency(now - arrived)
+
+    async def start(self) -> None:
+        """Compile patterns and open the listeners."""
+        loop = asyncio.get_running_loop()
+        self.patterns.compile()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self.stats = ServeStats()
+        if self.tcp is not None:
+            server = await asyncio.start_server(self._handle_stream, *self.tcp)
+            self._servers.append(server)
+            self.addresses["tcp"] = server.sockets[0].getsockname()[:2]
+        if self.unix is not None:
+            server = await asyncio.start_unix_server(self._handle_stream, str(self.unix))
+            self._servers.append(server)
+            self.addresses["unix"] = str(self.unix)
+        if self.udp is not None:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DatagramProtocol(self), local_addr=self.udp
+            )
+            self.addresses["udp"] = self._transport.get_extra_info("sockname")[:2]
+        self._consumer = asyncio.create_task(self._consume())
+
+    async def stop(self) -> None:
+        """Stop listening, parse everything already queued and close the sink."""
+        for server in self._servers:
+            server.close()
+        for client in list(self._clients):
+            client.close()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self.unix is not None:
+            Path(self.unix).unlink(missing_ok=True)
+        if self._consumer is not None:
+            await self._queue.put(_STOP)
+            await self._consumer
+            self._consumer = None
+        await asyncio.get_running_loop().run_in_executor(None, self.sink.close)
+
+    async def run(
+        self,
+        duration: float | None = None,
+        report: Callable[[ServeStats], None] | None = None,
+        report_interval: float = 10.0,
+    ) -> ServeStats:
+        """
+        Serve until SIGINT/SIGTERM or for a fixed duration.
+
+        Args:
+            duration: Seconds to serve (None runs until signalled).
+            report: Called with the stats every report_interval seconds.
+            report_interval: Seconds between reports.
+
+        Returns:
+            Final statistics.
+        """
+        loop = asyncio.get_running_loop()
+        done = asyncio.Event()
+        handled = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, done.set)
+                handled.append(sig)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+
+        await self.start()
+        try:
+            deadline = None if duration is None else loop.time() + duration
+            while not done.is_set():
+                timeout = report_interval if report else None
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                try:
+                    await asyncio.wait_for(done.wait(), timeout)
+                except asyncio.TimeoutError:
+                    if report:
+                        report(self.stats)
+        finally:
+            await self.stop()
+            for sig in handled:
+                loop.remove_signal_handler(sig)
+        return self.stats
@@ -0,0 +1,352 @@
+"""Probabilistic sketches for bounded-memory statistics."""
+
+import bisect
+import hashlib
+import heapq
+import math
+
+
+def _hash64(value: str) -> int:
+    """Stable 64-bit hash (unlike hash(), identical across processes)."""
+    digest = hashlib.blake2b(value.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count estimator."""
+
+    def __init__(self, precision: int = 12):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            precision: Number of index bits (4-16). Uses 2**precision bytes;
+                standard error is about 1.04 / sqrt(2**precision).
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError(f"precision must be between 4 and 16, got {precision}")
+        self.precision = precision
+        self._m = 1 << precision
+        self._registers = bytearray(self._m)
+
+    def add(self, value: str) -> None:
+        """Add a value to the sketch."""
+        x = _hash64(value)
+        bits = 64 - self.precision
+        idx = x >> bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        self._registers[idx] = max(self._registers[idx], rank)
+
+    def count(self) -> int:
+        """Estimate the number of distinct values added."""
+        m = self._m
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        z = sum(2.0 ** -r for r in self._registers)
+        estimate = alpha * m * m / z
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Merge another sketch into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self._registers = bytearray(max(a, b) for a, b in zip(self._registers, other._registers))
+
+
+class CardinalityCounter:
+    """
+    Distinct-value counter that is exact for small sets.
+
+    Values are counted exactly until more than ``exact_limit`` distinct values
+    have been seen; the counter then switches to a HyperLogLog estimate.
+    """
+
+    def __init__(self, exact_limit: int = 64, precision: int = 12):
+        """
+        Initialize counter.
+
+        Args:
+            exact_limit: Maximum distinct values tracked exactly.
+            precision: HyperLogLog precision used after the exact limit.
+        """
+        self.exact_limit = exact_limit
+        self.precision = precision
+        self.total = 0
+        self.counts: dict[str, int] | None = {}
+        self._hll: HyperLogLog | None = None
+
+    @property
+    def exact(self) -> bool:
+        """Whether per-value counts are still available."""
+        return self.counts is not None
+
+    @property
+    def cardinality(self) -> int:
+        """Number of distinct values (estimated once past the exact limit)."""
+        if self.counts is not None:
+            return len(self.counts)
+        return self._hll.count()
+
+    def _spill(self) -> None:
+        """Switch from exact counts to a HyperLogLog sketch."""
+        self._hll = HyperLogLog(self.precision)
+        for seen in self.counts:
+            self._hll.add(seen)
+        self.counts = None
+
+    def add(self, value: str) -> None:
+        """Record one occurrence of a value."""
+        self.total += 1
+        if self.counts is None:
+            self._hll.add(value)
+            return
+        self.counts[value] = self.counts.get(value, 0) + 1
+        if len(self.counts) > self.exact_limit:
+            self._spill()
+
+    def merge(self, other: "CardinalityCounter") -> None:
+        """Merge another counter into this one."""
+        self.total += other.total
+        if self.counts is not None and other.counts is not None:
+            for value, count in other.counts.items():
+                self.counts[value] = self.counts.get(value, 0) + count
+            if len(self.counts) > self.exact_limit:
+                self._spill()
+            return
+
+        if self.counts is not None:
+            self._spill()
+        if other.counts is not None:
+            for seen in other.counts:
+                self._hll.add(seen)
+        else:
+            self._hll.merge(other._hll)
+
+
+class SpaceSaving:
+    """
+    Space-saving top-k sketch (Metwally et al.).
+
+    Tracks at most ``capacity`` values. A new value replaces the value with
+    the smallest count and inherits that count as its error, so counts are
+    overestimates by at most ``error``; any value more frequent than
+    total / capacity is guaranteed to be tracked.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize sketch.
+
+        Args:
+            capacity: Maximum values tracked (a few times the top-k wanted).
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        # Lazy min-heap of (count, value); entries go stale as counts grow.
+        self._heap: list[tuple[int, str]] = []
+
+    def _pop_min(self) -> tuple[int, str]:
+        """Remove and return the tracked value with the smallest count."""
+        while True:
+            count, value = heapq.heappop(self._heap)
+            current = self.counts.get(value)
+            if current == count:
+                return count, value
+            if current is not None:
+                heapq.heappush(self._heap, (current, value))
+
+    def add(self, value: str, count: int = 1) -> None:
+        """Record occurrences of a value."""
+        self.total += count
+        current = self.counts.get(value)
+        if current is not None:
+            self.counts[value] = current + count
+            return
+        error = 0
+        if len(self.counts) >= self.capacity:
+            error, evicted = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+        self.counts[value] = error + count
+        self.errors[value] = error
+        heapq.heappush(self._heap, (error + count, value))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, v) for v, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, k: int | None = None) -> list[tuple[str, int, int]]:
+        """Get (value, count, error) for the k most frequent values, most frequent first."""
+        ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [(value, count, self.errors[value]) for value, count in ranked[:k]]
+
+    def _floor(self) -> int:
+        """Count a value missing from a full sketch may have had."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """Merge another sketch into this one (Agarwal et al. mergeable summaries)."""
+        floor, other_floor = self._floor(), other._floor()
+        counts: dict[str, int] = {}
+        errors: dict[str, int] = {}
+        for value in self.counts.keys() | other.counts.keys():
+            counts[value] = self.counts.get(value, floor) + other.counts.get(value, other_floor)
+            errors[value] = self.errors.get(value, floor) + other.errors.get(value, other_floor)
+        kept = sorted(counts, key=lambda v: (-counts[v], v))[:self.capacity]
+        self.counts = {v: counts[v] for v in kept}
+        self.errors = {v: errors[v] for v in kept}
+        self.total += other.total
+        self._heap = [(c, v) for v, c in self.counts.items()]
+        heapq.heapify(self._heap)
+
+
+class TDigest:
+    """
+    Merging t-digest for streaming quantiles (Dunning & Ertl).
+
+    Values are buffered and periodically merged into at most about
+    ``compression`` centroids, using the arcsine scale function so that
+    centroids near the tails stay small and extreme quantiles stay
+    accurate. Memory is O(compression) regardless of how many values are
+    added, and digests merge by combining centroids.
+    """
+
+    def __init__(self, compression: int = 100):
+        """
+        Initialize digest.
+
+        Args:
+            compression: Accuracy/size trade-off (centroids kept is about this).
+        """
+        if compression < 10:
+            raise ValueError(f"compression must be at least 10, got {compression}")
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: list[float] = []
+        self._weights: list[float] = []
+        self._buffer: list[float] = []
+        self._buffer_limit = 5 * compression
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._buffer.append(value)
+        if len(self._buffer) >= self._buffer_limit:
+            self._compress()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _q(self, k: float) -> float:
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+    def _compress(self, extra: list[tuple[float, float]] = ()) -> None:
+        """Merge buffered values (and extra centroids) into the centroid list."""
+        if not self._buffer and not extra:
+            return
+        points = sorted(
+            list(zip(self._means, self._weights)) + [(v, 1.0) for v in self._buffer] + list(extra)
+        )
+        self._buffer = []
+        total = sum(w for _, w in points)
+        means: list[float] = []
+        weights: list[float] = []
+        mean, weight = points[0]
+        done = 0.0
+        limit = self._q(self._k(0.0) + 1) * total
+        for m, w in points[1:]:
+            if done + weight + w <= limit:
+                weight += w
+                mean += (m - mean) * w / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                limit = self._q(self._k(done / total) + 1) * total
+                mean, weight = m, w
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+    @property
+    def centroids(self) -> list[tuple[float, float]]:
+        """(mean, weight) of each centroid, in order."""
+        self._compress()
+        return list(zip(self._means, self._weights))
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1].
+
+        Returns:
+            Estimated value, or None if the digest is empty.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"quantile must be between 0 and 1, got {q}")
+        if not self.count:
+            return None
+        self._compress()
+        # Interpolate between centroid centers, anchored at min and max.
+        positions = [0.0]
+        values = [self.min]
+        cumulative = 0.0
+        for mean, weight in zip(self._means, self._weights):
+            positions.append(cumulative + weight / 2)
+            values.append(mean)
+            cumulative += weight
+        positions.append(cumulative)
+        values.append(self.max)
+        target = q * cumulative
+        i = bisect.bisect_right(positions, target)
+        if i >= len(positions):
+            return self.max
+        lo, hi = positions[i - 1], positions[i]
+        if hi == lo:
+            return values[i]
+        return values[i - 1] + (values[i] - values[i - 1]) * (target - lo) / (hi - lo)
+
+    def merge(self, other: "TDigest") -> None:
+        """Merge another digest into this one."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(other.centroids)
+
+    def to_dict(self) -> dict:
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "centroids": [[mean, weight] for mean, weight in self.centroids],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TDigest":
+        digest = cls(data["compression"])
+        digest.count = data["count"]
+        if digest.count:
+            digest.min = data["min"]
+            digest.max = data["max"]
+        digest._means = [mean for mean, _ in data["centroids"]]
+        digest._weights = [weight for _, weight in data["centroids"]]
+        return digest
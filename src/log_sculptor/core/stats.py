@@ -0,0 +1,360 @@
+"""One-pass pattern and field statistics with bounded memory."""
+
+import math
+from pathlib import Path
+from typing import Iterable
+
+import orjson
+
+from log_sculptor.core.patterns import ParsedRecord, PatternSet, parse_logs
+from log_sculptor.core.sketches import CardinalityCounter, SpaceSaving, TDigest
+from log_sculptor.core.tokenizer import TokenType
+from log_sculptor.exceptions import OutputError
+
+# Most frequent values reported per field.
+DEFAULT_TOP_K = 10
+
+# Quantiles reported for numeric fields.
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+# Values tracked by each top-k sketch, per value reported.
+TOP_K_CAPACITY_FACTOR = 4
+
+
+class FieldStats:
+    """
+    Distinct count and top values of one field.
+
+    While the distinct counter is exact its counts give the top values, so
+    the space-saving sketch is only fed once a field has many distinct values.
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K, precision: int = 12):
+        """
+        Initialize field statistics.
+
+        Args:
+            top_k: Number of most frequent values to report.
+            precision: HyperLogLog precision for distinct counts.
+        """
+        self.top_k = top_k
+        self.distinct = CardinalityCounter(precision=precision)
+        self.top = SpaceSaving(max(1, top_k * TOP_K_CAPACITY_FACTOR))
+
+    def add(self, value: str) -> None:
+        counts = self.distinct.counts
+        self.distinct.add(value)
+        if counts is None:
+            self.top.add(value)
+        elif self.distinct.counts is None:
+            # Too many distinct values for exact counts: continue in the sketch.
+            self.top = self._seeded_top(counts)
+
+    def _seeded_top(self, counts: dict[str, int]) -> SpaceSaving:
+        top = SpaceSaving(self.top.capacity)
+        for value, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+            top.add(value, count)
+        return top
+
+    def _full_top(self) -> SpaceSaving:
+        """The top-k sketch, built from the exact counts while they are kept."""
+        counts = self.distinct.counts
+        return self.top if counts is None else self._seeded_top(counts)
+
+    def merge(self, other: "FieldStats") -> None:
+        top = self._full_top()
+        top.merge(other._full_top())
+        self.distinct.merge(other.distinct)
+        # While the merged counts are exact the sketch is not used.
+        self.top = top if self.distinct.counts is None else SpaceSaving(top.capacity)
+
+    def to_dict(self) -> dict:
+        if self.distinct.exact:
+            # Few distinct values: the exact counts are still available.
+            ranked = sorted(self.distinct.counts.items(), key=lambda kv: (-kv[1], kv[0]))[:self.top_k]
+            top = [[value, count, 0] for value, count in ranked]
+        else:
+            top = [[value, count, error] for value, count, error in self.top.top(self.top_k)]
+        return {
+            "count": self.distinct.total,
+            "distinct": self.distinct.cardinality,
+            "distinct_exact": self.distinct.exact,
+            "top": top,  # [value, count, maximum overcount]
+        }
+
+
+def _digest_summary(digest: TDigest, quantiles: Iterable[float]) -> dict:
+    return {
+        "count": digest.count,
+        "min": digest.min,
+        "max": digest.max,
+        **{f"p{q * 100:g}": digest.quantile(q) for q in quantiles},
+    }
+
+
+class QuantileCollector:
+    """
+    Mergeable t-digest quantile sketches of numeric fields, per pattern.
+
+    Feed it records while parsing (it is callable, so it can be passed as a
+    stream_parse callback); each (pattern, field) keeps one t-digest of
+    O(compression) size however many values it sees. Collectors built on
+    separate chunks, workers or hosts merge into one, and to_dict/save
+    export the sketches themselves, not just the quantiles, so exported
+    collectors can still be merged later.
+    """
+
+    def __init__(
+        self,
+        patterns: PatternSet | None = None,
+        fields: Iterable[str] | None = None,
+        compression: int = 100,
+    ):
+        """
+        Initialize collector.
+
+        Args:
+            patterns: PatternSet the records were parsed with; its NUMBER
+                fields are collected.
+            fields: Field names to collect instead (values that do not
+                parse as finite numbers are skipped).
+            compression: t-digest compression.
+        """
+        self.compression = compression
+        self.fields = sorted(set(fields)) if fields is not None else None
+        self.digests: dict[str, dict[str, TDigest]] = {}
+        self._patterns = {p.id: p for p in patterns.patterns} if patterns is not None else {}
+        self._names: dict[str | None, tuple[str, ...]] = {}
+
+    def _numeric_fields(self, pattern_id: str | None) -> tuple[str, ...]:
+        names = self._names.get(pattern_id)
+        if names is None:
+            pattern = self._patterns.get(pattern_id)
+            if self.fields is not None:
+                names = tuple(self.fields)
+            elif pattern is None:
+                names = ()
+            else:
+                names = tuple(
+                    e.field_name for e in pattern.elements
+                    if e.type == "field" and e.token_type == TokenType.NUMBER
+                )
+            self._names[pattern_id] = names
+        return names
+
+    def __call__(self, record: ParsedRecord) -> None:
+        self.add(record)
+
+    def add(self, record: ParsedRecord) -> None:
+        """Add a record's numeric field values."""
+        if not record.matched:
+            return
+        names = self._numeric_fields(record.pattern_id)
+        if not names:
+            return
+        digests = self.digests.get(record.pattern_id)
+        if digests is None:
+            digests = self.digests[record.pattern_id] = {}
+        for name in names:
+            value = record.fields.get(name)
+            if value is None:
+                continue
+            try:
+                number = float(value)
+            except ValueError:
+                continue
+            if not math.isfinite(number):
+                # nan/inf would poison the digest and cannot be saved as JSON.
+                continue
+            digest = digests.get(name)
+            if digest is None:
+                digest = digests[name] = TDigest(self.compression)
+            digest.add(number)
+
+    def update_many(self, records: Iterable[ParsedRecord]) -> None:
+        """Add records in order."""
+        for record in records:
+            self.add(record)
+
+    def merge(self, other: "QuantileCollector") -> None:
+        """Merge another collector's sketches into this one."""
+        for pattern_id, digests in other.digests.items():
+            mine = self.digests.setdefault(pattern_id, {})
+            for name, digest in digests.items():
+                if name in mine:
+                    mine[name].merge(digest)
+                else:
+                    mine[name] = TDigest.from_dict(digest.to_dict())
+
+    def quantile(self, pattern_id: str, field_name: str, q: float) -> float | None:
+        """Estimate a quantile of one pattern's field (None if no values were seen)."""
+        digest = self.digests.get(pattern_id, {}).get(field_name)
+        return digest.quantile(q) if digest is not None else None
+
+    def summary(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> dict:
+        """Count, min, max and the given quantiles of each pattern's numeric fields."""
+        quantiles = tuple(quantiles)
+        return {
+            pattern_id: {name: _digest_summary(digest, quantiles) for name, digest in digests.items()}
+            for pattern_id, digests in self.digests.items()
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "compression": self.compression,
+            "fields": self.fields,
+            "digests": {
+                pattern_id: {name: digest.to_dict() for name, digest in digests.items()}
+                for pattern_id, digests in self.digests.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, patterns: PatternSet | None = None) -> "QuantileCollector":
+        collector = cls(patterns, data.get("fields"), data["compression"])
+        collector.digests = {
+            pattern_id: {name: TDigest.from_dict(digest) for name, digest in digests.items()}
+            for pattern_id, digests in data["digests"].items()
+        }
+        return collector
+
+    def save(self, path: str | Path) -> None:
+        """Write the sketches as JSON."""
+        try:
+            Path(path).write_bytes(orjson.dumps(self.to_dict()))
+        except Exception as e:
+            raise OutputError(f"Failed to write quantile sketches to {path}: {e}") from e
+
+    @classmethod
+    def load(cls, path: str | Path, patterns: PatternSet | None = None) -> "QuantileCollector":
+        """Read sketches written by save()."""
+        return cls.from_dict(orjson.loads(Path(path).read_bytes()), patterns)
+
+
+class LogStats:
+    """
+    Pattern counts and per-field statistics, accumulated one record at a time.
+
+    Memory depends on the number of patterns and fields, not lines: each
+    field keeps a distinct-value counter (exact, then HyperLogLog) and a
+    space-saving top-k sketch, and NUMBER fields are also fed to a
+    QuantileCollector. Stats from separate runs (e.g. chunks of a file)
+    can be merged.
+
+    The object is callable, so it can be passed as a stream_parse callback.
+    """
+
+    def __init__(
+        self,
+        patterns: PatternSet,
+        top_k: int = DEFAULT_TOP_K,
+        precision: int = 12,
+        compression: int = 100,
+    ):
+        """
+        Initialize statistics.
+
+        Args:
+            patterns: PatternSet the records were parsed with.
+            top_k: Number of most frequent values to report per field.
+            precision: HyperLogLog precision for distinct counts.
+            compression: t-digest compression for numeric quantiles.
+        """
+        self.top_k = top_k
+        self.precision = precision
+        self.lines = 0
+        self.matched = 0
+        self.pattern_counts: dict[str | None, int] = {}
+        self.fields: dict[str, dict[str, FieldStats]] = {}
+        self.quantiles = QuantileCollector(patterns, compression=compression)
+
+    def __call__(self, record: ParsedRecord) -> None:
+        self.add(record)
+
+    def add(self, record: ParsedRecord) -> None:
+        """Count a record and its field values."""
+        self.lines += 1
+        pattern_id = record.pattern_id
+        self.pattern_counts[pattern_id] = self.pattern_counts.get(pattern_id, 0) + 1
+        if not record.matched:
+            return
+        self.matched += 1
+        fields = self.fields.get(pattern_id)
+        if fields is None:
+            fields = self.fields[pattern_id] = {}
+        for name, value in record.fields.items():
+            if value is None:
+                continue
+            stats = fields.get(name)
+            if stats is None:
+                stats = fields[name] = FieldStats(self.top_k, self.precision)
+            stats.add(value)
+        self.quantiles.add(record)
+
+    def update_many(self, records: Iterable[ParsedRecord]) -> None:
+        """Count records in order."""
+        for record in records:
+            self.add(record)
+
+    def merge(self, other: "LogStats") -> None:
+        """Add another run's statistics (same patterns and settings) into this one."""
+        self.lines += other.lines
+        self.matched += other.matched
+        for pattern_id, count in other.pattern_counts.items():
+            self.pattern_counts[pattern_id] = self.pattern_counts.get(pattern_id, 0) + count
+        for pattern_id, fields in other.fields.items():
+            mine = self.fields.setdefault(pattern_id, {})
+            for name, stats in fields.items():
+                if name not in mine:
+                    # Merge into a fresh copy so later updates do not touch other.
+                    mine[name] = FieldStats(self.top_k, self.precision)
+                mine[name].merge(stats)
+        self.quantiles.merge(other.quantiles)
+
+    @property
+    def unmatched_rate(self) -> float:
+        return (self.lines - self.matched) / self.lines if self.lines else 0.0
+
+    def to_dict(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> dict:
+        quantiles = tuple(quantiles)
+        patterns = []
+        for pattern_id, count in sorted(self.pattern_counts.items(), key=lambda kv: -kv[1]):
+            if pattern_id is None:
+                continue
+            fields = {name: stats.to_dict() for name, stats in self.fields.get(pattern_id, {}).items()}
+            for name, digest in self.quantiles.digests.get(pattern_id, {}).items():
+                fields[name]["numeric"] = _digest_summary(digest, quantiles)
+            patterns.append({
+                "id": pattern_id,
+                "count": count,
+                "share": round(count / self.lines, 6),
+                "fields": fields,
+            })
+        return {
+            "lines": self.lines,
+            "matched": self.matched,
+            "unmatched": self.lines - self.matched,
+            "unmatched_rate": round(self.unmatched_rate, 6),
+            "patterns": patterns,
+        }
+
+
+def compute_stats(
+    source: str | Path,
+    patterns: PatternSet,
+    top_k: int = DEFAULT_TOP_K,
+) -> LogStats:
+    """
+    Compute pattern and field statistics for a log file in one pass.
+
+    Args:
+        source: Path to log file.
+        patterns: PatternSet to use.
+        top_k: Number of most frequent values to report per field.
+
+    Returns:
+        LogStats for the file.
+    """
+    stats = LogStats(patterns, top_k=top_k)
+    stats.update_many(parse_logs(Path(source), patterns, detect_types=False))
+    return stats
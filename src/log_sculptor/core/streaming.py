@@ -5,9 +5,13 @@ from pathlib import Path
 from typing import Iterator, Callable
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 
 from log_sculptor.core.tokenizer import tokenize
-from log_sculptor.core.patterns import PatternSet, ParsedRecord, Pattern
+from log_sculptor.core.patterns import PatternSet, ParsedRecord, Pattern, _build_record
+from log_sculptor.core.index import _TERMINATOR, LineIndex, load_index
+from log_sculptor.core.reader import iter_line_batches, iter_lines
+from log_sculptor.di import PatternMatcher
 
 
 @dataclass
@@ -17,15 +21,75 @@ class ChunkResult:
     line_offset: int
 
 
-def _read_lines_mmap(path: Path, encoding: str = "utf-8") -> Iterator[str]:
-    """Read lines using memory-mapped file for better performance on large files."""
+# Bytes scanned per block when splitting memory-mapped files into lines.
+MMAP_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def _iter_mmap_lines(path: Path, block_size: int = MMAP_BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield raw lines (without terminators) by splitting large mmap blocks on universal newlines."""
     with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
         with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-            for line in iter(mm.readline, b""):
-                try:
-                    yield line.decode(encoding).rstrip("\r\n")
-                except UnicodeDecodeError:
-                    yield line.decode(encoding, errors="replace").rstrip("\r\n")
+            size = len(mm)
+            pos = 0
+            carry = b""
+            cr = False  # the previous block ended with \r, maybe half of \r\n
+            while pos < size:
+                block = mm[pos:pos + block_size]
+                pos += len(block)
+                if cr:
+                    cr = False
+                    if block.startswith(b"\n"):
+                        block = block[1:]
+                lines = _TERMINATOR.split(block) if b"\r" in block else block.split(b"\n")
+                lines[0] = carry + lines[0]
+                carry = lines.pop()
+                cr = block.endswith(b"\r")
+                yield from lines
+            if carry:
+                yield carry
+
+
+def _read_lines_mmap(path: Path, encoding: str = "utf-8") -> Iterator[str]:
+    """Read lines using memory-mapped file for better performance on large files."""
+    for line in _iter_mmap_lines(path):
+        try:
+            yield line.decode(encoding)
+        except UnicodeDecodeError:
+            yield line.decode(encoding, errors="replace")
+
+
+def _match_bytes(path: Path, patterns: PatternSet) -> Iterator[tuple[str, Pattern | None, dict | None]]:
+    """
+    Match lines of a file in bytes mode.
+
+    ASCII lines are tokenized and matched on their raw bytes; only the
+    matched field values are sliced from the decoded line. Other lines
+    take the regular str path.
+    """
+    from log_sculptor.core.matching import SpanMatcher
+    from log_sculptor.core.tokenizer import tokenize_bytes
+
+    span_matcher = SpanMatcher(patterns)
+    for raw in _iter_mmap_lines(path):
+        if raw.isascii():
+            line = raw.decode("ascii")
+            if not line:
+                yield line, None, None
+                continue
+            pattern, spans = span_matcher.match_spans(tokenize_bytes(raw))
+            fields = {name: line[start:end] for name, start, end in spans} if pattern else None
+            yield line, pattern, fields
+        else:
+            try:
+                line = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                line = raw.decode("utf-8", errors="replace")
+            if not line:
+                yield line, None, None
+                continue
+            yield line, *patterns.match(line)
 
 
 def stream_parse(
@@ -35,6 +99,10 @@ def stream_parse(
     use_mmap: bool = True,
     detect_types: bool = True,
     callback: Callable[[ParsedRecord], None] | None = None,
+    matcher: PatternMatcher | None = None,
+    bytes_mode: bool = False,
+    start_line: int = 1,
+    index: LineIndex | None = None,
 ) -> Iterator[ParsedRecord]:
     """
     Stream-parse a log file with configurable chunk size.
@@ -44,47 +112,49 @@ def stream_parse(
     Args:
         source: Path to log file.
         patterns: PatternSet for matching.
-        chunk_size: Number of lines to buffer before yielding.
+        chunk_size: Number of lines read and matched per batch.
         use_mmap: Use memory-mapped file reading.
         detect_types: Whether to detect field types.
         callback: Optional callback for each record (for progress reporting).
+        matcher: Optional matcher used instead of patterns.match.
+        bytes_mode: Tokenize and match ASCII lines directly on the mmap bytes
+            (ignored when a matcher is given or start_line > 1).
+        start_line: First line number to parse; seeks via the line index.
+        index: Line index for seeking (defaults to a valid sidecar index).
 
     Yields:
         ParsedRecord for each line.
     """
-    from log_sculptor.types.detector import detect_type
-
     source = Path(source)
 
-    if use_mmap and source.stat().st_size > 1024 * 1024:  # > 1MB
-        lines = _read_lines_mmap(source)
+    first = 1
+    if bytes_mode and matcher is None and start_line <= 1:
+        matched = _match_bytes(source, patterns)
     else:
-        f = source.open("r", errors="replace")
-        lines = (line.rstrip("\r\n") for line in f)
+        offset = 0
+        if start_line > 1:
+            if index is None:
+                index = load_index(source)
+            if index is not None:
+                first, offset = index.checkpoint(start_line)
+        match = matcher.match if matcher is not None else patterns.match
+        batches = iter_line_batches(
+            source,
+            batch_size=chunk_size,
+            use_mmap=use_mmap and source.stat().st_size > 1024 * 1024,  # > 1MB
+            start=offset,
+        )
+        lines: Iterator[str] = (line for batch in batches for line in batch)
+        if start_line > first:
+            lines = islice(lines, start_line - first, None)
+            first = start_line
+        matched = ((line, *match(line)) if line else (line, None, None) for line in lines)
 
-    for i, line in enumerate(lines, start=1):
+    for i, (line, pattern, fields) in enumerate(matched, start=first):
         if not line:
             continue
 
-        pattern, fields = patterns.match(line)
-        confidence = pattern.confidence if pattern else 0.0
-
-        typed_fields = None
-        if detect_types and fields:
-            typed_fields = {}
-            for name, value in fields.items():
-                typed = detect_type(value)
-                typed_fields[name] = {"value": typed.normalized, "type": typed.type.value}
-
-        record = ParsedRecord(
-            line_number=i,
-            raw=line,
-            fields=fields or {},
-            pattern_id=pattern.id if pattern else None,
-            matched=pattern is not None,
-            confidence=confidence,
-            typed_fields=typed_fields,
-        )
+        record = _build_record(i, line, pattern, fields, detect_types)
 
         if callback:
             callback(record)
@@ -150,19 +220,16 @@ def parallel_learn(
         Merged PatternSet from all chunks.
     """
     from log_sculptor.core.patterns import learn_patterns
-    from log_sculptor.core.clustering import cluster_by_exact_signature
 
     source = Path(source)
 
     # Read all lines (or sample)
     lines: list[str] = []
-    with source.open("r", errors="replace") as f:
-        for i, line in enumerate(f):
-            if sample_size and i >= sample_size:
-                break
-            line = line.rstrip("\r\n")
-            if line:
-                lines.append(line)
+    for i, line in enumerate(iter_lines(source)):
+        if sample_size and i >= sample_size:
+            break
+        if line:
+            lines.append(line)
 
     if len(lines) < chunk_size * 2:
         # File is small enough for single-threaded processing
@@ -174,19 +241,24 @@ def parallel_learn(
     def process_chunk(chunk_lines: list[str]) -> PatternSet:
         """Process a single chunk."""
         from log_sculptor.core.patterns import _pattern_from_tokens
-        from log_sculptor.core.tokenizer import tokenize
-
-        # Tokenize and cluster
-        tokenized = [(tokenize(line), line) for line in chunk_lines]
-        clusters = cluster_by_exact_signature(tokenized)
+        from log_sculptor.core.tokenizer import tokenize_batch
+
+        # Tokenize into columns and group lines by exact signature
+        batch = tokenize_batch(chunk_lines)
+        groups: dict[tuple, list[int]] = {}
+        for i, sig in enumerate(batch.signatures()):
+            group = groups.get(sig)
+            if group is None:
+                groups[sig] = [i, 1]
+            else:
+                group[1] += 1
 
         # Build pattern set
         ps = PatternSet()
-        for cluster in clusters:
-            tokens, line = cluster.members[0]
-            pattern = _pattern_from_tokens(tokens, line)
-            pattern.frequency = len(cluster.members)
-            pattern.confidence = cluster.cohesion
+        for first, count in groups.values():
+            pattern = _pattern_from_tokens(batch.tokens(first), batch.lines[first])
+            pattern.frequency = count
+            pattern.confidence = 1.0
             ps.add(pattern)
 
         return ps
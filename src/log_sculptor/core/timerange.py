@@ -0,0 +1,261 @@
+"""Time-range parsing with timestamp binary search over time-ordered logs."""
+
+import os
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Iterator
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import regex
+
+from log_sculptor.core.index import _TERMINATOR, line_number_at, load_index
+from log_sculptor.core.models import Pattern
+from log_sculptor.core.patterns import ParsedRecord, PatternSet, _build_record
+from log_sculptor.core.reader import iter_lines
+from log_sculptor.core.tokenizer import TokenType, tokenize
+from log_sculptor.di import PatternMatcher
+from log_sculptor.types.timestamp import parse_timestamp
+
+# Search stops narrowing once the candidate byte range is this small.
+MIN_SEARCH_SPAN = 64 * 1024
+
+# Lines examined after each probe position to find a timestamp.
+PROBE_LINES = 32
+
+_DURATION = regex.compile(r"^(\d+(?:\.\d+)?)\s*([smhdw])$")
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_duration(value: str) -> timedelta | None:
+    """Parse a duration like "90s", "15m", "2h" or "1d"."""
+    m = _DURATION.match(value.strip())
+    if not m:
+        return None
+    return timedelta(**{_DURATION_UNITS[m.group(2)]: float(m.group(1))})
+
+
+def parse_time_bound(value: str, now: datetime | None = None) -> datetime:
+    """
+    Parse a --since/--until value.
+
+    Accepts a timestamp in any format parse_timestamp understands, or a
+    duration ("15m", "2h") meaning that long before now.
+
+    Raises:
+        ValueError: If the value is neither.
+    """
+    duration = parse_duration(value)
+    if duration is not None:
+        return (now or datetime.now(timezone.utc)) - duration
+    dt = parse_timestamp(value)
+    if dt is None:
+        raise ValueError(f"Invalid time: {value!r}")
+    return dt
+
+
+def parse_time_zone(name: str) -> tzinfo | None:
+    """
+    Parse a --timezone value: "UTC", "local" (returned as None) or an IANA name.
+
+    Raises:
+        ValueError: If the zone is unknown.
+    """
+    if name.upper() == "UTC":
+        return timezone.utc
+    if name.lower() == "local":
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown time zone: {name!r}") from e
+
+
+def _as_utc(dt: datetime, tz: tzinfo | None = timezone.utc) -> datetime:
+    """
+    Make a timestamp timezone-aware.
+
+    Naive timestamps are taken to be in tz: UTC by default, as
+    normalize_timestamp does, or the host's local time zone if tz is None.
+    """
+    if dt.tzinfo is not None:
+        return dt
+    return dt.astimezone() if tz is None else dt.replace(tzinfo=tz)
+
+
+def _value_time(token_type: TokenType | None, value: str, tz: tzinfo | None = timezone.utc) -> datetime | None:
+    if token_type == TokenType.BRACKET:
+        # e.g. Apache's [10/Oct/2000:13:55:36 -0700]
+        value = value[1:-1]
+    elif token_type != TokenType.TIMESTAMP:
+        return None
+    dt = parse_timestamp(value)
+    return _as_utc(dt, tz) if dt is not None else None
+
+
+def line_time(
+    line: str,
+    pattern: Pattern | None = None,
+    fields: dict | None = None,
+    tz: tzinfo | None = timezone.utc,
+) -> datetime | None:
+    """
+    Get the timestamp of a line.
+
+    Uses the first timestamp (or bracketed timestamp) field of the matched
+    pattern, falling back to the line's first such token.
+
+    Args:
+        line: Log line.
+        pattern: Pattern the line matched, if any.
+        fields: Fields extracted by pattern.
+        tz: Time zone of timestamps without an offset (None = local time).
+
+    Returns:
+        Timezone-aware datetime, or None if the line has no timestamp.
+    """
+    if pattern is not None and fields:
+        for e in pattern.elements:
+            if e.type == "field" and e.field_name in fields:
+                dt = _value_time(e.token_type, fields[e.field_name], tz)
+                if dt is not None:
+                    return dt
+    for token in tokenize(line):
+        dt = _value_time(token.type, token.value, tz)
+        if dt is not None:
+            return dt
+    return None
+
+
+def _next_line_start(source: str | Path, pos: int, size: int) -> int:
+    """Get the first line start at or after pos."""
+    if pos <= 0:
+        return 0
+    with open(source, "rb") as f:
+        base = pos - 1
+        f.seek(base)
+        while True:
+            data = f.read(MIN_SEARCH_SPAN)
+            if not data:
+                return size
+            m = _TERMINATOR.search(data)
+            if m:
+                end = base + m.end()
+                if m.end() == len(data) and data.endswith(b"\r"):
+                    # The \r may be the first half of a \r\n split across reads.
+                    f.seek(end)
+                    if f.read(1) == b"\n":
+                        end += 1
+                return end
+            base += len(data)
+
+
+def _probe(source: str | Path, start: int, end: int, match, tz: tzinfo | None) -> datetime | None:
+    """Get the first timestamp among the lines after a line start."""
+    lines = iter_lines(source, block_size=MIN_SEARCH_SPAN, start=start, end=end)
+    for _, line in zip(range(PROBE_LINES), lines):
+        if line:
+            dt = line_time(line, *match(line), tz=tz)
+            if dt is not None:
+                return dt
+    return None
+
+
+def find_start_offset(
+    source: str | Path,
+    patterns: PatternSet,
+    since: datetime,
+    tolerance: timedelta = timedelta(0),
+    matcher: PatternMatcher | None = None,
+    tz: tzinfo | None = timezone.utc,
+) -> int:
+    """
+    Binary-search the byte offset of a line at or before the first line at `since`.
+
+    Assumes the file is ordered by time, give or take `tolerance`. Probes
+    re-synchronize to the next line start and read the first timestamped
+    line there; probes without a timestamp move the search earlier.
+
+    Args:
+        source: Path to log file.
+        patterns: Patterns used to locate each line's timestamp field.
+        since: Start of the time window.
+        tolerance: How far out of order lines may be.
+        matcher: Optional matcher used instead of patterns.match.
+        tz: Time zone of timestamps without an offset (None = local time).
+
+    Returns:
+        Byte offset of a line start.
+    """
+    match = matcher.match if matcher is not None else patterns.match
+    target = _as_utc(since, tz) - tolerance
+    size = os.path.getsize(source)
+    lo, hi = 0, size
+    while hi - lo > MIN_SEARCH_SPAN:
+        mid = (lo + hi) // 2
+        start = _next_line_start(source, mid, size)
+        dt = _probe(source, start, hi, match, tz) if start < hi else None
+        if dt is not None and dt < target:
+            lo = start
+        else:
+            hi = mid
+    return lo
+
+
+def parse_time_range(
+    source: str | Path,
+    patterns: PatternSet,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    tolerance: timedelta = timedelta(0),
+    detect_types: bool = True,
+    matcher: PatternMatcher | None = None,
+    tz: tzinfo | None = timezone.utc,
+) -> Iterator[ParsedRecord]:
+    """
+    Parse only the lines of a time-ordered log within [since, until).
+
+    Seeks near `since` by binary search and stops once lines are later than
+    `until` plus `tolerance`, so only about the window is read. Lines
+    without a timestamp (e.g. continuations) take the time of the line
+    before them; lines before the first timestamp after the seek point are
+    skipped.
+
+    Args:
+        source: Path to log file.
+        patterns: PatternSet for matching.
+        since: Inclusive window start (None = from the beginning).
+        until: Exclusive window end (None = to the end).
+        tolerance: How far out of order lines may be.
+        detect_types: Whether to detect field types.
+        matcher: Optional matcher used instead of patterns.match.
+        tz: Time zone of log timestamps and bounds without an offset
+            (None = local time). Relative bounds are computed from the
+            current instant, so logs written in local time need tz=None
+            (or their zone) for them to select the right lines.
+
+    Yields:
+        ParsedRecord for each line in the window, with global line numbers.
+    """
+    match = matcher.match if matcher is not None else patterns.match
+    since = _as_utc(since, tz) if since is not None else None
+    until = _as_utc(until, tz) if until is not None else None
+    stop = until + tolerance if until is not None else None
+
+    offset = find_start_offset(source, patterns, since, tolerance, matcher, tz) if since is not None else 0
+    first = line_number_at(source, offset, load_index(source)) if offset else 1
+
+    current: datetime | None = None if since is not None else datetime.min.replace(tzinfo=timezone.utc)
+    for i, line in enumerate(iter_lines(source, start=offset), start=first):
+        if not line:
+            continue
+
+        pattern, fields = match(line)
+        dt = line_time(line, pattern, fields, tz)
+        if dt is not None:
+            if stop is not None and dt > stop:
+                break
+            current = dt
+        if current is None or (since is not None and current < since) or (until is not None and current >= until):
+            continue
+
+        yield _build_record(i, line, pattern, fields, detect_types)
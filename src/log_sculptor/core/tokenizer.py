@@ -1,7 +1,9 @@
 """Line tokenization for log parsing."""
 
+from array import array
 from dataclasses import dataclass
 from enum import Enum
+from typing import Iterable, Iterator
 import regex
 
 
@@ -62,28 +64,193 @@ _TOKEN_PATTERNS: list[tuple[TokenType, regex.Pattern]] = [
 ]
 
 
+# All token patterns as one alternation, tried in the order above at each
+# position; the trailing catch-all makes every character part of a token.
+_MASTER = regex.compile(
+    "|".join(f"({pattern.pattern})" for _, pattern in _TOKEN_PATTERNS) + r"|((?s:.))"
+)
+
+# Byte-string twin of _MASTER. Character classes are ASCII-only in bytes
+# mode, so results agree with _MASTER only for ASCII input.
+_MASTER_BYTES = regex.compile(_MASTER.pattern.encode("ascii"))
+
+# Token type for each master group (indexed by match.lastindex).
+_GROUP_TYPES: list[TokenType | None] = [None] + [t for t, _ in _TOKEN_PATTERNS] + [TokenType.PUNCT]
+
+# Compact uint8 codes for token types, used by span-based tokenization.
+TOKEN_TYPES: tuple[TokenType, ...] = tuple(TokenType)
+TOKEN_TYPE_CODES: dict[TokenType, int] = {t: code for code, t in enumerate(TOKEN_TYPES)}
+_GROUP_CODES = bytes([0] + [TOKEN_TYPE_CODES[t] for t in _GROUP_TYPES[1:]])
+_WHITESPACE_GROUP = _GROUP_TYPES.index(TokenType.WHITESPACE)
+
+
 def tokenize(line: str) -> list[Token]:
     """Tokenize a log line into typed tokens."""
-    tokens: list[Token] = []
-    pos = 0
-    length = len(line)
-
-    while pos < length:
-        matched = False
-        for token_type, pattern in _TOKEN_PATTERNS:
-            match = pattern.match(line, pos)
-            if match:
-                tokens.append(Token(type=token_type, value=match.group(0), start=pos, end=match.end()))
-                pos = match.end()
-                matched = True
-                break
-        if not matched:
-            tokens.append(Token(type=TokenType.PUNCT, value=line[pos], start=pos, end=pos + 1))
-            pos += 1
-
-    return tokens
+    types = _GROUP_TYPES
+    return [
+        Token(type=types[m.lastindex], value=m.group(), start=m.start(), end=m.end())
+        for m in _MASTER.finditer(line)
+    ]
 
 
 def token_signature(tokens: list[Token]) -> tuple[TokenType, ...]:
     """Get the type signature of a token list (excluding whitespace)."""
     return tuple(t.type for t in tokens if t.type != TokenType.WHITESPACE)
+
+
+def tokenize_signature(line: str) -> tuple[TokenType, ...]:
+    """
+    Get the type signature of a line without building tokens.
+
+    Equivalent to ``token_signature(tokenize(line))``.
+    """
+    types = _GROUP_TYPES
+    ws = _WHITESPACE_GROUP
+    return tuple(types[g] for g in (m.lastindex for m in _MASTER.finditer(line)) if g != ws)
+
+
+class TokenSpans:
+    """
+    Token types and offsets for one line, without per-token objects.
+
+    Types are stored as uint8 codes (see TOKEN_TYPE_CODES) and offsets as
+    int32 arrays; token values are sliced from the line only on request.
+    """
+
+    __slots__ = ("ends", "line", "starts", "types")
+
+    def __init__(self, line: str | bytes, types: bytearray, starts: array, ends: array):
+        self.line = line
+        self.types = types
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def type(self, i: int) -> TokenType:
+        return TOKEN_TYPES[self.types[i]]
+
+    def value(self, i: int) -> str | bytes:
+        return self.line[self.starts[i]:self.ends[i]]
+
+    def signature(self) -> tuple[TokenType, ...]:
+        """Type signature excluding whitespace (as token_signature)."""
+        ws = TOKEN_TYPE_CODES[TokenType.WHITESPACE]
+        return tuple(TOKEN_TYPES[code] for code in self.types if code != ws)
+
+    def tokens(self) -> list[Token]:
+        """Materialize Token objects (as tokenize)."""
+        line = self.line
+        return [
+            Token(type=TOKEN_TYPES[code], value=line[start:end], start=start, end=end)
+            for code, start, end in zip(self.types, self.starts, self.ends)
+        ]
+
+
+def tokenize_spans(line: str) -> TokenSpans:
+    """Tokenize a line into type codes and offsets, without slicing values."""
+    return _spans(_MASTER, line)
+
+
+def tokenize_bytes(line: bytes) -> TokenSpans:
+    """
+    Tokenize an ASCII byte line into type codes and offsets.
+
+    Gives the same tokens as tokenize_spans(line.decode("ascii")); offsets
+    are byte offsets, which equal character offsets for ASCII. Non-ASCII
+    input should be decoded and tokenized as str instead.
+    """
+    return _spans(_MASTER_BYTES, line)
+
+
+def _spans(master: regex.Pattern, line: str | bytes) -> TokenSpans:
+    codes = _GROUP_CODES
+    types = bytearray()
+    starts = array("i")
+    ends = array("i")
+    for m in master.finditer(line):
+        types.append(codes[m.lastindex])
+        start, end = m.span()
+        starts.append(start)
+        ends.append(end)
+    return TokenSpans(line, types, starts, ends)
+
+
+class TokenBatch:
+    """
+    Columnar tokens for many lines.
+
+    All tokens live in flat arrays: ``types`` (uint8 codes), ``starts`` and
+    ``ends`` (int32 offsets within their line). Tokens of line ``i`` occupy
+    ``line_offsets[i]:line_offsets[i + 1]``.
+    """
+
+    __slots__ = ("ends", "line_offsets", "lines", "starts", "types")
+
+    def __init__(self, lines: list[str], types: bytearray, starts: array, ends: array, line_offsets: array):
+        self.lines = lines
+        self.types = types
+        self.starts = starts
+        self.ends = ends
+        self.line_offsets = line_offsets
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    @property
+    def token_count(self) -> int:
+        return len(self.types)
+
+    def spans(self, i: int) -> TokenSpans:
+        """Get the tokens of line i as TokenSpans."""
+        a, b = self.line_offsets[i], self.line_offsets[i + 1]
+        return TokenSpans(self.lines[i], self.types[a:b], self.starts[a:b], self.ends[a:b])
+
+    def tokens(self, i: int) -> list[Token]:
+        """Materialize the Token objects of line i."""
+        line = self.lines[i]
+        a, b = self.line_offsets[i], self.line_offsets[i + 1]
+        starts, ends = self.starts, self.ends
+        return [
+            Token(type=TOKEN_TYPES[self.types[k]], value=line[starts[k]:ends[k]], start=starts[k], end=ends[k])
+            for k in range(a, b)
+        ]
+
+    def signature(self, i: int) -> tuple[TokenType, ...]:
+        """Type signature of line i, excluding whitespace."""
+        ws = TOKEN_TYPE_CODES[TokenType.WHITESPACE]
+        a, b = self.line_offsets[i], self.line_offsets[i + 1]
+        return tuple(TOKEN_TYPES[code] for code in self.types[a:b] if code != ws)
+
+    def signatures(self) -> Iterator[tuple[TokenType, ...]]:
+        """Yield the type signature of every line, in order."""
+        for i in range(len(self.lines)):
+            yield self.signature(i)
+
+
+def tokenize_batch(lines: Iterable[str]) -> TokenBatch:
+    """
+    Tokenize many lines into flat array-backed columns.
+
+    Args:
+        lines: Lines to tokenize (without line terminators).
+
+    Returns:
+        TokenBatch holding every line's tokens.
+    """
+    lines = list(lines)
+    codes = _GROUP_CODES
+    finditer = _MASTER.finditer
+    types = bytearray()
+    starts = array("i")
+    ends = array("i")
+    line_offsets = array("i", [0])
+    for line in lines:
+        for m in finditer(line):
+            types.append(codes[m.lastindex])
+            start, end = m.span()
+            starts.append(start)
+            ends.append(end)
+        line_offsets.append(len(types))
+    return TokenBatch(lines, types, starts, ends, line_offsets)
@@ -27,3 +27,11 @@ class PatternSaveError(PatternError):
 
 class OutputError(LogSculptorError):
     """Error writing output."""
+
+
+class LineIndexError(LogSculptorError):
+    """Error loading or using a line index."""
+
+
+class CheckpointError(LogSculptorError):
+    """Error loading or validating a parse checkpoint."""
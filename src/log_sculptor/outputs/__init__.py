@@ -1,9 +1,9 @@
 """Output writers for log-sculptor."""
 
 from log_sculptor.outputs.jsonl import write_jsonl
-from log_sculptor.outputs.sqlite import write_sqlite
+from log_sculptor.outputs.sqlite import write_histogram_sqlite, write_sqlite
 
-__all__ = ["write_jsonl", "write_sqlite"]
+__all__ = ["write_histogram_sqlite", "write_jsonl", "write_sqlite"]
 
 
 def write_duckdb(*args, **kwargs):
@@ -16,3 +16,37 @@ def write_parquet(*args, **kwargs):
     """Write to Parquet (lazy import to avoid dependency issues)."""
     from log_sculptor.outputs.parquet import write_parquet as _write_parquet
     return _write_parquet(*args, **kwargs)
+
+
+def write_histogram_parquet(*args, **kwargs):
+    """Write a pattern histogram to Parquet (lazy import to avoid dependency issues)."""
+    from log_sculptor.outputs.parquet import (
+        write_histogram_parquet as _write_histogram_parquet,
+    )
+    return _write_histogram_parquet(*args, **kwargs)
+
+
+def open_writer(output_format: str, output, patterns=None, include_raw: bool = False, state: dict | None = None):
+    """
+    Open an incremental writer for resumable parsing.
+
+    Writers have write(records), flush() -> state and close(). Passing the
+    state returned by flush() reopens the output at that point.
+
+    Args:
+        output_format: One of jsonl, sqlite, parquet.
+        output: Output path.
+        patterns: Optional PatternSet stored alongside records (sqlite, parquet).
+        include_raw: Include raw log lines.
+        state: Writer state from a checkpoint, or None to start fresh.
+    """
+    if output_format == "jsonl":
+        from log_sculptor.outputs.jsonl import JsonlWriter
+        return JsonlWriter(output, include_raw=include_raw, state=state)
+    if output_format == "sqlite":
+        from log_sculptor.outputs.sqlite import SqliteWriter
+        return SqliteWriter(output, patterns=patterns, include_raw=include_raw, state=state)
+    if output_format == "parquet":
+        from log_sculptor.outputs.parquet import ParquetPartsWriter
+        return ParquetPartsWriter(output, patterns=patterns, include_raw=include_raw, state=state)
+    raise ValueError(f"Resumable output is not supported for format: {output_format}")
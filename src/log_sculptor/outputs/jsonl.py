@@ -1,5 +1,6 @@
 """JSON Lines output writer."""
 
+import os
 from pathlib import Path
 from typing import Iterable, TextIO
 import orjson
@@ -8,6 +9,21 @@ from log_sculptor.core.patterns import ParsedRecord
 from log_sculptor.exceptions import OutputError
 
 
+def _record_to_dict(record: ParsedRecord, include_raw: bool, include_typed: bool) -> dict:
+    data = {
+        "line_number": record.line_number,
+        "pattern_id": record.pattern_id,
+        "matched": record.matched,
+        "confidence": record.confidence,
+        **record.fields,
+    }
+    if include_raw:
+        data["_raw"] = record.raw
+    if include_typed and record.typed_fields:
+        data["_typed"] = record.typed_fields
+    return data
+
+
 def write_jsonl(
     records: Iterable[ParsedRecord],
     output: str | Path | TextIO,
@@ -23,18 +39,7 @@ def write_jsonl(
             if not include_unmatched and not record.matched:
                 continue
 
-            data = {
-                "line_number": record.line_number,
-                "pattern_id": record.pattern_id,
-                "matched": record.matched,
-                "confidence": record.confidence,
-                **record.fields,
-            }
-            if include_raw:
-                data["_raw"] = record.raw
-            if include_typed and record.typed_fields:
-                data["_typed"] = record.typed_fields
-
+            data = _record_to_dict(record, include_raw, include_typed)
             f.write(orjson.dumps(data).decode("utf-8"))
             f.write("\n")
             count += 1
@@ -50,3 +55,66 @@ def write_jsonl(
         raise OutputError(f"Failed to write JSON Lines output: {e}") from e
 
     return count
+
+
+class JsonlWriter:
+    """
+    Incremental JSON Lines writer that can resume an interrupted file.
+
+    flush() makes written records durable and returns a state dict; passing
+    that state back on construction truncates the file to the flushed size
+    and appends, so records written after the last flush are not duplicated.
+    """
+
+    def __init__(
+        self,
+        output: str | Path,
+        include_raw: bool = False,
+        include_typed: bool = False,
+        state: dict | None = None,
+    ):
+        """
+        Open writer.
+
+        Args:
+            output: Output file path.
+            include_raw: Include the raw line.
+            include_typed: Include typed field values.
+            state: State from a previous flush() to resume from.
+        """
+        self.output = Path(output)
+        self.include_raw = include_raw
+        self.include_typed = include_typed
+        try:
+            if state is not None:
+                self._f = open(self.output, "r+b" if self.output.exists() else "wb")
+                self._f.truncate(state["size"])
+                self._f.seek(state["size"])
+            else:
+                self._f = open(self.output, "wb")
+        except Exception as e:
+            raise OutputError(f"Failed to open JSON Lines output {self.output}: {e}") from e
+
+    def write(self, records: Iterable[ParsedRecord]) -> int:
+        """Append records; returns the number written."""
+        count = 0
+        try:
+            for record in records:
+                self._f.write(orjson.dumps(_record_to_dict(record, self.include_raw, self.include_typed)))
+                self._f.write(b"\n")
+                count += 1
+        except Exception as e:
+            raise OutputError(f"Failed to write JSON Lines output: {e}") from e
+        return count
+
+    def flush(self) -> dict:
+        """Make written records durable and return the resume state."""
+        try:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            return {"size": self._f.tell()}
+        except Exception as e:
+            raise OutputError(f"Failed to flush JSON Lines output: {e}") from e
+
+    def close(self) -> None:
+        self._f.close()
@@ -1,8 +1,10 @@
 """Parquet output writer (optional dependency)."""
 
+import shutil
 from pathlib import Path
 from typing import Iterable
 
+from log_sculptor.core.histogram import PatternHistogram
 from log_sculptor.core.patterns import ParsedRecord, PatternSet
 from log_sculptor.exceptions import OutputError
 
@@ -14,6 +16,101 @@ def _sanitize_column_name(name: str) -> str:
     return sanitized or "field"
 
 
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise OutputError(
+            "Parquet output requires the pyarrow package. "
+            "Install with: pip install log-sculptor[parquet]"
+        )
+    return pa, pq
+
+
+def _records_table(pa, records: list[ParsedRecord], include_raw: bool, include_typed: bool):
+    """Build a pyarrow table from buffered records."""
+    all_field_names: set[str] = set()
+    for record in records:
+        if include_typed and record.typed_fields:
+            all_field_names.update(record.typed_fields.keys())
+        else:
+            all_field_names.update(record.fields.keys())
+
+    field_column_map: dict[str, str] = {}
+    for field_name in sorted(all_field_names):
+        col_name = _sanitize_column_name(field_name)
+        base_col = col_name
+        counter = 1
+        while col_name in field_column_map.values():
+            col_name = f"{base_col}_{counter}"
+            counter += 1
+        field_column_map[field_name] = col_name
+
+    data: dict[str, list] = {
+        "line_number": [],
+        "pattern_id": [],
+        "matched": [],
+        "confidence": [],
+    }
+    if include_raw:
+        data["raw"] = []
+
+    for col_name in field_column_map.values():
+        data[col_name] = []
+
+    for record in records:
+        data["line_number"].append(record.line_number)
+        data["pattern_id"].append(record.pattern_id)
+        data["matched"].append(record.matched)
+        data["confidence"].append(record.confidence)
+
+        if include_raw:
+            data["raw"].append(record.raw)
+
+        record_fields: dict[str, str | None] = {}
+        if include_typed and record.typed_fields:
+            for field_name, typed_data in record.typed_fields.items():
+                record_fields[field_name] = str(typed_data["value"]) if typed_data["value"] is not None else None
+        else:
+            record_fields = dict(record.fields)
+
+        for field_name, col_name in field_column_map.items():
+            data[col_name].append(record_fields.get(field_name))
+
+    return pa.table(data)
+
+
+def _write_patterns(pa, pq, patterns: PatternSet, output: Path) -> None:
+    """Write patterns to a separate <stem>_patterns.parquet file."""
+    patterns_data = {
+        "id": [],
+        "frequency": [],
+        "confidence": [],
+        "structure": [],
+        "example": [],
+    }
+    for pattern in patterns.patterns:
+        structure_parts = []
+        for elem in pattern.elements:
+            if elem.type == "literal" and elem.token_type and elem.token_type.value == "WHITESPACE":
+                continue
+            elif elem.type == "literal":
+                structure_parts.append(f'"{elem.value}"')
+            else:
+                structure_parts.append(f"<{elem.field_name}:{elem.token_type.value if elem.token_type else '?'}>")
+
+        patterns_data["id"].append(pattern.id)
+        patterns_data["frequency"].append(pattern.frequency)
+        patterns_data["confidence"].append(pattern.confidence)
+        patterns_data["structure"].append(" ".join(structure_parts))
+        patterns_data["example"].append(pattern.example)
+
+    patterns_table = pa.table(patterns_data)
+    patterns_output = output.with_stem(output.stem + "_patterns")
+    pq.write_table(patterns_table, patterns_output)
+
+
 def write_parquet(
     records: Iterable[ParsedRecord],
     output: str | Path,
@@ -39,14 +136,7 @@ def write_parquet(
     Raises:
         OutputError: If pyarrow is not installed or write fails.
     """
-    try:
-        import pyarrow as pa
-        import pyarrow.parquet as pq
-    except ImportError:
-        raise OutputError(
-            "Parquet output requires the pyarrow package. "
-            "Install with: pip install log-sculptor[parquet]"
-        )
+    pa, pq = _import_pyarrow()
 
     output = Path(output)
 
@@ -56,84 +146,11 @@ def write_parquet(
         if not buffered_records:
             return 0
 
-        all_field_names: set[str] = set()
-        for record in buffered_records:
-            if include_typed and record.typed_fields:
-                all_field_names.update(record.typed_fields.keys())
-            else:
-                all_field_names.update(record.fields.keys())
-
-        field_column_map: dict[str, str] = {}
-        for field_name in sorted(all_field_names):
-            col_name = _sanitize_column_name(field_name)
-            base_col = col_name
-            counter = 1
-            while col_name in field_column_map.values():
-                col_name = f"{base_col}_{counter}"
-                counter += 1
-            field_column_map[field_name] = col_name
-
-        data: dict[str, list] = {
-            "line_number": [],
-            "pattern_id": [],
-            "matched": [],
-            "confidence": [],
-        }
-        if include_raw:
-            data["raw"] = []
-
-        for col_name in field_column_map.values():
-            data[col_name] = []
-
-        for record in buffered_records:
-            data["line_number"].append(record.line_number)
-            data["pattern_id"].append(record.pattern_id)
-            data["matched"].append(record.matched)
-            data["confidence"].append(record.confidence)
-
-            if include_raw:
-                data["raw"].append(record.raw)
-
-            record_fields: dict[str, str | None] = {}
-            if include_typed and record.typed_fields:
-                for field_name, typed_data in record.typed_fields.items():
-                    record_fields[field_name] = str(typed_data["value"]) if typed_data["value"] is not None else None
-            else:
-                record_fields = dict(record.fields)
-
-            for field_name, col_name in field_column_map.items():
-                data[col_name].append(record_fields.get(field_name))
-
-        table = pa.table(data)
+        table = _records_table(pa, buffered_records, include_raw, include_typed)
         pq.write_table(table, output)
 
         if patterns:
-            patterns_data = {
-                "id": [],
-                "frequency": [],
-                "confidence": [],
-                "structure": [],
-                "example": [],
-            }
-            for pattern in patterns.patterns:
-                structure_parts = []
-                for elem in pattern.elements:
-                    if elem.type == "literal" and elem.token_type and elem.token_type.value == "WHITESPACE":
-                        continue
-                    elif elem.type == "literal":
-                        structure_parts.append(f'"{elem.value}"')
-                    else:
-                        structure_parts.append(f"<{elem.field_name}:{elem.token_type.value if elem.token_type else '?'}>")
-
-                patterns_data["id"].append(pattern.id)
-                patterns_data["frequency"].append(pattern.frequency)
-                patterns_data["confidence"].append(pattern.confidence)
-                patterns_data["structure"].append(" ".join(structure_parts))
-                patterns_data["example"].append(pattern.example)
-
-            patterns_table = pa.table(patterns_data)
-            patterns_output = output.with_stem(output.stem + "_patterns")
-            pq.write_table(patterns_table, patterns_output)
+            _write_patterns(pa, pq, patterns, output)
 
         return len(buffered_records)
 
@@ -141,3 +158,126 @@ def write_parquet(
         if "pyarrow" in str(type(e).__module__):
             raise OutputError(f"Failed to write Parquet output to {output}: {e}") from e
         raise
+
+
+class ParquetPartsWriter:
+    """
+    Incremental Parquet writer that can resume an interrupted file.
+
+    Each flush() writes the buffered records as a numbered part file in
+    ``<output>.parts/``; close() concatenates the parts into the output file.
+    Passing flush() state back on construction discards parts written after
+    that flush.
+    """
+
+    def __init__(
+        self,
+        output: str | Path,
+        patterns: PatternSet | None = None,
+        include_raw: bool = True,
+        include_typed: bool = True,
+        state: dict | None = None,
+    ):
+        """
+        Open writer.
+
+        Args:
+            output: Output file path.
+            patterns: Optional PatternSet (written to separate _patterns.parquet file).
+            include_raw: Include the raw line.
+            include_typed: Use typed field values.
+            state: State from a previous flush() to resume from.
+
+        Raises:
+            OutputError: If pyarrow is not installed.
+        """
+        self._pa, self._pq = _import_pyarrow()
+        self.output = Path(output)
+        self.patterns = patterns
+        self.include_raw = include_raw
+        self.include_typed = include_typed
+        self.parts_dir = self.output.with_name(self.output.name + ".parts")
+        self._pending: list[ParsedRecord] = []
+
+        if state is None:
+            if self.parts_dir.exists():
+                shutil.rmtree(self.parts_dir)
+            self._parts = 0
+        elif not self.parts_dir.exists() and self.output.exists():
+            # Closed after the state was taken: the output holds every part.
+            self.parts_dir.mkdir(parents=True)
+            self.output.replace(self._part_path(0))
+            self._parts = 1
+        else:
+            self._parts = state["parts"]
+            for part in self.parts_dir.glob("part-*.parquet"):
+                if int(part.stem.split("-")[1]) >= self._parts:
+                    part.unlink()
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+
+    def _part_path(self, number: int) -> Path:
+        return self.parts_dir / f"part-{number:05d}.parquet"
+
+    def write(self, records: Iterable[ParsedRecord]) -> int:
+        """Buffer records until the next flush; returns the number added."""
+        before = len(self._pending)
+        self._pending.extend(records)
+        return len(self._pending) - before
+
+    def flush(self) -> dict:
+        """Write buffered records as a part file and return the resume state."""
+        if self._pending:
+            try:
+                table = _records_table(self._pa, self._pending, self.include_raw, self.include_typed)
+                self._pq.write_table(table, self._part_path(self._parts))
+            except Exception as e:
+                raise OutputError(f"Failed to write Parquet part to {self.parts_dir}: {e}") from e
+            self._parts += 1
+            self._pending = []
+        return {"parts": self._parts}
+
+    def close(self) -> None:
+        """Flush and concatenate all parts into the output file."""
+        self.flush()
+        pa, pq = self._pa, self._pq
+        try:
+            tables = [pq.read_table(self._part_path(n)) for n in range(self._parts)]
+            if tables:
+                # Parts may have different field columns; missing ones become null.
+                pq.write_table(pa.concat_tables(tables, promote_options="default"), self.output)
+            if self.patterns:
+                _write_patterns(pa, pq, self.patterns, self.output)
+        except Exception as e:
+            raise OutputError(f"Failed to write Parquet output to {self.output}: {e}") from e
+        shutil.rmtree(self.parts_dir)
+
+
+def write_histogram_parquet(histogram: PatternHistogram, output: str | Path) -> int:
+    """
+    Write a per-time-bucket pattern histogram to a Parquet file.
+
+    Requires pyarrow package: pip install log-sculptor[parquet]
+
+    Args:
+        histogram: PatternHistogram to write.
+        output: Output file path.
+
+    Returns:
+        Number of rows written, one per (bucket_start, pattern_id).
+
+    Raises:
+        OutputError: If pyarrow is not installed or write fails.
+    """
+    pa, pq = _import_pyarrow()
+    rows = list(histogram.rows())
+    try:
+        table = pa.table({
+            "bucket_start": pa.array([start for start, _, _ in rows], type=pa.timestamp("s", tz="UTC")),
+            "bucket_seconds": pa.array([histogram.bucket_seconds] * len(rows), type=pa.int32()),
+            "pattern_id": pa.array([pattern_id for _, pattern_id, _ in rows], type=pa.string()),
+            "count": pa.array([count for _, _, count in rows], type=pa.int64()),
+        })
+        pq.write_table(table, Path(output))
+    except Exception as e:
+        raise OutputError(f"Failed to write histogram to {output}: {e}") from e
+    return len(rows)
@@ -0,0 +1,109 @@
+"""Rolling output that starts a new file every N records."""
+
+import re
+import time
+from pathlib import Path
+from typing import Iterable
+
+from log_sculptor.core.patterns import ParsedRecord, PatternSet
+
+
+class RollingSink:
+    """
+    Write records to numbered segment files, rolling to a new one by size or age.
+
+    For an output of ``logs.jsonl`` segments are ``logs-00000.jsonl``,
+    ``logs-00001.jsonl`` and so on. A segment is complete once the next one
+    is started (Parquet segments are only readable then). Numbering continues
+    after the highest segment already on disk, so a restart never overwrites
+    earlier output.
+    """
+
+    def __init__(
+        self,
+        output: str | Path,
+        output_format: str = "jsonl",
+        roll_records: int = 100_000,
+        roll_seconds: float | None = None,
+        patterns: PatternSet | None = None,
+        include_raw: bool = False,
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            output: Base output path; segment numbers are added to its stem.
+            output_format: jsonl or parquet.
+            roll_records: Records per segment.
+            roll_seconds: Also roll a non-empty segment after this many seconds.
+            patterns: Optional PatternSet stored alongside Parquet segments.
+            include_raw: Include raw log lines.
+        """
+        if output_format not in ("jsonl", "parquet"):
+            raise ValueError(f"Rolling output is not supported for format: {output_format}")
+        self.output = Path(output)
+        self.output_format = output_format
+        self.roll_records = roll_records
+        self.roll_seconds = roll_seconds
+        self.patterns = patterns
+        self.include_raw = include_raw
+        self.segments: list[Path] = []
+        self._writer = None
+        self._records = 0
+        self._opened = 0.0
+        self._next = self._first_free_number()
+
+    def _first_free_number(self) -> int:
+        segment = re.compile(rf"{re.escape(self.output.stem)}-(\d{{5,}}){re.escape(self.output.suffix)}")
+        numbers = [
+            int(m.group(1))
+            for p in self.output.parent.glob(f"{self.output.stem}-*{self.output.suffix}")
+            if (m := segment.fullmatch(p.name))
+        ]
+        return max(numbers, default=-1) + 1
+
+    def _segment_path(self, number: int) -> Path:
+        return self.output.with_name(f"{self.output.stem}-{number:05d}{self.output.suffix}")
+
+    def _open(self) -> None:
+        from log_sculptor.outputs import open_writer
+
+        path = self._segment_path(self._next)
+        self._writer = open_writer(self.output_format, path, patterns=self.patterns, include_raw=self.include_raw)
+        self.segments.append(path)
+        self._next += 1
+        self._records = 0
+        self._opened = time.monotonic()
+
+    def roll(self) -> None:
+        """Close the current segment (the next write starts a new one)."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def write(self, records: Iterable[ParsedRecord]) -> int:
+        """Write records, rolling as needed; returns the number written."""
+        count = 0
+        batch = list(records)
+        while batch:
+            if self._writer is None:
+                self._open()
+            take = batch[:self.roll_records - self._records]
+            batch = batch[len(take):]
+            self._records += self._writer.write(take)
+            count += len(take)
+            if self._records >= self.roll_records:
+                self.roll()
+        return count
+
+    def flush(self) -> None:
+        """Make written records durable; rolls the segment if it is old enough."""
+        if self._writer is None:
+            return
+        if self.roll_seconds is not None and time.monotonic() - self._opened >= self.roll_seconds:
+            self.roll()
+        else:
+            self._writer.flush()
+
+    def close(self) -> None:
+        self.roll()
@@ -4,6 +4,7 @@ import sqlite3
 from pathlib import Path
 from typing import Iterable
 
+from log_sculptor.core.histogram import PatternHistogram
 from log_sculptor.core.patterns import ParsedRecord, PatternSet
 from log_sculptor.exceptions import OutputError
 
@@ -15,6 +16,39 @@ def _sanitize_column_name(name: str) -> str:
     return sanitized or "field"
 
 
+def _assign_column(field_name: str, field_column_map: dict[str, str]) -> str:
+    """Pick a unique column name for a field and record it in the map."""
+    col_name = _sanitize_column_name(field_name)
+    base_col = col_name
+    counter = 1
+    while col_name in field_column_map.values():
+        col_name = f"{base_col}_{counter}"
+        counter += 1
+    field_column_map[field_name] = col_name
+    return col_name
+
+
+def _create_patterns_table(cursor: sqlite3.Cursor, patterns: PatternSet) -> None:
+    cursor.execute("""
+        CREATE TABLE patterns (
+            id TEXT PRIMARY KEY, frequency INTEGER, confidence REAL, structure TEXT, example TEXT
+        )
+    """)
+    for pattern in patterns.patterns:
+        structure_parts = []
+        for elem in pattern.elements:
+            if elem.type == "literal" and elem.token_type and elem.token_type.value == "WHITESPACE":
+                continue
+            elif elem.type == "literal":
+                structure_parts.append(f'"{elem.value}"')
+            else:
+                structure_parts.append(f"<{elem.field_name}:{elem.token_type.value if elem.token_type else '?'}>")
+        cursor.execute(
+            "INSERT INTO patterns (id, frequency, confidence, structure, example) VALUES (?, ?, ?, ?, ?)",
+            (pattern.id, pattern.frequency, pattern.confidence, " ".join(structure_parts), pattern.example),
+        )
+
+
 def write_sqlite(
     records: Iterable[ParsedRecord],
     output: str | Path,
@@ -32,24 +66,7 @@ def write_sqlite(
         cursor = conn.cursor()
 
         if patterns:
-            cursor.execute("""
-                CREATE TABLE patterns (
-                    id TEXT PRIMARY KEY, frequency INTEGER, confidence REAL, structure TEXT, example TEXT
-                )
-            """)
-            for pattern in patterns.patterns:
-                structure_parts = []
-                for elem in pattern.elements:
-                    if elem.type == "literal" and elem.token_type and elem.token_type.value == "WHITESPACE":
-                        continue
-                    elif elem.type == "literal":
-                        structure_parts.append(f'"{elem.value}"')
-                    else:
-                        structure_parts.append(f"<{elem.field_name}:{elem.token_type.value if elem.token_type else '?'}>")
-                cursor.execute(
-                    "INSERT INTO patterns (id, frequency, confidence, structure, example) VALUES (?, ?, ?, ?, ?)",
-                    (pattern.id, pattern.frequency, pattern.confidence, " ".join(structure_parts), pattern.example),
-                )
+            _create_patterns_table(cursor, patterns)
 
         buffered_records: list[ParsedRecord] = list(records)
         all_field_names: set[str] = set()
@@ -65,13 +82,7 @@ def write_sqlite(
 
         field_column_map: dict[str, str] = {}
         for field_name in sorted(all_field_names):
-            col_name = _sanitize_column_name(field_name)
-            base_col = col_name
-            counter = 1
-            while col_name in field_column_map.values():
-                col_name = f"{base_col}_{counter}"
-                counter += 1
-            field_column_map[field_name] = col_name
+            col_name = _assign_column(field_name, field_column_map)
             columns.append(f"{col_name} TEXT")
 
         cursor.execute(f"CREATE TABLE logs ({', '.join(columns)})")
@@ -109,3 +120,157 @@ def write_sqlite(
 
     except Exception as e:
         raise OutputError(f"Failed to write SQLite output to {output}: {e}") from e
+
+
+class SqliteWriter:
+    """
+    Incremental SQLite writer that can resume an interrupted database.
+
+    Field columns are added as new fields appear. flush() commits and returns
+    a state dict; passing it back on construction drops any rows written
+    after that flush, so resumed runs do not duplicate records.
+
+    Rows are keyed by rowid in write order rather than by line_number,
+    because a followed file's line numbers restart after rotation.
+    """
+
+    def __init__(
+        self,
+        output: str | Path,
+        patterns: PatternSet | None = None,
+        include_raw: bool = True,
+        include_typed: bool = True,
+        state: dict | None = None,
+    ):
+        """
+        Open writer.
+
+        Args:
+            output: Output database path.
+            patterns: Optional PatternSet written to a patterns table.
+            include_raw: Include the raw line.
+            include_typed: Use typed field values.
+            state: State from a previous flush() to resume from.
+        """
+        self.output = Path(output)
+        self.include_raw = include_raw
+        self.include_typed = include_typed
+        if state is not None and not {"columns", "line_number", "rowid"} <= state.keys():
+            raise OutputError(f"Cannot resume SQLite output {self.output}: invalid writer state")
+        try:
+            if state is None and self.output.exists():
+                self.output.unlink()
+            self._conn = sqlite3.connect(self.output)
+            cursor = self._conn.cursor()
+            if state is None:
+                if patterns:
+                    _create_patterns_table(cursor, patterns)
+                columns = ["line_number INTEGER", "pattern_id TEXT", "matched INTEGER", "confidence REAL"]
+                if include_raw:
+                    columns.append("raw TEXT")
+                cursor.execute(f"CREATE TABLE logs ({', '.join(columns)})")
+                self._conn.commit()
+                self._columns: dict[str, str] = {}
+                self._last_line = 0
+                self._last_rowid = 0
+            else:
+                self._columns = dict(state["columns"])
+                self._last_line = state["line_number"]
+                self._last_rowid = state["rowid"]
+                cursor.execute("DELETE FROM logs WHERE rowid > ?", (self._last_rowid,))
+                self._conn.commit()
+            self._existing = {row[1] for row in cursor.execute("PRAGMA table_info(logs)")}
+        except Exception as e:
+            raise OutputError(f"Failed to open SQLite output {self.output}: {e}") from e
+
+    def _column(self, field_name: str) -> str:
+        col_name = self._columns.get(field_name)
+        if col_name is None:
+            col_name = _assign_column(field_name, self._columns)
+            # Columns added after the last flush of an interrupted run
+            # already exist; column assignment is deterministic, so reuse them.
+            if col_name not in self._existing:
+                self._conn.execute(f"ALTER TABLE logs ADD COLUMN {col_name} TEXT")
+                self._existing.add(col_name)
+        return col_name
+
+    def write(self, records: Iterable[ParsedRecord]) -> int:
+        """Insert records; returns the number written."""
+        count = 0
+        try:
+            for record in records:
+                values = {
+                    "line_number": record.line_number,
+                    "pattern_id": record.pattern_id,
+                    "matched": 1 if record.matched else 0,
+                    "confidence": record.confidence,
+                }
+                if self.include_raw:
+                    values["raw"] = record.raw
+                if self.include_typed and record.typed_fields:
+                    for field_name, typed_data in record.typed_fields.items():
+                        value = typed_data["value"]
+                        values[self._column(field_name)] = str(value) if value is not None else None
+                else:
+                    for field_name, value in record.fields.items():
+                        values[self._column(field_name)] = value
+
+                placeholders = ", ".join("?" for _ in values)
+                cursor = self._conn.execute(
+                    f"INSERT INTO logs ({', '.join(values)}) VALUES ({placeholders})", list(values.values())
+                )
+                self._last_line = record.line_number
+                self._last_rowid = cursor.lastrowid
+                count += 1
+        except Exception as e:
+            raise OutputError(f"Failed to write SQLite output to {self.output}: {e}") from e
+        return count
+
+    def flush(self) -> dict:
+        """Commit written records and return the resume state."""
+        try:
+            self._conn.commit()
+        except Exception as e:
+            raise OutputError(f"Failed to commit SQLite output to {self.output}: {e}") from e
+        return {"columns": dict(self._columns), "line_number": self._last_line, "rowid": self._last_rowid}
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+
+def write_histogram_sqlite(histogram: PatternHistogram, output: str | Path, table: str = "pattern_histogram") -> int:
+    """
+    Write a per-time-bucket pattern histogram to a SQLite table.
+
+    The table has one row per (bucket_start, pattern_id) with its count;
+    an existing table of the same name is replaced.
+
+    Args:
+        histogram: PatternHistogram to write.
+        output: Database path (created if missing).
+        table: Table name.
+
+    Returns:
+        Number of rows written.
+    """
+    try:
+        conn = sqlite3.connect(output)
+        try:
+            with conn:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"""
+                    CREATE TABLE {table} (
+                        bucket_start TEXT, bucket_seconds INTEGER, pattern_id TEXT, count INTEGER
+                    )
+                """)
+                rows = [
+                    (start.isoformat(), histogram.bucket_seconds, pattern_id, count)
+                    for start, pattern_id, count in histogram.rows()
+                ]
+                conn.executemany(f"INSERT INTO {table} VALUES (?, ?, ?, ?)", rows)
+        finally:
+            conn.close()
+        return len(rows)
+    except Exception as e:
+        raise OutputError(f"Failed to write histogram to {output}: {e}") from e
@@ -1,5 +1,18 @@
 """Parsers for log-sculptor."""
 
-from log_sculptor.parsers.multiline import MultilineJoiner, ContinuationDetector
+from log_sculptor.parsers.multiline import (
+    MultilineJoiner,
+    ContinuationDetector,
+    LearnedEntryStart,
+    learn_entry_start,
+)
+from log_sculptor.parsers.chunking import parallel_join_multiline, plan_multiline_chunks
 
-__all__ = ["MultilineJoiner", "ContinuationDetector"]
+__all__ = [
+    "MultilineJoiner",
+    "ContinuationDetector",
+    "LearnedEntryStart",
+    "learn_entry_start",
+    "parallel_join_multiline",
+    "plan_multiline_chunks",
+]
@@ -0,0 +1,272 @@
+"""Split multi-line logs on entry boundaries for parallel joining."""
+
+import os
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from log_sculptor.core.index import _TERMINATOR, _count_lines
+from log_sculptor.core.reader import iter_lines
+from log_sculptor.parsers.multiline import (
+    ContinuationDetector,
+    LearnedEntryStart,
+    MultilineJoiner,
+)
+
+# Default number of worker processes.
+DEFAULT_WORKERS = 4
+
+# Target bytes per planned range; large files get more ranges than workers.
+DEFAULT_CHUNK_BYTES = 32 * 1024 * 1024
+
+# Bytes read at a time while looking for an entry start after a split point.
+PLAN_READ_SIZE = 64 * 1024
+
+
+def _next_line_start(f: BinaryIO, offset: int) -> int | None:
+    """Get the first line start at or after a byte offset (None at end of file)."""
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    data = b""
+    while True:
+        block = f.read(PLAN_READ_SIZE)
+        data += block
+        m = _TERMINATOR.search(data)
+        # A \r ending the data may be the first half of \r\n.
+        if m is not None and (m.end() < len(data) or not block):
+            return offset - 1 + m.end()
+        if not block:
+            return None
+
+
+def _iter_lines_at(f: BinaryIO, start: int, encoding: str, errors: str) -> Iterator[tuple[int, str]]:
+    """Yield (offset, line) for each line from a line start, split like iter_lines."""
+    f.seek(start)
+    pos = start
+    carry = b""
+    while True:
+        block = f.read(PLAN_READ_SIZE)
+        data = carry + block
+        last = 0
+        for m in _TERMINATOR.finditer(data):
+            if block and m.end() == len(data) and data[-1:] == b"\r":
+                break
+            yield pos + last, data[last:m.start()].decode(encoding, errors)
+            last = m.end()
+        if not block:
+            if last < len(data):
+                yield pos + last, data[last:].decode(encoding, errors)
+            return
+        pos += last
+        carry = data[last:]
+
+
+def _entry_start_after(
+    f: BinaryIO,
+    offset: int,
+    limit: int,
+    detector: ContinuationDetector | LearnedEntryStart,
+    encoding: str,
+    errors: str,
+) -> int | None:
+    """Find the first line after offset that a fresh detector would not join to its predecessor."""
+    start = _next_line_start(f, offset)
+    if start is None or start >= limit:
+        return None
+    prev = None
+    for line_offset, line in _iter_lines_at(f, start, encoding, errors):
+        if line_offset >= limit:
+            return None
+        if prev is not None:
+            detector.reset()
+            if not detector.is_continuation(line, prev):
+                return line_offset
+        prev = line
+    return None
+
+
+def plan_multiline_chunks(
+    source: str | Path,
+    parts: int,
+    entry_start: LearnedEntryStart | None = None,
+    encoding: str = "utf-8",
+    errors: str = "replace",
+    **detector_kwargs,
+) -> list[tuple[int, int, int]]:
+    """
+    Split a file into byte-balanced ranges that begin at entry starts.
+
+    Each split point is moved forward from its balanced offset to the next
+    line the detector would not join to the line before it, so stack traces
+    and multi-line JSON are not cut in half. A split point that finds no
+    such line before the next one is dropped.
+
+    The detector only sees one line of context here, so in rare cases
+    (an unclosed bracket or a backslash continuation spanning the split)
+    the serial join still continues an entry across it;
+    parallel_join_multiline detects and repairs that.
+
+    Args:
+        source: Path to log file.
+        parts: Desired number of ranges (fewer are returned for small files).
+        entry_start: Learned entry-start signature to use instead of the
+            ContinuationDetector heuristics.
+        encoding: Text encoding.
+        errors: Decode error handling.
+        **detector_kwargs: Arguments for ContinuationDetector.
+
+    Returns:
+        List of (first_line_number, start_offset, end_offset), as LineIndex.split.
+    """
+    size = os.path.getsize(source)
+    if not size:
+        return []
+    detector = entry_start or ContinuationDetector(**detector_kwargs)
+
+    starts = [0]
+    with open(source, "rb") as f:
+        for k in range(1, parts):
+            target = size * k // parts
+            if target <= starts[-1]:
+                continue
+            split = _entry_start_after(f, target, size * (k + 1) // parts, detector, encoding, errors)
+            if split is not None and split > starts[-1]:
+                starts.append(split)
+
+    bounds = starts + [size]
+    chunks = []
+    line = 1
+    for i, start in enumerate(starts):
+        if i:
+            line += _count_lines(source, bounds[i - 1], start)
+        chunks.append((line, start, bounds[i + 1]))
+    return chunks
+
+
+def join_multiline_range(
+    source: str | Path,
+    first_line: int,
+    start: int,
+    end_line: int | None,
+    separator: str = "\n",
+    entry_start: LearnedEntryStart | None = None,
+    **detector_kwargs,
+) -> tuple[list[tuple[int, str]], int | None]:
+    """
+    Join the entries that start in one planned range (runs on a worker).
+
+    Reading begins at start as if it were the start of the file and goes
+    past the end of the range to complete the range's last entry.
+
+    Args:
+        source: Path to log file.
+        first_line: Number of the line at start.
+        start: Byte offset of a line start.
+        end_line: Number of the first line after the range (None for end of file).
+        separator: String to join lines with.
+        entry_start: Learned entry-start signature to use instead of the
+            ContinuationDetector heuristics.
+        **detector_kwargs: Arguments for ContinuationDetector.
+
+    Returns:
+        (entries, next_start): the (first_line_number, entry) pairs starting
+        before end_line, and the number of the first line at or after
+        end_line that starts an entry (None if the file ends first).
+    """
+    detector = entry_start or ContinuationDetector(**detector_kwargs)
+    joiner = MultilineJoiner(detector=detector, separator=separator)
+    entries = []
+    for line_number, entry in joiner.join_numbered(iter_lines(source, start=start), start=first_line):
+        if end_line is not None and line_number >= end_line:
+            return entries, line_number
+        entries.append((line_number, entry))
+    return entries, None
+
+
+def parallel_join_multiline(
+    source: str | Path,
+    workers: int = DEFAULT_WORKERS,
+    separator: str = "\n",
+    entry_start: LearnedEntryStart | None = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    executor: Executor | None = None,
+    **detector_kwargs,
+) -> Iterator[tuple[int, str]]:
+    """
+    Join multi-line entries using several worker processes.
+
+    The output is identical to ``join_multiline_numbered(iter_lines(source))``
+    with the same options. Ranges come from plan_multiline_chunks; each
+    worker reports the first entry start after its range, and a range
+    whose split point turns out not to be an entry start in the serial
+    join is joined again from the last range known to agree with it.
+
+    Args:
+        source: Path to log file.
+        workers: Number of worker processes (ignored if executor is given).
+        separator: String to join lines with.
+        entry_start: Learned entry-start signature to use instead of the
+            ContinuationDetector heuristics.
+        chunk_bytes: Target bytes per range.
+        executor: Executor to run ranges on (defaults to a process pool).
+        **detector_kwargs: Arguments for ContinuationDetector.
+
+    Yields:
+        (first_line_number, entry) for each complete entry, in order.
+    """
+    size = os.path.getsize(source)
+    parts = max(workers, -(-size // chunk_bytes))
+    chunks = plan_multiline_chunks(source, parts, entry_start, **detector_kwargs)
+    if not chunks:
+        return
+    ends = [first for first, _, _ in chunks[1:]] + [None]
+
+    if len(chunks) == 1:
+        yield from join_multiline_range(source, 1, 0, None, separator, entry_start, **detector_kwargs)[0]
+        return
+
+    own = executor is None
+    if own:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    pending: deque[Future] = deque()
+    submitted = 0
+    try:
+        origin = chunks[0]          # a range whose join agrees with the serial one
+        next_start = chunks[0][0]   # first serial entry start not yet yielded
+        for i in range(len(chunks)):
+            # Keep a bounded number of ranges in flight.
+            while submitted < len(chunks) and submitted < i + 2 * workers:
+                first, start, _ = chunks[submitted]
+                pending.append(executor.submit(
+                    join_multiline_range, source, first, start, ends[submitted],
+                    separator, entry_start, **detector_kwargs,
+                ))
+                submitted += 1
+            future = pending.popleft()
+            if next_start is None:
+                break
+            if ends[i] is not None and next_start >= ends[i]:
+                # The whole range continues an entry already yielded.
+                continue
+
+            entries, stop = future.result()
+            k = bisect_left(entries, next_start, key=lambda e: e[0])
+            if k < len(entries) and entries[k][0] == next_start:
+                origin = chunks[i]
+            else:
+                # The split point was inside an entry: join again from a
+                # start that matches the serial join up to next_start.
+                entries, stop = join_multiline_range(
+                    source, origin[0], origin[1], ends[i], separator, entry_start, **detector_kwargs
+                )
+                k = bisect_left(entries, next_start, key=lambda e: e[0])
+            yield from entries[k:]
+            next_start = stop
+    finally:
+        for future in pending:
+            future.cancel()
+        if own:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,10 +1,44 @@
 """Multi-line log entry detection and handling."""
 
-from typing import Iterator
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Iterable, Iterator
 import regex
 
+from log_sculptor.core.tokenizer import _MASTER, _GROUP_TYPES, _TOKEN_PATTERNS, TokenType
 from log_sculptor.types.timestamp import is_likely_timestamp
 
+# Leading "word" inspected for a timestamp.
+_PREFIX = regex.compile(r'^[\w\-/:.\[\]]+')
+
+# Quote characters that start a string in bracket counting.
+_QUOTE = regex.compile(r'["\']')
+
+# is_likely_timestamp only sees digits through \d, so masking ASCII digits
+# keeps its answer; prefixes of the same shape share one cache entry.
+_DIGIT_MASK = str.maketrans("123456789", "000000000")
+
+# Maximum prefix shapes remembered before the cache is cleared.
+PREFIX_CACHE_SIZE = 4096
+
+# Lines sampled when learning an entry-start signature.
+ENTRY_START_SAMPLE = 10_000
+
+# Maximum leading token types in a learned entry-start signature.
+ENTRY_START_TOKENS = 3
+
+# Share of entry starts a signature token must keep to be added.
+ENTRY_START_MIN_SHARE = 0.99
+
+
+def _bracket_delta(text: str) -> int:
+    """Net bracket depth change of text containing no strings."""
+    return (
+        text.count("(") + text.count("{") + text.count("[")
+        - text.count(")") - text.count("}") - text.count("]")
+    )
+
 
 class ContinuationDetector:
     """Detect if a line continues a previous log entry."""
@@ -32,37 +66,37 @@ class ContinuationDetector:
 
         # Bracket tracking state
         self._bracket_depth = 0
+        # Timestamp verdicts by digit-masked prefix (kept across reset())
+        self._prefix_cache: dict[str, bool] = {}
 
     def reset(self) -> None:
         """Reset internal state."""
         self._bracket_depth = 0
 
     def _count_brackets(self, line: str) -> int:
-        """Count net bracket depth change in a line."""
-        depth = 0
-        in_string = False
-        string_char = None
-
-        for i, char in enumerate(line):
-            # Track string boundaries
-            if char in '"\'':
-                if not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char and (i == 0 or line[i-1] != '\\'):
-                    in_string = False
-                    string_char = None
-                continue
-
-            if in_string:
-                continue
-
-            if char in '({[':
-                depth += 1
-            elif char in ')}]':
-                depth -= 1
+        """Count net bracket depth change in a line (brackets inside quotes are ignored)."""
+        if '"' not in line and "'" not in line:
+            return _bracket_delta(line)
 
-        return depth
+        depth = 0
+        pos = 0
+        while True:
+            quote = _QUOTE.search(line, pos)
+            if quote is None:
+                return depth + _bracket_delta(line[pos:])
+            start = quote.start()
+            depth += _bracket_delta(line[pos:start])
+            # The string ends at the next unescaped quote of the same kind.
+            char = line[start]
+            end = start + 1
+            while True:
+                end = line.find(char, end)
+                if end == -1:
+                    return depth
+                if line[end - 1] != '\\':
+                    break
+                end += 1
+            pos = end + 1
 
     def _has_timestamp_prefix(self, line: str) -> bool:
         """Check if line starts with something that looks like a timestamp."""
@@ -71,15 +105,18 @@ class ContinuationDetector:
             return False
 
         # Extract first "word" (up to first space or common delimiter)
-        match = regex.match(r'^[\w\-/:.\[\]]+', line)
+        match = _PREFIX.match(line)
         if not match:
             return False
 
-        candidate = match.group(0)
         # Remove brackets if present
-        candidate = candidate.strip('[]')
-
-        return is_likely_timestamp(candidate)
+        shape = match.group(0).strip('[]').translate(_DIGIT_MASK)
+        cached = self._prefix_cache.get(shape)
+        if cached is None:
+            if len(self._prefix_cache) >= PREFIX_CACHE_SIZE:
+                self._prefix_cache.clear()
+            cached = self._prefix_cache[shape] = is_likely_timestamp(shape)
+        return cached
 
     def is_continuation(self, line: str, prev_line: str | None = None) -> bool:
         """
@@ -126,12 +163,139 @@ class ContinuationDetector:
             self._bracket_depth = max(0, self._bracket_depth)
 
 
+def _leading_types(line: str, count: int) -> tuple[TokenType, ...]:
+    """Types of the first count tokens of a line, skipping whitespace after the first."""
+    types = []
+    for m in islice(_MASTER.finditer(line), 2 * count):
+        token_type = _GROUP_TYPES[m.lastindex]
+        if token_type == TokenType.WHITESPACE and types:
+            continue
+        types.append(token_type)
+        if len(types) == count or token_type == TokenType.WHITESPACE:
+            break
+    return tuple(types)
+
+
+def _token_type_regex(token_type: TokenType) -> str:
+    """Regex matching exactly where the tokenizer would emit one token of token_type."""
+    order = [t for t, _ in _TOKEN_PATTERNS]
+    index = order.index(token_type)
+    higher = "|".join(f"(?:{p.pattern})" for _, p in _TOKEN_PATTERNS[:min(index, order.index(TokenType.PUNCT))])
+    # Unmatched characters fall through to the tokenizer's catch-all as PUNCT.
+    body = r"\S" if token_type == TokenType.PUNCT else _TOKEN_PATTERNS[index][1].pattern
+    guard = f"(?!{higher})" if higher else ""
+    # Atomic, so later tokens cannot make this one match differently.
+    return f"{guard}(?>{body})"
+
+
+@dataclass
+class LearnedEntryStart:
+    """
+    Entry-start signature learned from a sample of a log.
+
+    A line starts a new entry when its first token types equal ``prefix``
+    (whitespace between tokens is ignored); every other line continues the
+    current entry. The check is one anchored regex match per line, compiled
+    from the tokenizer's own patterns, so it agrees with tokenize().
+    Usable as the detector of a MultilineJoiner.
+    """
+    prefix: tuple[TokenType, ...]
+    coverage: float = 1.0
+    _start: Any = field(default=None, init=False, repr=False, compare=False)
+
+    def is_start(self, line: str) -> bool:
+        """Check if a line starts a new entry."""
+        if self._start is None:
+            self._start = regex.compile(r"\s*".join(_token_type_regex(t) for t in self.prefix))
+        return self._start.match(line) is not None
+
+    def reset(self) -> None:
+        """Reset internal state (the signature is stateless)."""
+
+    def update_state(self, line: str) -> None:
+        """Update internal state after processing a line (nothing to track)."""
+
+    def is_continuation(self, line: str, prev_line: str | None = None) -> bool:
+        """
+        Check if line continues a previous log entry.
+
+        Args:
+            line: Current line to check.
+            prev_line: Previous line (None at the start of input).
+
+        Returns:
+            True if this line continues the previous entry.
+        """
+        if not line or prev_line is None:
+            return False
+        return not self.is_start(line)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for serialization."""
+        return {"prefix": [t.value for t in self.prefix], "coverage": self.coverage}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LearnedEntryStart":
+        """Create from dictionary."""
+        return cls(prefix=tuple(TokenType(t) for t in data["prefix"]), coverage=data.get("coverage", 1.0))
+
+
+def learn_entry_start(
+    lines: Iterable[str],
+    sample_size: int = ENTRY_START_SAMPLE,
+    max_tokens: int = ENTRY_START_TOKENS,
+    min_share: float = ENTRY_START_MIN_SHARE,
+) -> LearnedEntryStart | None:
+    """
+    Learn which lines start a new entry from a sample of a log.
+
+    Indented lines are taken to be continuations. Among the rest, the most
+    common first token type is taken, then extended one token at a time
+    while the most common next type is shared by at least ``min_share`` of
+    the lines matched so far.
+
+    Args:
+        lines: Log lines (only the first sample_size are read).
+        sample_size: Maximum lines sampled.
+        max_tokens: Maximum token types in the signature.
+        min_share: Share of matched lines needed to extend the signature.
+
+    Returns:
+        The learned signature, or None if the sample has no unindented lines.
+    """
+    sigs = []
+    total = 0
+    for line in islice(lines, sample_size):
+        line = line.rstrip('\n\r')
+        if not line:
+            continue
+        total += 1
+        if line[0] not in ' \t':
+            sigs.append(_leading_types(line, max_tokens))
+    if not sigs:
+        return None
+
+    prefix: tuple[TokenType, ...] = ()
+    matched = sigs
+    for depth in range(max_tokens):
+        counts = Counter(sig[depth] for sig in matched if len(sig) > depth)
+        if not counts:
+            break
+        token_type, count = counts.most_common(1)[0]
+        if prefix and count < min_share * len(matched):
+            break
+        prefix += (token_type,)
+        matched = [sig for sig in matched if len(sig) > depth and sig[depth] == token_type]
+
+    return LearnedEntryStart(prefix=prefix, coverage=round(len(matched) / total, 4))
+
+
 class MultilineJoiner:
     """Join multi-line log entries into single records."""
 
     def __init__(
         self,
-        detector: ContinuationDetector | None = None,
+        detector: ContinuationDetector | LearnedEntryStart | None = None,
         separator: str = "\n",
         max_lines: int = 100,
     ):
@@ -147,7 +311,7 @@ class MultilineJoiner:
         self.separator = separator
         self.max_lines = max_lines
 
-    def join_lines(self, lines: Iterator[str]) -> Iterator[str]:
+    def join_lines(self, lines: Iterable[str]) -> Iterator[str]:
         """
         Join multi-line entries into single records.
 
@@ -157,16 +321,32 @@ class MultilineJoiner:
         Yields:
             Complete log entries (may contain original newlines as separator).
         """
+        for _, entry in self.join_numbered(lines):
+            yield entry
+
+    def join_numbered(self, lines: Iterable[str], start: int = 1) -> Iterator[tuple[int, str]]:
+        """
+        Join multi-line entries, keeping the line number each entry starts on.
+
+        Args:
+            lines: Iterator of log lines.
+            start: Number of the first line.
+
+        Yields:
+            (first_line_number, entry) for each complete entry.
+        """
         self.detector.reset()
         buffer: list[str] = []
         prev_line: str | None = None
+        first = start
 
-        for line in lines:
+        for line_number, line in enumerate(lines, start=start):
             line = line.rstrip('\n\r')
 
             if not buffer:
                 # Start new entry
                 buffer.append(line)
+                first = line_number
                 self.detector.update_state(line)
                 prev_line = line
                 continue
@@ -180,17 +360,18 @@ class MultilineJoiner:
                 # else: drop line (too many continuations)
             else:
                 # Emit completed entry
-                yield self.separator.join(buffer)
+                yield first, self.separator.join(buffer)
 
                 # Start new entry
                 self.detector.reset()
                 buffer = [line]
+                first = line_number
                 self.detector.update_state(line)
                 prev_line = line
 
         # Emit final entry
         if buffer:
-            yield self.separator.join(buffer)
+            yield first, self.separator.join(buffer)
 
 
 def join_multiline(
@@ -212,3 +393,29 @@ def join_multiline(
     detector = ContinuationDetector(**detector_kwargs)
     joiner = MultilineJoiner(detector=detector, separator=separator)
     yield from joiner.join_lines(lines)
+
+
+def join_multiline_numbered(
+    lines: Iterable[str],
+    separator: str = "\n",
+    entry_start: LearnedEntryStart | None = None,
+    **detector_kwargs,
+) -> Iterator[tuple[int, str]]:
+    """
+    Join multi-line log entries, numbering each by its first line.
+
+    The result can be passed straight to learn_patterns or parse_logs.
+
+    Args:
+        lines: Iterator of log lines.
+        separator: String to join lines with.
+        entry_start: Learned entry-start signature to use instead of the
+            ContinuationDetector heuristics.
+        **detector_kwargs: Arguments for ContinuationDetector.
+
+    Yields:
+        (first_line_number, entry) for each complete entry.
+    """
+    detector = entry_start or ContinuationDetector(**detector_kwargs)
+    joiner = MultilineJoiner(detector=detector, separator=separator)
+    yield from joiner.join_numbered(lines)
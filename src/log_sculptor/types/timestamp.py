@@ -13,6 +13,13 @@ _TIMESTAMP_PATTERNS: list[tuple[regex.Pattern, str]] = [
     (regex.compile(r'^\d{13}$'), "epoch_millis"),
 ]
 
+# Everything is_likely_timestamp accepts, as one search: the anchored
+# formats above plus a date anywhere in the value.
+_LIKELY_TIMESTAMP = regex.compile("|".join(
+    [f"(?:{pattern.pattern})" for pattern, _ in _TIMESTAMP_PATTERNS]
+    + [r'\d{4}[-/]\d{2}[-/]\d{2}', r'\d{2}[-/]\d{2}[-/]\d{4}']
+))
+
 _MONTH_MAP = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
               'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
 
@@ -120,11 +127,4 @@ def is_likely_timestamp(value: str) -> bool:
     value = value.strip()
     if not value:
         return False
-    for pattern, _ in _TIMESTAMP_PATTERNS:
-        if pattern.match(value):
-            return True
-    if regex.search(r'\d{4}[-/]\d{2}[-/]\d{2}', value):
-        return True
-    if regex.search(r'\d{2}[-/]\d{2}[-/]\d{4}', value):
-        return True
-    return False
+    return _LIKELY_TIMESTAMP.search(value) is not None
@@ -0,0 +1,126 @@
+"""Tests for the asyncio parsing API."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from log_sculptor.core.aio import aparse
+from log_sculptor.core.patterns import learn_patterns, parse_logs
+
+LINES = [f"INFO request {i} done in {i * 3}ms" for i in range(1, 201)]
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("\n".join(LINES[:100] + [""] + LINES[100:]) + "\n")
+    return path
+
+
+@pytest.fixture
+def patterns(log_file):
+    return learn_patterns(log_file)
+
+
+async def _collect(agen):
+    return [record async for record in agen]
+
+
+class TestAparse:
+    """Tests for aparse."""
+
+    def test_socket_stream_matches_parse_logs(self, log_file, patterns):
+        """Lines sent over a local socket parse exactly like the file."""
+        payload = log_file.read_bytes().replace(b"\n", b"\r\n")
+
+        async def main():
+            async def handle(reader, writer):
+                for start in range(0, len(payload), 97):
+                    writer.write(payload[start:start + 97])
+                    await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                records = await _collect(aparse(reader, patterns, batch_size=16))
+                writer.close()
+            return records
+
+        records = asyncio.run(main())
+        expected = list(parse_logs(log_file, patterns))
+        assert [(r.line_number, r.raw, r.fields) for r in records] == \
+            [(r.line_number, r.raw, r.fields) for r in expected]
+
+    def test_str_source_and_custom_executor(self, patterns):
+        calls = []
+
+        class CountingExecutor(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                calls.append(1)
+                return super().submit(*args, **kwargs)
+
+        async def source():
+            for line in LINES[:50]:
+                yield line + "\n"
+
+        async def main():
+            with CountingExecutor(max_workers=1) as executor:
+                return await _collect(aparse(source(), patterns, batch_size=10, executor=executor))
+
+        records = asyncio.run(main())
+        assert [r.line_number for r in records] == list(range(1, 51))
+        assert len(calls) == 5
+
+    def test_backpressure_bounds_read_ahead(self, patterns):
+        produced = 0
+
+        async def source():
+            nonlocal produced
+            for line in LINES:
+                produced += 1
+                yield line
+
+        async def main():
+            agen = aparse(source(), patterns, batch_size=10, max_pending=2)
+            await agen.__anext__()
+            # Let the reader run as far ahead as it can.
+            for _ in range(50):
+                await asyncio.sleep(0)
+            seen = produced
+            await agen.aclose()
+            return seen
+
+        seen = asyncio.run(main())
+        # One batch matched, a full queue, and one line waiting on put().
+        assert seen <= 10 + 10 * 2 + 1
+
+    def test_partial_batch_is_not_held(self, patterns):
+        """A quiet source still gets its lines matched after the linger time."""
+        async def main():
+            queue: asyncio.Queue = asyncio.Queue()
+
+            async def source():
+                while (line := await queue.get()) is not None:
+                    yield line
+
+            agen = aparse(source(), patterns, batch_size=100, linger=0.01)
+            await queue.put(LINES[0])
+            record = await asyncio.wait_for(agen.__anext__(), 2)
+            await queue.put(None)
+            rest = await _collect(agen)
+            return record, rest
+
+        record, rest = asyncio.run(main())
+        assert record.raw == LINES[0]
+        assert rest == []
+
+    def test_source_error_propagates(self, patterns):
+        async def source():
+            yield LINES[0]
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(_collect(aparse(source(), patterns)))
@@ -0,0 +1,191 @@
+"""Tests for checkpointed, resumable parsing."""
+import sqlite3
+
+import pytest
+
+from log_sculptor.core.checkpoint import Checkpoint, checkpoint_path, resumable_parse
+from log_sculptor.core.patterns import learn_patterns
+from log_sculptor.exceptions import CheckpointError
+from log_sculptor.outputs import open_writer
+
+
+class Interrupted(Exception):
+    """Simulated pre-emption."""
+
+
+class InterruptingWriter:
+    """Wraps a writer and raises after a number of write() calls."""
+
+    def __init__(self, writer, fail_after):
+        self.writer = writer
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def write(self, records):
+        self.calls += 1
+        if self.calls > self.fail_after:
+            self._crash()
+            raise Interrupted()
+        return self.writer.write(records)
+
+    def _crash(self):
+        """Drop open handles without flushing, as a killed process would."""
+        if hasattr(self.writer, "_conn"):
+            self.writer._conn.close()
+        elif hasattr(self.writer, "_f"):
+            self.writer._f.close()
+
+    def flush(self):
+        return self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    lines = []
+    for i in range(1, 301):
+        if i % 7 == 0:
+            lines.append(f"WARN disk {i} usage {i % 100}% on /dev/sd{i % 3}")
+        elif i % 11 == 0:
+            lines.append("")
+        else:
+            lines.append(f"INFO request {i} done in {i * 3}ms user=u{i % 5}")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def patterns(log_file):
+    return learn_patterns(log_file)
+
+
+def _run(log_file, patterns, output_format, output, checkpoint=None, fail_after=None):
+    writer = open_writer(output_format, output, patterns=patterns,
+                         state=checkpoint.output_state if checkpoint else None)
+    if fail_after is not None:
+        writer = InterruptingWriter(writer, fail_after)
+    return resumable_parse(log_file, patterns, writer, checkpoint_path(output), output_format,
+                           checkpoint=checkpoint, checkpoint_every=40, block_size=512)
+
+
+def _interrupted_then_resumed(log_file, patterns, output_format, output, fail_after):
+    with pytest.raises(Interrupted):
+        _run(log_file, patterns, output_format, output, fail_after=fail_after)
+    checkpoint = Checkpoint.load(checkpoint_path(output))
+    assert not checkpoint.complete
+    checkpoint.validate(log_file, patterns, output_format)
+    return _run(log_file, patterns, output_format, output, checkpoint=checkpoint)
+
+
+class TestResumableParse:
+    """Tests for resumable_parse."""
+
+    def test_jsonl_resume_matches_uninterrupted(self, tmp_path, log_file, patterns):
+        expected = tmp_path / "full.jsonl"
+        full = _run(log_file, patterns, "jsonl", expected)
+        for fail_after in (1, 3, 7, 12):
+            output = tmp_path / f"resumed{fail_after}.jsonl"
+            result = _interrupted_then_resumed(log_file, patterns, "jsonl", output, fail_after)
+            assert result.complete
+            assert result.records == full.records
+            assert output.read_bytes() == expected.read_bytes()
+
+    def test_sqlite_resume_matches_uninterrupted(self, tmp_path, log_file, patterns):
+        expected = tmp_path / "full.db"
+        _run(log_file, patterns, "sqlite", expected)
+        output = tmp_path / "resumed.db"
+        _interrupted_then_resumed(log_file, patterns, "sqlite", output, fail_after=5)
+
+        def rows(path):
+            conn = sqlite3.connect(path)
+            try:
+                return conn.execute("SELECT * FROM logs ORDER BY line_number").fetchall()
+            finally:
+                conn.close()
+
+        assert rows(output) == rows(expected)
+
+    def test_sqlite_discards_rows_past_checkpoint(self, tmp_path, log_file, patterns):
+        output = tmp_path / "out.db"
+        with pytest.raises(Interrupted):
+            _run(log_file, patterns, "sqlite", output, fail_after=5)
+        checkpoint = Checkpoint.load(checkpoint_path(output))
+        # A commit that landed after the checkpoint was saved (crash between the two).
+        conn = sqlite3.connect(output)
+        conn.execute("INSERT INTO logs (line_number, matched) VALUES (?, 0)", (checkpoint.line_number + 1,))
+        conn.commit()
+        conn.close()
+
+        writer = open_writer("sqlite", output, state=checkpoint.output_state)
+        writer.close()
+        conn = sqlite3.connect(output)
+        last = conn.execute("SELECT MAX(line_number) FROM logs").fetchone()[0]
+        conn.close()
+        assert last <= checkpoint.line_number
+
+    def test_parquet_resume_matches_uninterrupted(self, tmp_path, log_file, patterns):
+        pq = pytest.importorskip("pyarrow.parquet")
+        expected = tmp_path / "full.parquet"
+        _run(log_file, patterns, "parquet", expected)
+        output = tmp_path / "resumed.parquet"
+        _interrupted_then_resumed(log_file, patterns, "parquet", output, fail_after=5)
+
+        assert pq.read_table(output).to_pylist() == pq.read_table(expected).to_pylist()
+        assert not output.with_name(output.name + ".parts").exists()
+
+    def test_checkpoint_offsets_are_line_starts(self, tmp_path, log_file, patterns):
+        output = tmp_path / "out.jsonl"
+        with pytest.raises(Interrupted):
+            _run(log_file, patterns, "jsonl", output, fail_after=6)
+        checkpoint = Checkpoint.load(checkpoint_path(output))
+        data = log_file.read_bytes()
+        assert data[checkpoint.offset - 1:checkpoint.offset] == b"\n"
+        assert data[:checkpoint.offset].count(b"\n") == checkpoint.line_number
+
+
+class TestCheckpointValidation:
+    """Tests for Checkpoint.validate."""
+
+    def test_rejects_changed_patterns(self, tmp_path, log_file, patterns):
+        output = tmp_path / "out.jsonl"
+        checkpoint = _run(log_file, patterns, "jsonl", output)
+        patterns.patterns[0].frequency += 1
+        with pytest.raises(CheckpointError):
+            checkpoint.validate(log_file, patterns, "jsonl")
+
+    def test_rejects_replaced_file(self, tmp_path, log_file, patterns):
+        output = tmp_path / "out.jsonl"
+        checkpoint = _run(log_file, patterns, "jsonl", output)
+        log_file.unlink()
+        log_file.write_text("ERROR something else entirely\n")
+        with pytest.raises(CheckpointError):
+            checkpoint.validate(log_file, patterns, "jsonl")
+
+    def test_accepts_appended_file(self, tmp_path, log_file, patterns):
+        output = tmp_path / "out.jsonl"
+        checkpoint = _run(log_file, patterns, "jsonl", output)
+        with open(log_file, "a") as f:
+            f.write("INFO request 999 done in 1ms user=u1\n")
+        checkpoint.validate(log_file, patterns, "jsonl")
+
+    def test_accepts_appended_small_file(self, tmp_path, patterns):
+        log_file = tmp_path / "small.log"
+        log_file.write_text("INFO request 1 done in 3ms user=u1\n")
+        checkpoint = _run(log_file, patterns, "jsonl", tmp_path / "out.jsonl")
+        with open(log_file, "a") as f:
+            f.write("INFO request 2 done in 6ms user=u2\n")
+        checkpoint.validate(log_file, patterns, "jsonl")
+
+    def test_rejects_other_format(self, tmp_path, log_file, patterns):
+        checkpoint = _run(log_file, patterns, "jsonl", tmp_path / "out.jsonl")
+        with pytest.raises(CheckpointError):
+            checkpoint.validate(log_file, patterns, "sqlite")
+
+    def test_load_corrupt(self, tmp_path):
+        path = tmp_path / "bad.ckpt"
+        path.write_bytes(b"{not json")
+        with pytest.raises(CheckpointError):
+            Checkpoint.load(path)
@@ -0,0 +1,137 @@
+"""Tests for multiline-aware parallel chunking."""
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from log_sculptor.core.index import LineIndex
+from log_sculptor.core.reader import iter_lines
+from log_sculptor.parsers import chunking
+from log_sculptor.parsers.chunking import (
+    join_multiline_range,
+    parallel_join_multiline,
+    plan_multiline_chunks,
+)
+from log_sculptor.parsers.multiline import join_multiline_numbered, learn_entry_start
+
+PIECES = [
+    "2024-01-15 10:00:00 INFO ok",
+    "2024-01-15 10:00:01 ERROR bad {",
+    "}",
+    "\tat com.example.Service.process(Service.java:42)",
+    "Caused by: java.io.IOException",
+    "continued \\",
+    "",
+    "  indented",
+    '"quoted {"',
+    "[2024-01-15 10:00:02] bracketed",
+    "plain text",
+]
+
+
+def _java_log(path, entries):
+    lines = []
+    for i in range(entries):
+        lines.append(f"2024-01-15 10:{i // 60 % 60:02d}:{i % 60:02d} ERROR Request {i} failed")
+        if i % 2:
+            lines.append("java.lang.IllegalStateException: bad state")
+            lines.extend("\tat com.example.Service.process(Service.java:42)" for _ in range(i % 7))
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+class TestPlanMultilineChunks:
+    """Tests for plan_multiline_chunks."""
+
+    def test_splits_on_entry_starts(self, tmp_path):
+        path = tmp_path / "java.log"
+        _java_log(path, 200)
+        chunks = plan_multiline_chunks(path, 8)
+        assert len(chunks) > 1
+        data = path.read_bytes()
+        lines = data.decode().split("\n")
+        for first, start, end in chunks:
+            assert start == 0 or data[start - 1:start] == b"\n"
+            assert lines[first - 1].startswith("2024-01-15")
+        assert chunks[0][1] == 0 and chunks[-1][2] == len(data)
+        assert all(a[2] == b[1] for a, b in zip(chunks, chunks[1:]))
+
+    def test_no_entry_start_keeps_one_chunk(self, tmp_path):
+        path = tmp_path / "indented.log"
+        path.write_text("start\n" + "    more\n" * 500)
+        assert plan_multiline_chunks(path, 4) == [(1, 0, path.stat().st_size)]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.log"
+        path.write_text("")
+        assert plan_multiline_chunks(path, 4) == []
+
+
+class TestJoinMultilineRange:
+    """Tests for join_multiline_range."""
+
+    def test_completes_last_entry_past_range(self, tmp_path):
+        path = tmp_path / "java.log"
+        _java_log(path, 20)
+        serial = list(join_multiline_numbered(iter_lines(path)))
+        entries, next_start = join_multiline_range(path, 1, 0, serial[3][0] + 1)
+        assert entries == serial[:4]
+        assert next_start == serial[4][0]
+
+    def test_end_of_file(self, tmp_path):
+        path = tmp_path / "java.log"
+        _java_log(path, 5)
+        entries, next_start = join_multiline_range(path, 1, 0, None)
+        assert entries == list(join_multiline_numbered(iter_lines(path)))
+        assert next_start is None
+
+
+class TestParallelJoinMultiline:
+    """parallel_join_multiline must reproduce the serial join exactly."""
+
+    def test_java_log_matches_serial(self, tmp_path, executor):
+        path = tmp_path / "java.log"
+        _java_log(path, 300)
+        serial = list(join_multiline_numbered(iter_lines(path), separator=" "))
+        parallel = list(parallel_join_multiline(path, separator=" ", chunk_bytes=512, executor=executor))
+        assert parallel == serial
+
+    def test_random_logs_match_serial(self, tmp_path, executor):
+        rng = random.Random(0)
+        path = tmp_path / "random.log"
+        for trial in range(150):
+            newline = ["\n", "\r\n", "\r"][trial % 3]
+            text = newline.join(rng.choice(PIECES) for _ in range(rng.randint(0, 200)))
+            path.write_bytes((text + newline * (trial % 2)).encode())
+            kwargs = {"check_brackets": trial % 4 != 1, "check_backslash": trial % 4 != 2}
+            entry_start = learn_entry_start(iter_lines(path)) if trial % 5 == 0 else None
+            serial = list(join_multiline_numbered(iter_lines(path), entry_start=entry_start, **kwargs))
+            parallel = list(parallel_join_multiline(
+                path, entry_start=entry_start, chunk_bytes=rng.randint(16, 300), executor=executor, **kwargs
+            ))
+            assert parallel == serial, trial
+
+    def test_repairs_splits_inside_entries(self, tmp_path, executor, monkeypatch):
+        # Split on arbitrary lines so some ranges begin mid-entry.
+        monkeypatch.setattr(
+            chunking, "plan_multiline_chunks",
+            lambda source, parts, *args, **kwargs: LineIndex.build(source, interval=3).split(parts),
+        )
+        rng = random.Random(1)
+        path = tmp_path / "random.log"
+        for trial in range(100):
+            path.write_text("\n".join(rng.choice(PIECES) for _ in range(rng.randint(0, 200))) + "\n")
+            serial = list(join_multiline_numbered(iter_lines(path)))
+            parallel = list(parallel_join_multiline(path, chunk_bytes=rng.randint(16, 300), executor=executor))
+            assert parallel == serial, trial
+
+    def test_process_pool(self, tmp_path):
+        path = tmp_path / "java.log"
+        _java_log(path, 100)
+        serial = list(join_multiline_numbered(iter_lines(path)))
+        assert list(parallel_join_multiline(path, workers=2, chunk_bytes=1024)) == serial
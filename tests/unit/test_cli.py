@@ -2,7 +2,7 @@
 import pytest
 from click.testing import CliRunner
 
-from log_sculptor.cli import learn, parse, auto, show, validate, merge, drift, fast_learn, generate
+from log_sculptor.cli import learn, parse, auto, show, validate, merge, drift, fast_learn, generate, index, serve, stats
 from log_sculptor.testing.generators import write_sample_logs
 
 # Check for optional dependencies
@@ -72,6 +72,19 @@ class TestLearnCommand:
         assert result.exit_code == 0
         assert "Learning patterns from" in result.output
 
+    def test_learn_with_literals(self, runner, sample_log, tmp_path):
+        """Test learn with literal detection."""
+        import orjson
+        output = tmp_path / "patterns.json"
+        result = runner.invoke(learn, [str(sample_log), "-o", str(output), "--literals"])
+
+        assert result.exit_code == 0
+        data = orjson.loads(output.read_bytes())
+        assert any(
+            e["type"] == "literal" and e["token_type"] != "WHITESPACE"
+            for p in data["patterns"] for e in p["elements"]
+        )
+
 
 class TestParseCommand:
     """Tests for parse command."""
@@ -106,6 +119,92 @@ class TestParseCommand:
 
         assert result.exit_code == 0
 
+    def test_parse_match_stats(self, runner, sample_log, patterns_file, tmp_path):
+        """Test parse with adaptive matching statistics."""
+        import orjson
+        output = tmp_path / "output.jsonl"
+        stats_file = tmp_path / "stats.json"
+        result = runner.invoke(parse, [
+            str(sample_log), "-p", str(patterns_file), "-o", str(output),
+            "--match-stats", str(stats_file), "-v",
+        ])
+
+        assert result.exit_code == 0
+        assert "Average attempts per line" in result.output
+        stats = orjson.loads(stats_file.read_bytes())
+        assert stats["lines"] == 50
+        assert sum(stats["hits"].values()) == stats["matched"]
+
+    def test_parse_with_cache(self, runner, sample_log, patterns_file, tmp_path):
+        """Test parse with the line result cache."""
+        import orjson
+        output = tmp_path / "output.jsonl"
+        stats_file = tmp_path / "stats.json"
+        result = runner.invoke(parse, [
+            str(sample_log), "-p", str(patterns_file), "-o", str(output),
+            "--cache-size", "100", "--cache-skeleton", "--match-stats", str(stats_file), "-v",
+        ])
+
+        assert result.exit_code == 0
+        assert "Cache hit ratio" in result.output
+        stats = orjson.loads(stats_file.read_bytes())
+        assert stats["cache"]["lookups"] == 50
+
+    def test_parse_match_stats_bad_path(self, runner, sample_log, patterns_file, tmp_path):
+        """Test an unwritable --match-stats path is reported without a traceback."""
+        output = tmp_path / "output.jsonl"
+        stats_file = tmp_path / "missing" / "stats.json"
+        for extra in ([], ["--cache-size", "100"]):
+            result = runner.invoke(parse, [
+                str(sample_log), "-p", str(patterns_file), "-o", str(output),
+                "--match-stats", str(stats_file), *extra,
+            ])
+
+            assert result.exit_code == 1
+            assert "Failed to write match statistics" in result.output
+            assert not isinstance(result.exception, OSError)
+
+
+    def test_parse_time_window(self, runner, tmp_path):
+        """Test --since/--until restricts output to the window."""
+        log_file = tmp_path / "timed.log"
+        log_file.write_text("".join(f"2024-01-15 10:00:{s:02d} INFO tick {s}\n" for s in range(60)))
+        patterns_path = tmp_path / "timed.json"
+        runner.invoke(learn, [str(log_file), "-o", str(patterns_path)])
+        output = tmp_path / "window.jsonl"
+
+        result = runner.invoke(parse, [
+            str(log_file), "-p", str(patterns_path), "-o", str(output),
+            "--since", "2024-01-15 10:00:10", "--until", "2024-01-15 10:00:20",
+        ])
+
+        assert result.exit_code == 0
+        assert "Parsed 10 records" in result.output
+
+    def test_parse_time_window_time_zone(self, runner, tmp_path):
+        """Test --timezone sets the zone of naive log timestamps."""
+        log_file = tmp_path / "timed.log"
+        log_file.write_text("".join(f"2024-01-15 10:00:{s:02d} INFO tick {s}\n" for s in range(60)))
+        patterns_path = tmp_path / "timed.json"
+        runner.invoke(learn, [str(log_file), "-o", str(patterns_path)])
+        output = tmp_path / "window.jsonl"
+        args = [str(log_file), "-p", str(patterns_path), "-o", str(output),
+                "--since", "2024-01-15T01:00:10Z", "--until", "2024-01-15T01:00:20Z"]
+
+        result = runner.invoke(parse, [*args, "--timezone", "Asia/Tokyo"])
+        assert result.exit_code == 0
+        assert "Parsed 10 records" in result.output
+
+        result = runner.invoke(parse, [*args, "--timezone", "Nowhere/Special"])
+        assert result.exit_code == 2
+
+    def test_parse_invalid_since(self, runner, sample_log, patterns_file, tmp_path):
+        """Test an unparseable --since is rejected."""
+        result = runner.invoke(parse, [
+            str(sample_log), "-p", str(patterns_file), "-o", str(tmp_path / "out.jsonl"), "--since", "whenever",
+        ])
+        assert result.exit_code != 0
+
 
 class TestAutoCommand:
     """Tests for auto command."""
@@ -136,6 +235,27 @@ class TestAutoCommand:
         assert result.exit_code == 0
         assert "Learning patterns" in result.output
 
+    def test_auto_max_literal_values(self, runner, sample_log, tmp_path, monkeypatch):
+        """Test auto passes --max-literal-values to learning."""
+        import log_sculptor.cli as cli
+
+        seen = {}
+        learn_patterns = cli.learn_patterns
+
+        def spy(*args, **kwargs):
+            seen.update(kwargs)
+            return learn_patterns(*args, **kwargs)
+
+        monkeypatch.setattr(cli, "learn_patterns", spy)
+        output = tmp_path / "output.jsonl"
+        result = runner.invoke(auto, [
+            str(sample_log), "-o", str(output), "--literals", "--max-literal-values", "3",
+        ])
+
+        assert result.exit_code == 0
+        assert seen["detect_literals"] is True
+        assert seen["max_literal_values"] == 3
+
 
 class TestShowCommand:
     """Tests for show command."""
@@ -202,6 +322,124 @@ class TestDriftCommand:
 
         assert result.exit_code in [0, 1]
 
+    def test_drift_follow_writes_events(self, runner, tmp_path):
+        """Test --follow reports a format change as a JSON line."""
+        import orjson
+
+        log_file = tmp_path / "mixed.log"
+        log_file.write_text("2024-01-15 INFO message\n" * 50 + "ERROR: something failed at line 123\n" * 50)
+        patterns_file = tmp_path / "patterns.json"
+        runner.invoke(learn, [str(log_file), "-o", str(patterns_file)])
+        events_file = tmp_path / "events.jsonl"
+        result = runner.invoke(drift, [
+            str(log_file), "-p", str(patterns_file), "--follow", "--window", "20",
+            "--idle-timeout", "0.2", "--poll-interval", "0.05", "--events", str(events_file),
+        ])
+
+        assert result.exit_code == 1
+        events = [orjson.loads(line) for line in events_file.read_bytes().splitlines()]
+        assert [e["kind"] for e in events] == ["pattern_change"]
+        assert events[0]["line_number"] == 61
+
+    def test_drift_by_time_bucket(self, runner, tmp_path):
+        """Test --bucket reports a distribution shift and writes the histogram."""
+        import sqlite3
+
+        log_file = tmp_path / "app.log"
+        lines = [f"2024-01-15 10:{i // 30:02d}:{i % 30:02d} INFO request {i} done" for i in range(90)]
+        lines += [f"2024-01-15 10:{i // 30:02d}:{i % 30:02d} WARN cache miss k{i}" for i in range(90, 180)]
+        log_file.write_text("\n".join(lines) + "\n")
+        patterns_file = tmp_path / "patterns.json"
+        runner.invoke(learn, [str(log_file), "-o", str(patterns_file)])
+        db = tmp_path / "hist.db"
+        result = runner.invoke(drift, [
+            str(log_file), "-p", str(patterns_file), "--bucket", "1m", "--histogram", str(db),
+        ])
+
+        assert result.exit_code == 1
+        assert "Distribution shifts: 1" in result.output
+        assert "2024-01-15T10:03:00+00:00" in result.output
+        conn = sqlite3.connect(db)
+        assert conn.execute("SELECT SUM(count) FROM pattern_histogram").fetchone()[0] == 180
+        conn.close()
+
+    def test_drift_histogram_requires_bucket(self, runner, sample_log, patterns_file, tmp_path):
+        """Test --histogram without --bucket is rejected."""
+        result = runner.invoke(drift, [str(sample_log), "-p", str(patterns_file), "--histogram", str(tmp_path / "h.db")])
+
+        assert result.exit_code == 2
+
+    def test_drift_workers(self, runner, sample_log, patterns_file):
+        """Test --workers reports the same as a serial scan."""
+        serial = runner.invoke(drift, [str(sample_log), "-p", str(patterns_file), "--window", "20"])
+        result = runner.invoke(drift, [str(sample_log), "-p", str(patterns_file), "--window", "20", "--workers", "2"])
+
+        assert result.exit_code == serial.exit_code
+        assert result.output == serial.output
+
+    def test_drift_follow_quiet_stream(self, runner, sample_log, patterns_file):
+        """Test --follow exits 0 when nothing drifts."""
+        result = runner.invoke(drift, [
+            str(sample_log), "-p", str(patterns_file), "--follow", "--window", "1000", "--idle-timeout", "0.1",
+        ])
+
+        assert result.exit_code == 0
+        assert result.output == ""
+
+
+class TestStatsCommand:
+    """Tests for stats command."""
+
+    def test_stats_json(self, runner, sample_log, patterns_file):
+        """Test stats prints compact JSON."""
+        import orjson
+
+        result = runner.invoke(stats, [str(sample_log), "-p", str(patterns_file), "--top", "3"])
+
+        assert result.exit_code == 0
+        data = orjson.loads(result.output)
+        assert data["lines"] == sum(p["count"] for p in data["patterns"]) + data["unmatched"]
+        assert all(len(f["top"]) <= 3 for p in data["patterns"] for f in p["fields"].values())
+        assert "\n" not in result.output.strip()
+
+    def test_stats_output_file(self, runner, sample_log, patterns_file, tmp_path):
+        """Test stats writes to a file."""
+        import orjson
+
+        output = tmp_path / "stats.json"
+        result = runner.invoke(stats, [
+            str(sample_log), "-p", str(patterns_file), "-o", str(output), "--quantiles", "0.5,0.95",
+        ])
+
+        assert result.exit_code == 0
+        assert orjson.loads(output.read_bytes())["lines"] > 0
+
+    def test_stats_output_bad_path(self, runner, sample_log, patterns_file, tmp_path):
+        """Test an unwritable -o path is reported without a traceback."""
+        output = tmp_path / "missing" / "stats.json"
+        result = runner.invoke(stats, [str(sample_log), "-p", str(patterns_file), "-o", str(output)])
+
+        assert result.exit_code == 1
+        assert "Failed to write statistics" in result.output
+        assert not isinstance(result.exception, OSError)
+
+    def test_stats_invalid_quantiles(self, runner, sample_log, patterns_file):
+        """Test stats rejects quantiles outside [0, 1]."""
+        result = runner.invoke(stats, [str(sample_log), "-p", str(patterns_file), "--quantiles", "50"])
+
+        assert result.exit_code == 2
+
+    def test_stats_sketches(self, runner, sample_log, patterns_file, tmp_path):
+        """Test stats saves mergeable quantile sketches."""
+        from log_sculptor.core.stats import QuantileCollector
+
+        sketches = tmp_path / "sketches.json"
+        result = runner.invoke(stats, [str(sample_log), "-p", str(patterns_file), "--sketches", str(sketches)])
+
+        assert result.exit_code == 0
+        loaded = QuantileCollector.load(sketches)
+        assert isinstance(loaded.digests, dict)
+
 
 class TestFastLearnCommand:
     """Tests for fast-learn command."""
@@ -216,6 +454,31 @@ class TestFastLearnCommand:
         assert "Learned" in result.output
 
 
+class TestIndexCommand:
+    """Tests for index command."""
+
+    def test_index_builds_sidecar(self, runner, sample_log):
+        """Test index writes a sidecar next to the log."""
+        result = runner.invoke(index, [str(sample_log), "--interval", "8"])
+
+        assert result.exit_code == 0
+        assert "Indexed 50 lines (7 checkpoints)" in result.output
+        assert sample_log.with_name(sample_log.name + ".lsidx").exists()
+
+    def test_index_print_line(self, runner, sample_log):
+        """Test printing a line by number."""
+        expected = sample_log.read_text().splitlines()[41]
+        result = runner.invoke(index, [str(sample_log), "--interval", "8", "--line", "42"])
+
+        assert result.exit_code == 0
+        assert result.output.splitlines()[-1] == expected
+
+    def test_index_line_out_of_range(self, runner, sample_log):
+        """Test out-of-range line exits non-zero."""
+        result = runner.invoke(index, [str(sample_log), "--line", "51"])
+        assert result.exit_code == 1
+
+
 class TestGenerateCommand:
     """Tests for generate command."""
 
@@ -278,6 +541,27 @@ class TestMultilineHandling:
         assert result.exit_code == 0
         assert output.exists()
 
+    def test_multiline_flag_before_logfile(self, runner, multiline_log, tmp_path):
+        """Test a bare --multiline does not take the log file as its value."""
+        for flag in ("--multiline", "--no-multiline"):
+            output = tmp_path / "patterns.json"
+            result = runner.invoke(learn, [flag, str(multiline_log), "-o", str(output)])
+
+            assert result.exit_code == 0, result.output
+            assert output.exists()
+
+    def test_multiline_mode_implies_multiline(self, runner, multiline_log, tmp_path):
+        """Test --multiline-mode turns on multi-line joining by itself."""
+        patterns_file = tmp_path / "patterns.json"
+        runner.invoke(learn, [str(multiline_log), "-o", str(patterns_file), "--multiline"])
+
+        output = tmp_path / "output.jsonl"
+        result = runner.invoke(parse, [
+            "--multiline-mode", "heuristic", str(multiline_log), "-p", str(patterns_file), "-o", str(output),
+        ])
+        assert result.exit_code == 0
+        assert len(output.read_bytes().splitlines()) == 3
+
     def test_parse_multiline(self, runner, multiline_log, tmp_path):
         """Test parse with multiline option."""
         patterns_file = tmp_path / "patterns.json"
@@ -290,7 +574,9 @@ class TestMultilineHandling:
         ])
 
         assert result.exit_code == 0
-        assert output.exists()
+        import orjson
+        numbers = [orjson.loads(line)["line_number"] for line in output.read_bytes().splitlines()]
+        assert numbers == [1, 2, 5]
 
     def test_auto_multiline(self, runner, multiline_log, tmp_path):
         """Test auto with multiline option."""
@@ -300,6 +586,51 @@ class TestMultilineHandling:
         assert result.exit_code == 0
         assert output.exists()
 
+    def test_learned_multiline_persisted(self, runner, multiline_log, tmp_path):
+        """Test --multiline-mode learned stores the entry-start signature and parse reuses it."""
+        from log_sculptor.core.patterns import PatternSet
+        from log_sculptor.core.tokenizer import TokenType
+        patterns_file = tmp_path / "patterns.json"
+        result = runner.invoke(learn, [str(multiline_log), "-o", str(patterns_file), "--multiline-mode", "learned"])
+        assert result.exit_code == 0
+        entry_start = PatternSet.load(patterns_file).entry_start
+        assert entry_start.prefix[0] == TokenType.TIMESTAMP
+
+        result = runner.invoke(show, [str(patterns_file)])
+        assert "Entry starts: TIMESTAMP" in result.output
+
+        output = tmp_path / "output.jsonl"
+        result = runner.invoke(parse, [
+            str(multiline_log), "-p", str(patterns_file), "-f", "jsonl",
+            "-o", str(output), "--multiline-mode", "learned", "-v"
+        ])
+        assert result.exit_code == 0
+        assert "learning one" not in result.output
+        import orjson
+        numbers = [orjson.loads(line)["line_number"] for line in output.read_bytes().splitlines()]
+        assert numbers == [1, 2, 5]
+
+    def test_learned_multiline_without_signature(self, runner, multiline_log, tmp_path):
+        """Test parse --multiline-mode learned learns a signature when the file has none."""
+        patterns_file = tmp_path / "patterns.json"
+        runner.invoke(learn, [str(multiline_log), "-o", str(patterns_file), "--multiline"])
+
+        output = tmp_path / "output.jsonl"
+        result = runner.invoke(parse, [
+            str(multiline_log), "-p", str(patterns_file), "-f", "jsonl",
+            "-o", str(output), "--multiline-mode", "learned", "-v"
+        ])
+        assert result.exit_code == 0
+        assert "learning one" in result.output
+        assert len(output.read_bytes().splitlines()) == 3
+
+    def test_auto_learned_multiline(self, runner, multiline_log, tmp_path):
+        """Test auto with --multiline-mode learned."""
+        output = tmp_path / "output.jsonl"
+        result = runner.invoke(auto, [str(multiline_log), "-f", "jsonl", "-o", str(output), "--multiline-mode", "learned"])
+        assert result.exit_code == 0
+        assert len(output.read_bytes().splitlines()) == 3
+
 
 class TestUpdateMode:
     """Tests for pattern update mode."""
@@ -433,3 +764,158 @@ class TestVerboseOutput:
 
         assert result.exit_code == 0
         assert "Merging" in result.output
+
+
+class TestParseResume:
+    """Tests for parse --resume."""
+
+    def test_resume_fresh_then_nothing_to_resume(self, runner, sample_log, patterns_file, tmp_path):
+        """Test a checkpointed parse matches a plain parse and is not redone."""
+        plain = tmp_path / "plain.jsonl"
+        output = tmp_path / "out.jsonl"
+        runner.invoke(parse, [str(sample_log), "-p", str(patterns_file), "-o", str(plain)])
+        result = runner.invoke(parse, [str(sample_log), "-p", str(patterns_file), "-o", str(output),
+                                       "--resume", "--checkpoint-every", "10"])
+
+        assert result.exit_code == 0
+        assert "Parsed 50 records" in result.output
+        assert output.read_bytes() == plain.read_bytes()
+
+        result = runner.invoke(parse, [str(sample_log), "-p", str(patterns_file), "-o", str(output), "--resume"])
+        assert result.exit_code == 0
+        assert "Nothing to resume" in result.output
+
+    def test_resume_rejects_changed_patterns(self, runner, sample_log, patterns_file, tmp_path):
+        """Test an unfinished checkpoint for other patterns is refused."""
+        from log_sculptor.core.checkpoint import Checkpoint, checkpoint_path
+
+        output = tmp_path / "out.db"
+        runner.invoke(parse, [str(sample_log), "-p", str(patterns_file), "-f", "sqlite", "-o", str(output),
+                              "--resume"])
+        ckpt_file = checkpoint_path(output)
+        checkpoint = Checkpoint.load(ckpt_file)
+        checkpoint.complete = False
+        checkpoint.patterns_hash = "0" * 64
+        checkpoint.save(ckpt_file)
+
+        result = runner.invoke(parse, [str(sample_log), "-p", str(patterns_file), "-f", "sqlite",
+                                       "-o", str(output), "--resume"])
+        assert result.exit_code == 1
+        assert "Cannot resume" in result.output
+
+    def test_resume_with_multiline_rejected(self, runner, sample_log, patterns_file, tmp_path):
+        """Test --resume cannot be combined with --multiline."""
+        result = runner.invoke(parse, [str(sample_log), "-p", str(patterns_file), "-o", str(tmp_path / "o.jsonl"),
+                                       "--resume", "--multiline"])
+        assert result.exit_code == 2
+
+
+class TestParseFollow:
+    """Tests for parse --follow."""
+
+    def test_follow_restart_continues_without_gaps(self, runner, sample_log, patterns_file, tmp_path):
+        """Test a restarted follower picks up only the lines added meanwhile."""
+        output = tmp_path / "out.jsonl"
+        args = [str(sample_log), "-p", str(patterns_file), "-o", str(output),
+                "--follow", "--poll-interval", "0.01", "--idle-timeout", "0.1"]
+        result = runner.invoke(parse, args)
+        assert result.exit_code == 0
+        assert "Parsed 50 records" in result.output
+
+        lines = sample_log.read_text().splitlines()
+        with open(sample_log, "a") as f:
+            f.write("\n".join(lines[:5]) + "\n")
+        result = runner.invoke(parse, args)
+        assert result.exit_code == 0
+        assert "Parsed 5 records" in result.output
+
+        import orjson
+        numbers = [orjson.loads(line)["line_number"] for line in output.read_bytes().splitlines()]
+        assert numbers == list(range(1, 56))
+
+    def test_follow_sqlite_restart_after_rotation(self, runner, sample_log, patterns_file, tmp_path):
+        """Test a restart after rotation drains the old file and keeps both files' rows."""
+        import sqlite3
+
+        output = tmp_path / "out.db"
+        args = [str(sample_log), "-p", str(patterns_file), "-o", str(output), "-f", "sqlite",
+                "--follow", "--poll-interval", "0.01", "--idle-timeout", "0.1"]
+        assert runner.invoke(parse, args).exit_code == 0
+
+        lines = sample_log.read_text().splitlines()
+        with open(sample_log, "a") as f:
+            f.write("\n".join(lines[:3]) + "\n")
+        sample_log.rename(sample_log.with_name("server.log.1"))
+        sample_log.write_text("\n".join(lines[3:7]) + "\n")
+        result = runner.invoke(parse, args)
+        assert result.exit_code == 0, result.output
+        assert "Parsed 7 records" in result.output
+
+        conn = sqlite3.connect(output)
+        numbers = [row[0] for row in conn.execute("SELECT line_number FROM logs ORDER BY rowid")]
+        conn.close()
+        assert numbers == list(range(1, 54)) + [1, 2, 3, 4]
+
+    def test_follow_with_resume_rejected(self, runner, sample_log, patterns_file, tmp_path):
+        """Test --follow cannot be combined with --resume."""
+        result = runner.invoke(parse, [str(sample_log), "-p", str(patterns_file), "-o", str(tmp_path / "o.jsonl"),
+                                       "--follow", "--resume"])
+        assert result.exit_code == 2
+
+    def test_follow_parquet_rejected(self, runner, sample_log, patterns_file, tmp_path):
+        """Test --follow is refused for parquet output."""
+        result = runner.invoke(parse, [str(sample_log), "-p", str(patterns_file), "-o", str(tmp_path / "o.parquet"),
+                                       "-f", "parquet", "--follow"])
+        assert result.exit_code == 2
+        assert "not supported for parquet" in result.output
+
+
+class TestServeCommand:
+    """Tests for serve command."""
+
+    def test_serve_unix_socket(self, runner, sample_log, patterns_file, tmp_path):
+        """Test lines sent to a Unix socket are parsed into a segment."""
+        import socket
+        import threading
+        import time
+
+        sock_path = tmp_path / "serve.sock"
+        output = tmp_path / "live.jsonl"
+        lines = sample_log.read_bytes()
+
+        def client():
+            deadline = time.monotonic() + 5
+            while not sock_path.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.connect(str(sock_path))
+                s.sendall(lines)
+
+        thread = threading.Thread(target=client)
+        thread.start()
+        stats_file = tmp_path / "stats.json"
+        result = runner.invoke(serve, ["-p", str(patterns_file), "-o", str(output), "--unix", str(sock_path),
+                                       "--duration", "1.5", "--stats", str(stats_file), "--stats-interval", "0"])
+        thread.join()
+
+        assert result.exit_code == 0
+        assert "Parsed 50 records (0 dropped)" in result.output
+        segment = tmp_path / "live-00000.jsonl"
+        assert len(segment.read_bytes().splitlines()) == 50
+        import orjson
+        assert orjson.loads(stats_file.read_bytes())["parsed"] == 50
+
+    def test_serve_stats_bad_path(self, runner, patterns_file, tmp_path):
+        """Test an unwritable --stats path is reported without a traceback."""
+        result = runner.invoke(serve, ["-p", str(patterns_file), "-o", str(tmp_path / "live.jsonl"),
+                                       "--unix", str(tmp_path / "serve.sock"), "--duration", "0.2",
+                                       "--stats", str(tmp_path / "missing" / "stats.json"), "--stats-interval", "0"])
+
+        assert result.exit_code == 1
+        assert "Failed to write serve statistics" in result.output
+        assert not isinstance(result.exception, OSError)
+
+    def test_serve_requires_listener(self, runner, patterns_file, tmp_path):
+        """Test serve without a listener is a usage error."""
+        result = runner.invoke(serve, ["-p", str(patterns_file), "-o", str(tmp_path / "o.jsonl")])
+        assert result.exit_code == 2
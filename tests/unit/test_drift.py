@@ -1,7 +1,8 @@
 """Tests for format drift detection."""
+import random
 from pathlib import Path
-from log_sculptor.core.drift import DriftDetector, DriftReport, detect_drift
-from log_sculptor.core.patterns import PatternSet, learn_patterns
+from log_sculptor.core.drift import DriftDetector, DriftMonitor, DriftReport, FormatChange, detect_drift
+from log_sculptor.core.patterns import ParsedRecord, PatternSet, learn_patterns, parse_logs
 
 
 class TestDriftReport:
@@ -160,3 +161,177 @@ class TestDetectDrift:
         assert report.total_lines == 0
         assert report.match_rate == 0.0
         assert not report.has_drift
+
+
+def _reference_detect(records: list[ParsedRecord], window_size: int, min_confidence: float) -> DriftReport:
+    """Recount-every-window detection the streaming scan must agree with."""
+    pattern_seq = [r.pattern_id for r in records]
+    total = len(records)
+    changes, regions = [], []
+    current, region_start = None, 1
+    for i in range(total):
+        window = pattern_seq[max(0, i - window_size // 2):min(total, i + window_size // 2)]
+        counts: dict = {}
+        for p in window:
+            counts[p] = counts.get(p, 0) + 1
+        dominant = max(counts, key=lambda k: counts[k]) if window else None
+        if dominant != current and dominant is not None:
+            if current is not None:
+                regions.append((region_start, i, current))
+                confidence = counts[dominant] / len(window)
+                if confidence >= min_confidence:
+                    changes.append(FormatChange(i + 1, current, dominant, confidence,
+                                                records[i - 1].raw if i > 0 else None, records[i].raw))
+            current, region_start = dominant, i + 1
+    if current is not None:
+        regions.append((region_start, total, current))
+    distribution: dict = {}
+    for r in records:
+        if r.pattern_id:
+            distribution[r.pattern_id] = distribution.get(r.pattern_id, 0) + 1
+    return DriftReport(total, sum(r.matched for r in records), distribution, changes, regions)
+
+
+class TestStreamingDetect:
+    """The one-pass scan must report exactly what recounting each window does."""
+
+    def test_matches_reference(self):
+        rng = random.Random(0)
+        for trial in range(2000):
+            n = rng.randint(0, 150)
+            if trial % 2:
+                ids = [rng.choice([None, "a", "b", "c"]) for _ in range(n)]
+            else:
+                ids = []
+                while len(ids) < n:
+                    ids += [rng.choice([None, "a", "b", "c"])] * rng.randint(1, 30)
+                ids = ids[:n]
+            records = [ParsedRecord(i + 1, f"line {i}", {}, p, p is not None) for i, p in enumerate(ids)]
+            window_size = rng.randint(0, 40)
+            min_confidence = rng.choice([0.0, 0.3, 0.6])
+            detector = DriftDetector(window_size=window_size, min_confidence=min_confidence)
+            assert detector.detect_records(iter(records)) == _reference_detect(records, window_size, min_confidence)
+
+    def test_file_matches_reference(self, tmp_path: Path):
+        log_file = tmp_path / "mixed.log"
+        lines = (["2024-01-15 INFO message\n"] * 30 + ["ERROR: something failed at line 123\n"] * 30) * 3
+        log_file.write_text("".join(lines))
+        patterns = learn_patterns(log_file)
+        records = list(parse_logs(log_file, patterns))
+        report = detect_drift(log_file, patterns, window_size=20)
+        assert report == _reference_detect(records, 20, 0.3)
+        assert len(report.format_changes) == 5
+
+    def test_memory_bounded_by_window(self):
+        from log_sculptor.core.drift import _DriftScan
+        scan = _DriftScan(DriftDetector(window_size=10))
+        for i in range(5000):
+            scan.add(ParsedRecord(i + 1, "x" * 10, {}, "ab"[i // 100 % 2], True))
+            assert len(scan._window) + len(scan._pending) <= 11
+            assert len(scan._raw) <= 7
+        assert scan.report().total_lines == 5000
+
+
+class TestParallelDetect:
+    """detect_parallel must produce exactly the serial report."""
+
+    LINES = [
+        "2024-01-15 10:00:00 INFO request 17 done",
+        "ERROR: something failed at line 123",
+        "level=warn msg=retry attempt=3",
+        "??? garbage",
+        "",
+    ]
+
+    def test_random_files_match_serial(self, tmp_path: Path):
+        from concurrent.futures import ThreadPoolExecutor
+
+        rng = random.Random(0)
+        log_file = tmp_path / "mixed.log"
+        log_file.write_text("\n".join(self.LINES[:3] * 5) + "\n")
+        patterns = learn_patterns(log_file)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for trial in range(120):
+                n, lines = rng.randint(0, 400), []
+                while len(lines) < n:
+                    lines += [rng.choice(self.LINES)] * rng.randint(1, 40)
+                log_file.write_text("\n".join(lines) + ("\n" if trial % 2 else ""))
+                detector = DriftDetector(window_size=rng.randint(0, 30), min_confidence=rng.choice([0.0, 0.3, 0.6]))
+                serial = detector.detect(log_file, patterns)
+                parallel = detector.detect_parallel(
+                    log_file, patterns, workers=3, chunk_bytes=rng.randint(20, 2000), executor=executor
+                )
+                assert parallel == serial, trial
+
+    def test_process_pool(self, tmp_path: Path):
+        log_file = tmp_path / "mixed.log"
+        log_file.write_text(("2024-01-15 INFO message\n" * 300 + "ERROR: something failed at line 123\n" * 300) * 2)
+        patterns = learn_patterns(log_file)
+        serial = detect_drift(log_file, patterns, window_size=50)
+        assert detect_drift(log_file, patterns, window_size=50, workers=2) == serial
+        assert len(serial.format_changes) == 3
+
+
+def _records(pattern_ids: list[str | None]) -> list[ParsedRecord]:
+    return [ParsedRecord(i + 1, f"line {i}", {}, p, p is not None) for i, p in enumerate(pattern_ids)]
+
+
+class TestDriftMonitor:
+    """Tests for DriftMonitor."""
+
+    def test_pattern_change_event(self):
+        events = []
+        monitor = DriftMonitor(events.append, window_size=10)
+        monitor.update_many(_records(["a"] * 30 + ["b"] * 30))
+        assert [e.kind for e in events] == ["pattern_change"]
+        event = events[0]
+        assert (event.old_pattern_id, event.new_pattern_id) == ("a", "b")
+        assert event.line_number == 36
+        assert event.share == 0.6
+        assert monitor.dominant == "b"
+
+    def test_mixed_window_below_threshold(self):
+        events = []
+        monitor = DriftMonitor(events.append, window_size=10, change_threshold=0.7)
+        monitor.update_many(_records(["a"] * 20 + ["a", "b"] * 20))
+        assert events == []
+        assert monitor.dominant == "a"
+
+    def test_unmatched_rate_alert_and_recovery(self):
+        events = []
+        monitor = DriftMonitor(events.append, window_size=10, unmatched_threshold=0.3)
+        monitor.update_many(_records(["a"] * 10 + [None] * 5 + ["a"] * 10))
+        assert [(e.kind, e.line_number) for e in events] == [("unmatched_high", 13), ("unmatched_normal", 23)]
+        assert events[0].share == 0.3
+        assert not monitor.unmatched_alert
+
+    def test_nothing_reported_before_window_fills(self):
+        events = []
+        monitor = DriftMonitor(events.append, window_size=50)
+        monitor.update_many(_records([None] * 10 + ["b"] * 39))
+        assert events == []
+        assert monitor.unmatched_rate == 10 / 49
+
+    def test_state_bounded(self):
+        monitor = DriftMonitor(window_size=20)
+        monitor.update_many(_records([f"p{i % 7}" if i % 3 else None for i in range(10_000)]))
+        assert len(monitor._window) == 20
+        assert len(monitor._counts._positions) <= 8
+        assert monitor.records == 10_000
+
+    def test_stream_parse_callback(self, tmp_path: Path):
+        from log_sculptor.core.streaming import stream_parse
+        log_file = tmp_path / "mixed.log"
+        log_file.write_text("2024-01-15 INFO message\n" * 50 + "ERROR: something failed at line 123\n" * 50)
+        patterns = learn_patterns(log_file)
+        events = []
+        monitor = DriftMonitor(events.append, window_size=20)
+        for _ in stream_parse(log_file, patterns, callback=monitor):
+            pass
+        assert [e.kind for e in events] == ["pattern_change"]
+        assert events[0].line_number == 61
+
+    def test_invalid_window(self):
+        import pytest
+        with pytest.raises(ValueError):
+            DriftMonitor(window_size=0)
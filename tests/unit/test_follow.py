@@ -0,0 +1,174 @@
+"""Tests for following growing log files."""
+import threading
+import time
+
+import pytest
+
+from log_sculptor.core.follow import FollowPosition, LogFollower, follow_parse
+from log_sculptor.core.patterns import learn_patterns
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "app.log"
+
+
+def _append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+class TestLogFollower:
+    """Tests for LogFollower."""
+
+    def test_reads_appended_lines(self, log_path):
+        log_path.write_text("one\ntwo\n")
+        follower = LogFollower(log_path)
+        assert follower.read() == ["one", "two"]
+        assert follower.read() == []
+        _append(log_path, "three\n")
+        assert follower.read() == ["three"]
+        assert follower.line_number == 3
+        follower.close()
+
+    def test_holds_partial_line(self, log_path):
+        log_path.write_text("one\ntw")
+        follower = LogFollower(log_path)
+        assert follower.read() == ["one"]
+        assert follower.position.offset == 4
+        _append(log_path, "o\r\n")
+        assert follower.read() == ["two"]
+        follower.close()
+
+    def test_long_line_spans_reads(self, log_path):
+        log_path.write_text("x" * 100 + "\n")
+        follower = LogFollower(log_path, max_read=16)
+        assert follower.read() == ["x" * 100]
+        follower.close()
+
+    def test_missing_file_appears(self, log_path):
+        follower = LogFollower(log_path)
+        assert follower.read() == []
+        assert follower.position is None
+        log_path.write_text("hello\n")
+        assert follower.read() == ["hello"]
+        follower.close()
+
+    def test_rotation_drains_old_file(self, log_path):
+        log_path.write_text("a1\n")
+        follower = LogFollower(log_path)
+        assert follower.read() == ["a1"]
+        _append(log_path, "a2\na3-unterminated")
+        log_path.rename(log_path.with_name("app.log.1"))
+        log_path.write_text("b1\n")
+
+        assert follower.read() == ["a2"]
+        assert follower.read() == ["a3-unterminated"]
+        assert follower.line_number == 3
+        assert follower.read() == ["b1"]
+        assert follower.line_number == 1
+        follower.close()
+
+    def test_rotation_to_empty_file(self, log_path):
+        log_path.write_text("a1\n")
+        follower = LogFollower(log_path)
+        follower.read()
+        log_path.rename(log_path.with_name("app.log.1"))
+        log_path.write_text("")
+        assert follower.read() == []
+        _append(log_path, "b1\n")
+        assert follower.read() == ["b1"]
+        follower.close()
+
+    def test_truncation_restarts(self, log_path):
+        log_path.write_text("first line\nsecond line\n")
+        follower = LogFollower(log_path)
+        follower.read()
+        with open(log_path, "r+") as f:
+            f.truncate(0)
+        _append(log_path, "x\n")
+        assert follower.read() == ["x"]
+        assert follower.line_number == 1
+        follower.close()
+
+    def test_resume_from_position(self, log_path):
+        log_path.write_text("one\ntwo\n")
+        follower = LogFollower(log_path)
+        follower.read()
+        position = follower.position
+        follower.close()
+
+        _append(log_path, "three\n")
+        resumed = LogFollower(log_path, position)
+        assert resumed.read() == ["three"]
+        assert resumed.line_number == 3
+        resumed.close()
+
+    def test_resume_after_rotation_drains_old_file(self, log_path):
+        log_path.write_text("one\ntwo\n")
+        follower = LogFollower(log_path)
+        follower.read()
+        position = follower.position
+        follower.close()
+
+        _append(log_path, "three\n")
+        log_path.rename(log_path.with_name("app.log.1"))
+        log_path.write_text("b1\n")
+        resumed = LogFollower(log_path, position)
+        assert resumed.read() == ["three"]
+        assert resumed.line_number == 3
+        assert resumed.read() == ["b1"]
+        assert resumed.line_number == 1
+        resumed.close()
+
+    def test_resume_after_rotation_old_file_gone(self, log_path):
+        """A rotated file moved out of the directory cannot be drained; its tail is lost."""
+        log_path.write_text("one\n")
+        follower = LogFollower(log_path)
+        follower.read()
+        position = follower.position
+        follower.close()
+
+        _append(log_path, "two\n")
+        log_path.unlink()
+        log_path.write_text("b1\n")
+        resumed = LogFollower(log_path, position)
+        assert resumed.read() == ["b1"]
+        resumed.close()
+
+    def test_position_for_other_file_ignored(self, log_path):
+        log_path.write_text("one\ntwo\n")
+        resumed = LogFollower(log_path, FollowPosition(offset=4, line_number=1, device=0, inode=0))
+        assert resumed.read() == ["one", "two"]
+        resumed.close()
+
+
+class TestFollowParse:
+    """Tests for follow_parse."""
+
+    def test_parses_lines_written_while_following(self, log_path):
+        log_path.write_text("".join(f"INFO request {i} done\n" for i in range(20)))
+        patterns = learn_patterns(log_path)
+
+        def writer():
+            for i in range(20, 40):
+                _append(log_path, f"INFO request {i} done\n")
+                time.sleep(0.005)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        records = []
+        for batch, position in follow_parse(log_path, patterns, poll_interval=0.01, idle_timeout=0.5):
+            records.extend(batch)
+        thread.join()
+
+        assert [r.line_number for r in records] == list(range(1, 41))
+        assert all(r.matched for r in records)
+        assert position.line_number == 40
+        assert position.offset == log_path.stat().st_size
+
+    def test_stop_callback(self, log_path):
+        log_path.write_text("INFO request 1 done\n")
+        patterns = learn_patterns(log_path)
+        batches = list(follow_parse(log_path, patterns, poll_interval=0.01, stop=lambda: True))
+        assert batches == []
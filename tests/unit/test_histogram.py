@@ -0,0 +1,196 @@
+"""Tests for per-time-bucket pattern histograms."""
+import math
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from log_sculptor.core.histogram import (
+    PatternHistogram,
+    build_histogram,
+    chi_square_distance,
+    js_divergence,
+)
+from log_sculptor.core.patterns import learn_patterns, parse_logs
+from log_sculptor.core.streaming import stream_parse
+from log_sculptor.outputs.sqlite import write_histogram_sqlite
+
+START = datetime(2024, 1, 15, 10, 0, 0)
+
+
+def _write_log(path, switch_at=300, lines=600, per_second=2):
+    """INFO lines, then mostly WARN lines from switch_at on; one timestamp per per_second lines."""
+    with path.open("w") as f:
+        for i in range(lines):
+            ts = (START + timedelta(seconds=i // per_second)).strftime("%Y-%m-%d %H:%M:%S")
+            if i < switch_at or i % 10 == 0:
+                f.write(f"{ts} INFO request {i} took {i % 97}ms\n")
+            else:
+                f.write(f"{ts} WARN cache miss key=k{i}\n")
+
+
+class TestDivergences:
+    """Tests for js_divergence and chi_square_distance."""
+
+    def test_identical_distributions(self):
+        for divergence in (js_divergence, chi_square_distance):
+            assert divergence({"a": 10, "b": 5}, {"a": 20, "b": 10}) == pytest.approx(0.0)
+
+    def test_disjoint_distributions(self):
+        for divergence in (js_divergence, chi_square_distance):
+            assert divergence({"a": 10}, {"b": 3}) == pytest.approx(1.0)
+
+    def test_known_js_value(self):
+        # p = (1, 0), q = (1/2, 1/2), so m = (3/4, 1/4).
+        m = (0.75, 0.25)
+        expected = 0.5 * (1 * math.log2(1 / m[0])) + 0.5 * (
+            0.5 * math.log2(0.5 / m[0]) + 0.5 * math.log2(0.5 / m[1])
+        )
+        assert js_divergence({"a": 4}, {"a": 2, "b": 2}) == pytest.approx(expected)
+
+    def test_symmetric(self):
+        p, q = {"a": 7, "b": 1, None: 2}, {"a": 1, "c": 4}
+        for divergence in (js_divergence, chi_square_distance):
+            assert divergence(p, q) == pytest.approx(divergence(q, p))
+
+    def test_empty_histogram(self):
+        assert js_divergence({}, {"a": 1}) == 0.0
+        assert chi_square_distance({"a": 1}, {}) == 0.0
+
+
+class TestPatternHistogram:
+    """Tests for PatternHistogram."""
+
+    def test_buckets_by_minute(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file)
+        patterns = learn_patterns(log_file)
+        hist = build_histogram(log_file, patterns, bucket_seconds=60)
+
+        assert hist.records == 600
+        assert hist.untimed == 0
+        assert len(hist.buckets) == 5
+        assert all(sum(counts.values()) == 120 for counts in hist.buckets.values())
+        starts = [start for start, _, _ in hist.rows()]
+        assert starts == sorted(starts)
+        assert starts[0] == START.replace(tzinfo=timezone.utc)
+
+    def test_shift_detected_at_switch(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file, switch_at=360)
+        patterns = learn_patterns(log_file)
+        hist = build_histogram(log_file, patterns, bucket_seconds=60)
+        info, _ = patterns.match(f"{START:%Y-%m-%d %H:%M:%S} INFO request 1 took 2ms")
+        warn, _ = patterns.match(f"{START:%Y-%m-%d %H:%M:%S} WARN cache miss key=k1")
+
+        for method in ("js", "chi2"):
+            shifts = hist.shifts(threshold=0.3, method=method)
+            assert len(shifts) == 1, method
+            shift = shifts[0]
+            assert shift.bucket_start == (START + timedelta(minutes=3)).replace(tzinfo=timezone.utc)
+            assert (shift.old_pattern_id, shift.new_pattern_id) == (info.id, warn.id)
+        assert len(hist.divergences()) == len(hist.buckets) - 1
+
+    def test_lines_without_time_use_last_bucket(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        log_file.write_text(
+            "no time yet\n"
+            "2024-01-15 10:00:00 INFO start\n"
+            "    continuation line\n"
+            "2024-01-15 10:01:30 INFO next\n"
+        )
+        patterns = learn_patterns(log_file)
+        hist = build_histogram(log_file, patterns, bucket_seconds=60)
+        assert hist.untimed == 1
+        assert [sum(c.values()) for _, c in sorted(hist.buckets.items())] == [2, 1]
+
+    def test_out_of_order_and_merge(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file)
+        patterns = learn_patterns(log_file)
+        records = list(parse_logs(log_file, patterns, detect_types=False))
+
+        whole = PatternHistogram(patterns, 60)
+        whole.update_many(records)
+        first, second = PatternHistogram(patterns, 60), PatternHistogram(patterns, 60)
+        second.update_many(records[300:])
+        first.update_many(records[:300])
+        second.merge(first)
+        assert second.buckets == whole.buckets
+        assert second.records == whole.records
+
+        with pytest.raises(ValueError):
+            second.merge(PatternHistogram(patterns, 30))
+
+    def test_stream_parse_callback(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file)
+        patterns = learn_patterns(log_file)
+        hist = PatternHistogram(patterns, 60)
+        for _ in stream_parse(log_file, patterns, callback=hist):
+            pass
+        assert hist.buckets == build_histogram(log_file, patterns, 60).buckets
+
+    def test_invalid_arguments(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file, lines=10)
+        patterns = learn_patterns(log_file)
+        with pytest.raises(ValueError):
+            PatternHistogram(patterns, 0)
+        with pytest.raises(ValueError):
+            build_histogram(log_file, patterns).shifts(method="kl")
+
+
+class TestHistogramExport:
+    """Tests for histogram writers."""
+
+    def test_sqlite(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file)
+        patterns = learn_patterns(log_file)
+        hist = build_histogram(log_file, patterns, 60)
+        db = tmp_path / "hist.db"
+
+        rows = write_histogram_sqlite(hist, db)
+        # Rewriting replaces the table.
+        assert write_histogram_sqlite(hist, db) == rows
+        conn = sqlite3.connect(db)
+        stored = conn.execute("SELECT bucket_start, pattern_id, count FROM pattern_histogram").fetchall()
+        conn.close()
+        assert len(stored) == rows
+        assert sum(count for _, _, count in stored) == 600
+        assert stored[0][0] == "2024-01-15T10:00:00+00:00"
+
+    def test_parquet(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        from log_sculptor.outputs import write_histogram_parquet
+
+        log_file = tmp_path / "app.log"
+        _write_log(log_file)
+        patterns = learn_patterns(log_file)
+        hist = build_histogram(log_file, patterns, 60)
+        output = tmp_path / "hist.parquet"
+        rows = write_histogram_parquet(hist, output)
+        table = pq.read_table(output)
+        assert table.num_rows == rows
+        assert sum(table.column("count").to_pylist()) == 600
+
+    def test_sqlite_failure_closes_connection(self, tmp_path, monkeypatch):
+        from log_sculptor.exceptions import OutputError
+        from log_sculptor.outputs import sqlite as sqlite_output
+
+        log_file = tmp_path / "app.log"
+        _write_log(log_file, lines=10)
+        hist = build_histogram(log_file, learn_patterns(log_file), 60)
+        connections = []
+        connect = sqlite3.connect
+
+        def tracking_connect(*args, **kwargs):
+            connections.append(connect(*args, **kwargs))
+            return connections[-1]
+
+        monkeypatch.setattr(sqlite_output.sqlite3, "connect", tracking_connect)
+        with pytest.raises(OutputError):
+            write_histogram_sqlite(hist, tmp_path / "hist.db", table="bad name")
+        with pytest.raises(sqlite3.ProgrammingError):
+            connections[0].execute("SELECT 1")
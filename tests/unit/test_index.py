@@ -0,0 +1,104 @@
+"""Tests for the sparse line index."""
+import pytest
+
+from log_sculptor.core.index import LineIndex, iter_lines_from, load_index, read_line, sidecar_path
+from log_sculptor.core.patterns import learn_patterns
+from log_sculptor.core.reader import iter_lines
+from log_sculptor.core.streaming import stream_parse
+from log_sculptor.exceptions import LineIndexError
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"".join(b"INFO request %d done\n" % i for i in range(1, 101)))
+    return path
+
+
+class TestLineIndex:
+    """Tests for LineIndex."""
+
+    def test_build_offsets(self, log_file):
+        idx = LineIndex.build(log_file, interval=10)
+        lines = list(iter_lines(log_file))
+        assert idx.line_count == 100
+        assert len(idx.offsets) == 10
+        for k, offset in enumerate(idx.offsets):
+            assert next(iter_lines(log_file, start=offset)) == lines[k * 10]
+
+    def test_mixed_line_endings(self, tmp_path):
+        path = tmp_path / "mixed.log"
+        path.write_bytes(b"a\r\nb\rc\n\nd")
+        idx = LineIndex.build(path, interval=1, block_size=2)
+        assert idx.line_count == 5
+        assert idx.offsets == [0, 3, 5, 7, 8]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.log"
+        path.write_bytes(b"")
+        idx = LineIndex.build(path)
+        assert idx.line_count == 0
+        assert idx.offsets == []
+        assert idx.split(4) == []
+
+    def test_checkpoint(self, log_file):
+        idx = LineIndex.build(log_file, interval=10)
+        assert idx.checkpoint(1) == (1, 0)
+        assert idx.checkpoint(25) == (21, idx.offsets[2])
+        assert idx.checkpoint(10**6) == (91, idx.offsets[9])
+
+    def test_split_is_balanced_and_complete(self, log_file):
+        idx = LineIndex.build(log_file, interval=5)
+        ranges = idx.split(4)
+        assert len(ranges) == 4
+        assert ranges[0][1] == 0 and ranges[-1][2] == idx.size
+        lines = list(iter_lines(log_file))
+        for first, start, end in ranges:
+            assert next(iter_lines(log_file, start=start, end=end)) == lines[first - 1]
+        assert sum((list(iter_lines(log_file, start=s, end=e)) for _, s, e in ranges), []) == lines
+
+    def test_save_load_roundtrip(self, log_file, tmp_path):
+        idx = LineIndex.build(log_file, interval=10)
+        path = tmp_path / "app.idx"
+        idx.save(path)
+        assert LineIndex.load(path) == idx
+
+    def test_load_invalid(self, tmp_path):
+        path = tmp_path / "bad.idx"
+        path.write_text("not json")
+        with pytest.raises(LineIndexError):
+            LineIndex.load(path)
+
+
+class TestSidecar:
+    """Tests for sidecar lookup and seeking."""
+
+    def test_load_index_detects_stale(self, log_file):
+        idx = LineIndex.build(log_file, interval=10)
+        idx.save(sidecar_path(log_file))
+        assert load_index(log_file) == idx
+
+        with log_file.open("ab") as f:
+            f.write(b"INFO request 101 done\n")
+        assert load_index(log_file) is None
+
+    def test_iter_lines_from(self, log_file):
+        idx = LineIndex.build(log_file, interval=10)
+        numbered = list(iter_lines_from(log_file, 57, idx))
+        assert numbered[0] == (57, "INFO request 57 done")
+        assert numbered[-1] == (100, "INFO request 100 done")
+
+    def test_iter_lines_from_without_index(self, log_file):
+        assert next(iter_lines_from(log_file, 3)) == (3, "INFO request 3 done")
+
+    def test_read_line(self, log_file):
+        idx = LineIndex.build(log_file, interval=16)
+        assert read_line(log_file, 100, idx) == "INFO request 100 done"
+        assert read_line(log_file, 101, idx) is None
+
+    def test_stream_parse_start_line(self, log_file):
+        LineIndex.build(log_file, interval=10).save(sidecar_path(log_file))
+        patterns = learn_patterns(log_file)
+        records = list(stream_parse(log_file, patterns, start_line=95))
+        assert [r.line_number for r in records] == list(range(95, 101))
+        assert records[0].raw == "INFO request 95 done"
@@ -0,0 +1,88 @@
+"""Tests for literal-vs-variable detection."""
+from log_sculptor.core.literals import literal_groups, position_stats
+from log_sculptor.core.patterns import learn_patterns, parse_logs
+from log_sculptor.core.tokenizer import tokenize, TokenType
+
+
+def _members(lines):
+    return [(tokenize(line), line) for line in lines]
+
+
+class TestPositionStats:
+    """Tests for per-position statistics."""
+
+    def test_only_eligible_types(self):
+        rows = [[t for t in tokenize(line) if t.type != TokenType.WHITESPACE]
+                for line in ["user alice 42", "user bob 7"]]
+        stats = position_stats(rows)
+        # NUMBER position is never a literal candidate
+        assert set(stats) == {0, 1}
+        assert stats[0].cardinality == 1
+        assert stats[1].cardinality == 2
+
+
+class TestLiteralGroups:
+    """Tests for literal_groups."""
+
+    def test_constant_position_becomes_literal(self):
+        groups = literal_groups(_members(["user alice logged in", "user bob logged out"]))
+        assert len(groups) == 1
+        members, literals = groups[0]
+        assert len(members) == 2
+        assert literals == {0: "user", 2: "logged"}
+
+    def test_min_support(self):
+        groups = literal_groups(_members(["user alice"]), min_support=2)
+        assert groups[0][1] == {}
+
+    def test_split_low_cardinality(self):
+        lines = ["GET alice"] * 3 + ["POST bob"] * 3 + ["PUT carol"]
+        groups = literal_groups(_members(lines), max_values=3, min_support=2)
+        by_literal = {tuple(sorted(lits.items())): len(m) for m, lits in groups}
+        assert by_literal[((0, "GET"), (1, "alice"))] == 3
+        assert by_literal[((0, "POST"), (1, "bob"))] == 3
+        # Unsupported value stays in a residual group as a field
+        assert by_literal[()] == 1
+
+    def test_mixed_lengths_unchanged(self):
+        members = _members(["a b", "a b c"])
+        assert literal_groups(members) == [(members, {})]
+
+
+class TestLearnWithLiterals:
+    """Tests for learn_patterns(detect_literals=True)."""
+
+    def test_literals_in_pattern(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        log_file.write_text("".join(f"2024-01-15 10:00:{i:02d} user u{i} logged in\n" for i in range(10)))
+
+        patterns = learn_patterns(log_file, detect_literals=True)
+        assert len(patterns.patterns) == 1
+        literal_values = [e.value for e in patterns.patterns[0].elements
+                          if e.type == "literal" and e.token_type != TokenType.WHITESPACE]
+        assert literal_values == ["user", "logged", "in"]
+
+        records = list(parse_logs(log_file, patterns))
+        assert all(r.matched for r in records)
+        assert "user" in records[0].fields
+        assert records[0].fields["user"] == "u0"
+
+    def test_split_patterns_have_distinct_ids(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        log_file.write_text("INFO started worker\n" * 5 + "ERROR stopped worker\n" * 5)
+
+        patterns = learn_patterns(log_file, detect_literals=True, max_literal_values=2)
+        assert len(patterns.patterns) == 2
+        assert len({p.id for p in patterns.patterns}) == 2
+
+        records = list(parse_logs(log_file, patterns))
+        assert all(r.matched for r in records)
+        assert len({r.pattern_id for r in records}) == 2
+
+    def test_default_has_no_literals(self, tmp_path):
+        log_file = tmp_path / "app.log"
+        log_file.write_text("INFO started worker\n" * 5)
+
+        patterns = learn_patterns(log_file)
+        assert all(e.type == "field" for e in patterns.patterns[0].elements
+                   if e.token_type != TokenType.WHITESPACE)
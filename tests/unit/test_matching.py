@@ -0,0 +1,251 @@
+"""Tests for adaptive pattern matching."""
+import orjson
+import pytest
+
+from log_sculptor.core.matching import AdaptiveMatcher, CachingMatcher, MatchStats, SpanMatcher
+from log_sculptor.core.models import Pattern, PatternElement
+from log_sculptor.core.patterns import PatternSet, learn_patterns, parse_logs, _pattern_from_tokens
+from log_sculptor.core.tokenizer import tokenize, tokenize_bytes, tokenize_spans
+from log_sculptor.exceptions import OutputError
+
+
+def _literal_pattern(line: str, literals: dict[int, str]) -> Pattern:
+    return _pattern_from_tokens(tokenize(line), line, literals=literals)
+
+
+class TestMatchStats:
+    """Tests for MatchStats."""
+
+    def test_empty(self):
+        stats = MatchStats()
+        assert stats.avg_attempts == 0.0
+        assert stats.match_rate == 0.0
+
+    def test_to_dict_sorted_hits(self):
+        stats = MatchStats(lines=4, matched=3, attempts=6, hits={"a": 1, "b": 2})
+        data = stats.to_dict()
+        assert data["avg_attempts"] == 1.5
+        assert list(data["hits"]) == ["b", "a"]
+
+    def test_save(self, tmp_path):
+        path = tmp_path / "stats.json"
+        MatchStats(lines=1, matched=1, attempts=1, hits={"a": 1}).save(path)
+        assert orjson.loads(path.read_bytes())["hits"] == {"a": 1}
+
+    def test_save_with_cache(self, tmp_path):
+        from log_sculptor.core.matching import CacheStats
+
+        path = tmp_path / "stats.json"
+        MatchStats(lines=1).save(path, cache=CacheStats(lookups=4, exact_hits=3))
+        data = orjson.loads(path.read_bytes())
+        assert data["lines"] == 1
+        assert data["cache"]["hit_ratio"] == 0.75
+
+    def test_save_error(self):
+        with pytest.raises(OutputError):
+            MatchStats().save("/nonexistent/dir/stats.json")
+
+
+class TestAdaptiveMatcher:
+    """Tests for AdaptiveMatcher."""
+
+    def test_same_results_as_pattern_set(self, apache_log):
+        patterns = learn_patterns(apache_log, detect_literals=True, max_literal_values=3)
+        matcher = AdaptiveMatcher(patterns, reorder_interval=3)
+        with open(apache_log) as f:
+            lines = [line.rstrip("\n") for line in f if line.strip()]
+        for line in lines * 2:
+            assert matcher.match(line) == patterns.match(line)
+
+    def test_hot_pattern_moves_first(self):
+        ps = PatternSet()
+        ps.add(_literal_pattern("INFO started", {0: "INFO", 1: "started"}))
+        ps.add(_literal_pattern("INFO stopped", {0: "INFO", 1: "stopped"}))
+        matcher = AdaptiveMatcher(ps, reorder_interval=5)
+
+        for _ in range(10):
+            matcher.match("INFO stopped")
+        assert matcher.stats.reorders >= 1
+        attempts = matcher.stats.attempts
+        matcher.match("INFO stopped")
+        assert matcher.stats.attempts == attempts + 1
+
+    def test_overlapping_patterns_keep_priority(self):
+        ps = PatternSet()
+        specific = _literal_pattern("INFO started", {0: "INFO", 1: "started"})
+        generic = _pattern_from_tokens(tokenize("INFO anything"), "INFO anything")
+        ps.add(specific)
+        ps.add(generic)
+        matcher = AdaptiveMatcher(ps, reorder_interval=1)
+
+        for _ in range(20):
+            assert matcher.match("WARN other")[0] is generic
+        # generic is hotter, but must not shadow the more specific pattern
+        assert matcher.match("INFO started")[0] is specific
+
+    def test_signature_buckets_skip_other_shapes(self):
+        ps = PatternSet()
+        for line in ["a b c", "a b", "a"]:
+            ps.add(_pattern_from_tokens(tokenize(line), line))
+        matcher = AdaptiveMatcher(ps)
+        pattern, _ = matcher.match("x")
+        assert pattern is ps.patterns[2]
+        assert matcher.stats.attempts == 1
+
+    def test_wildcard_elements(self):
+        ps = PatternSet()
+        ps.add(Pattern(id="any", elements=[PatternElement(type="field", token_type=None, field_name="v")]))
+        matcher = AdaptiveMatcher(ps)
+        assert matcher.match("42") == (ps.patterns[0], {"v": "42"})
+        assert matcher.match("word") == (ps.patterns[0], {"v": "word"})
+
+    def test_no_match(self):
+        ps = PatternSet()
+        ps.add(_pattern_from_tokens(tokenize("INFO x"), "INFO x"))
+        matcher = AdaptiveMatcher(ps)
+        assert matcher.match("1 2 3") == (None, None)
+        assert matcher.stats.lines == 1
+        assert matcher.stats.matched == 0
+
+    def test_rebuilds_after_pattern_change(self):
+        ps = PatternSet()
+        matcher = AdaptiveMatcher(ps)
+        assert matcher.match("hello") == (None, None)
+        ps.add(_pattern_from_tokens(tokenize("hello"), "hello"))
+        assert matcher.match("hello")[0] is ps.patterns[0]
+
+    def test_signature_cache_bounded(self):
+        ps = PatternSet()
+        ps.add(_pattern_from_tokens(tokenize("x"), "x"))
+        matcher = AdaptiveMatcher(ps, max_signatures=2)
+        for line in ["a", "a b", "a b c", "a b c d"]:
+            matcher.match(line)
+        assert len(matcher._buckets) <= 2
+
+    def test_with_parse_logs(self, simple_log):
+        patterns = learn_patterns(simple_log)
+        matcher = AdaptiveMatcher(patterns)
+        records = list(parse_logs(simple_log, patterns, matcher=matcher))
+        assert matcher.stats.lines == len(records)
+        assert matcher.stats.matched == sum(1 for r in records if r.matched)
+        assert matcher.stats.avg_attempts >= 1.0
+
+
+class TestCachingMatcher:
+    """Tests for CachingMatcher."""
+
+    @pytest.fixture
+    def health_patterns(self, tmp_path):
+        log_file = tmp_path / "health.log"
+        log_file.write_text("".join(
+            f"2024-01-15 10:00:{i:02d} GET /health 200 {i}ms\n" for i in range(20)
+        ))
+        return learn_patterns(log_file)
+
+    def test_exact_hits(self, health_patterns):
+        cache = CachingMatcher(health_patterns)
+        line = "2024-01-15 10:00:00 GET /health 200 3ms"
+        first = cache.match(line)
+        second = cache.match(line)
+        assert first == second == health_patterns.match(line)
+        assert cache.stats.exact_hits == 1
+        assert cache.stats.hit_ratio == 0.5
+
+    def test_returned_fields_are_copies(self, health_patterns):
+        cache = CachingMatcher(health_patterns)
+        line = "2024-01-15 10:00:00 GET /health 200 3ms"
+        _, fields = cache.match(line)
+        fields.clear()
+        assert cache.match(line)[1]
+
+    def test_skeleton_hits(self, health_patterns):
+        cache = CachingMatcher(health_patterns, skeleton=True)
+        lines = [f"2024-01-15 10:00:{i:02d} GET /health 200 {i % 10}ms" for i in range(20)]
+        for line in lines:
+            assert cache.match(line) == health_patterns.match(line)
+        assert cache.stats.skeleton_hits == 19
+        assert cache.stats.exact_hits == 0
+
+    def test_skeleton_caches_misses(self, health_patterns):
+        cache = CachingMatcher(health_patterns, skeleton=True)
+        assert cache.match("unknown 1") == (None, None)
+        assert cache.match("unknown 2") == (None, None)
+        assert cache.stats.skeleton_hits == 1
+
+    def test_skeleton_disabled_with_digit_literals(self):
+        ps = PatternSet()
+        ps.add(_literal_pattern("status 200", {1: "200"}))
+        cache = CachingMatcher(ps, skeleton=True)
+        assert cache.match("status 200")[0] is ps.patterns[0]
+        assert cache.match("status 500") == (None, None)
+        assert cache.stats.skeleton_hits == 0
+
+    def test_lru_eviction(self, health_patterns):
+        cache = CachingMatcher(health_patterns, max_size=2)
+        for line in ["a", "b", "a", "c", "a"]:
+            cache.match(line)
+        assert "a" in cache._exact
+        assert "b" not in cache._exact
+        assert cache.stats.evictions == 1
+
+    def test_fifo_eviction(self, health_patterns):
+        cache = CachingMatcher(health_patterns, max_size=2, eviction="fifo")
+        for line in ["a", "b", "a", "c"]:
+            cache.match(line)
+        assert "a" not in cache._exact
+
+    def test_invalid_eviction(self, health_patterns):
+        with pytest.raises(ValueError):
+            CachingMatcher(health_patterns, eviction="random")
+
+    def test_invalidated_on_pattern_change(self):
+        ps = PatternSet()
+        cache = CachingMatcher(ps)
+        assert cache.match("hello") == (None, None)
+        ps.add(_pattern_from_tokens(tokenize("hello"), "hello"))
+        assert cache.match("hello")[0] is ps.patterns[0]
+
+    def test_wraps_adaptive_matcher(self, health_patterns, tmp_path):
+        adaptive = AdaptiveMatcher(health_patterns)
+        cache = CachingMatcher(health_patterns, matcher=adaptive)
+        for _ in range(3):
+            cache.match("2024-01-15 10:00:00 GET /health 200 3ms")
+        assert adaptive.stats.lines == 1
+        assert cache.stats.to_dict()["exact_hits"] == 2
+
+
+class TestSpanMatcher:
+    """Tests for SpanMatcher."""
+
+    @pytest.fixture
+    def patterns(self):
+        ps = PatternSet()
+        ps.add(_literal_pattern("user alice logged in", {0: "user", 2: "logged", 3: "in"}))
+        ps.add(_literal_pattern("user alice logged out", {0: "user", 2: "logged"}))
+        ps.add(_literal_pattern("GET /index 200", {}))
+        return ps
+
+    LINES = ["user bob logged in", "user bob logged out", "GET /x 404", "user bob left", "nothing 1 2"]
+
+    def test_matches_pattern_set(self, patterns):
+        matcher = SpanMatcher(patterns)
+        for line in self.LINES:
+            expected = patterns.match(line)
+            for spans in (tokenize_spans(line), tokenize_bytes(line.encode())):
+                pattern, offsets = matcher.match_spans(spans)
+                assert pattern is expected[0]
+                if pattern:
+                    assert {name: line[a:b] for name, a, b in offsets} == expected[1]
+
+    def test_non_ascii_literal_never_matches_bytes(self):
+        ps = PatternSet()
+        ps.add(_literal_pattern("caf\u00e9 open", {1: "\u00e9"}))
+        matcher = SpanMatcher(ps)
+        assert matcher.match_spans(tokenize_spans("caf\u00e9 open"))[0] is ps.patterns[0]
+        assert matcher.match_spans(tokenize_bytes(b"caf! open")) == (None, None)
+
+    def test_rebuilds_after_add(self, patterns):
+        matcher = SpanMatcher(patterns)
+        assert matcher.match_spans(tokenize_spans("nothing 1 2")) == (None, None)
+        patterns.add(_literal_pattern("nothing 1 2", {}))
+        assert matcher.match_spans(tokenize_spans("nothing 3 4"))[0] is patterns.patterns[-1]
@@ -142,3 +142,14 @@ class TestPattern:
         tokens = tokenize("INFO test")
         fields = pattern.match(tokens)
         assert fields is None
+
+    def test_pattern_match_spans(self, sample_pattern):
+        """Test span matching returns offsets consistent with match()."""
+        line = "ERROR happened"
+        tokens = tokenize(line)
+        spans = sample_pattern.match_spans(tokens)
+        fields = sample_pattern.match(tokens)
+
+        assert spans is not None
+        assert {name: line[start:end] for name, start, end in spans} == fields
+        assert sample_pattern.match_spans(tokenize("INFO")) is None
@@ -1,8 +1,13 @@
 """Tests for multi-line log handling."""
+from log_sculptor.core.patterns import PatternSet
+from log_sculptor.core.tokenizer import TokenType, token_signature, tokenize
 from log_sculptor.parsers.multiline import (
     ContinuationDetector,
+    LearnedEntryStart,
     MultilineJoiner,
     join_multiline,
+    join_multiline_numbered,
+    learn_entry_start,
 )
 
 
@@ -121,6 +126,30 @@ class TestJoinMultiline:
         assert "continuation" in result[0]
 
 
+class TestJoinNumbered:
+    """Tests for numbered joining."""
+
+    def test_entries_keep_first_line_number(self):
+        lines = [
+            "2024-01-15 ERROR Failed",
+            "java.lang.NullPointerException",
+            "    at Service.process()",
+            "2024-01-15 INFO Next entry",
+            "2024-01-15 INFO Last",
+            "    detail",
+        ]
+        result = list(join_multiline_numbered(iter(lines), separator=" "))
+        assert [n for n, _ in result] == [1, 4, 5]
+        assert result[0][1] == "2024-01-15 ERROR Failed java.lang.NullPointerException     at Service.process()"
+
+    def test_matches_join_lines(self):
+        lines = ["first"] + [f"    line{i}" for i in range(30)] + ["2024-01-15 next", "    more"]
+        joiner = MultilineJoiner(max_lines=10)
+        numbered = list(joiner.join_numbered(iter(lines), start=100))
+        assert [entry for _, entry in numbered] == list(joiner.join_lines(iter(lines)))
+        assert [n for n, _ in numbered] == [100, 131]
+
+
 class TestBracketCounting:
     """Tests for bracket tracking in ContinuationDetector."""
 
@@ -145,3 +174,141 @@ class TestBracketCounting:
         detector = ContinuationDetector()
         assert detector._count_brackets('{"key": "value"}') == 0
         assert detector._count_brackets('{"key": "{nested}"') == 1
+
+
+def _reference_count_brackets(line: str) -> int:
+    """Character-by-character bracket counter the fast path must agree with."""
+    depth = 0
+    in_string = False
+    string_char = None
+    for i, char in enumerate(line):
+        if char in '"\'':
+            if not in_string:
+                in_string = True
+                string_char = char
+            elif char == string_char and (i == 0 or line[i-1] != '\\'):
+                in_string = False
+                string_char = None
+            continue
+        if in_string:
+            continue
+        if char in '({[':
+            depth += 1
+        elif char in ')}]':
+            depth -= 1
+    return depth
+
+
+class TestFastPathEquivalence:
+    """The compiled fast paths must not change any decision."""
+
+    def test_count_brackets_matches_reference(self):
+        import random
+        rng = random.Random(42)
+        alphabet = '(){}[]"\'\\ ax'
+        detector = ContinuationDetector()
+        for _ in range(20000):
+            line = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+            assert detector._count_brackets(line) == _reference_count_brackets(line), line
+
+    def test_timestamp_prefix_cache_matches_uncached(self):
+        from log_sculptor.types.timestamp import is_likely_timestamp
+        detector = ContinuationDetector()
+        lines = [
+            "2024-01-15 10:00:00 INFO start",
+            "2024-01-15T10:00:00.123Z ERROR",
+            "[2024-01-15T10:00:00] WARN",
+            "15/Jan/2024:10:00:00 +0000 GET",
+            "1705312800 event",
+            "1705312800123 event",
+            "12345 not a timestamp",
+            "Caused by: java.io.IOException",
+            "at com.example.Main.main(Main.java:10)",
+            "01/15/2024 date first",
+            "",
+            "- dash",
+        ]
+        for _ in range(2):
+            for line in lines:
+                word = line.split(" ")[0].strip("[]") if line else ""
+                expected = bool(line) and (line[0].isdigit() or line[0].isalpha()) and is_likely_timestamp(word)
+                assert detector._has_timestamp_prefix(line) == expected, line
+
+    def test_java_log_joins_identically(self):
+        lines = []
+        for i in range(200):
+            lines.append(f"2024-01-15 10:{i % 60:02d}:00 ERROR [main] Request {i} failed: {{\"id\": \"{i}(\"}}")
+            if i % 3 == 0:
+                lines.append("java.lang.IllegalStateException: bad state [")
+                lines.extend(f"\tat com.example.Service.method{j}(Service.java:{j})" for j in range(5))
+                lines.append("]")
+                lines.append("Caused by: java.io.IOException: 'quoted ( text'")
+        joined = list(join_multiline(iter(lines)))
+        assert len(joined) == 200
+        assert all(entry.startswith("2024-01-15") for entry in joined)
+
+
+JAVA_LOG = [
+    "2024-01-15 10:00:00 INFO Application started",
+    "2024-01-15 10:00:01 ERROR Failed to process request",
+    "java.lang.NullPointerException: Cannot invoke method on null",
+    "\tat com.example.Service.process(Service.java:42)",
+    "Caused by: java.io.IOException: Connection reset",
+    "\t... 5 more",
+    "2024-01-15 10:00:02 INFO Recovered",
+]
+
+
+class TestLearnedEntryStart:
+    """Tests for learned entry-start signatures."""
+
+    def test_learns_dominant_prefix(self):
+        entry_start = learn_entry_start(JAVA_LOG)
+        assert entry_start.prefix == (TokenType.TIMESTAMP, TokenType.WORD, TokenType.WORD)
+        assert entry_start.coverage == round(3 / 7, 4)
+
+    def test_joins_entries(self):
+        joiner = MultilineJoiner(detector=learn_entry_start(JAVA_LOG), separator=" | ")
+        numbered = list(joiner.join_numbered(JAVA_LOG))
+        assert [n for n, _ in numbered] == [1, 2, 7]
+        assert numbered[1][1].endswith("\t... 5 more")
+
+    def test_unindented_lines_without_timestamp_need_signature(self):
+        # The heuristics treat every line as a continuation of the first.
+        lines = ["INFO 2024-01-15 10:00:00 started", "WARN 2024-01-15 10:00:01 slow", "plain text"]
+        assert len(list(join_multiline(iter(lines)))) == 1
+        entry_start = learn_entry_start(lines, min_share=0.6)
+        assert entry_start.prefix == (TokenType.WORD, TokenType.TIMESTAMP, TokenType.WORD)
+        entries = list(join_multiline_numbered(iter(lines), entry_start=entry_start))
+        assert [n for n, _ in entries] == [1, 2]
+
+    def test_no_unindented_lines(self):
+        assert learn_entry_start(["    indented", "", "\tmore"]) is None
+
+    def test_is_start_agrees_with_tokenizer(self):
+        import random
+        rng = random.Random(7)
+        parts = ["2024-01-15 10:00:00", "10.0.0.1", '"q"', "[x]", "(y)", "12", "-3.5", "abc",
+                 "Jan  5 10:00:00", ":", " ", "\t", "\u00e9", "_a", "{", "x-y", "5a"]
+        prefixes = [
+            (TokenType.TIMESTAMP,),
+            (TokenType.NUMBER, TokenType.PUNCT),
+            (TokenType.WORD, TokenType.BRACKET, TokenType.NUMBER),
+            (TokenType.PUNCT,),
+            (TokenType.IP, TokenType.QUOTED),
+        ]
+        for _ in range(5000):
+            line = "".join(rng.choice(parts) for _ in range(rng.randint(1, 6)))
+            tokens = tokenize(line)
+            indented = tokens[0].type == TokenType.WHITESPACE
+            for prefix in prefixes:
+                expected = not indented and token_signature(tokens)[:len(prefix)] == prefix
+                assert LearnedEntryStart(prefix).is_start(line) == expected, (line, prefix)
+
+    def test_roundtrip_in_pattern_file(self, tmp_path):
+        path = tmp_path / "patterns.json"
+        PatternSet(entry_start=learn_entry_start(JAVA_LOG)).save(path)
+        assert PatternSet.load(path).entry_start == learn_entry_start(JAVA_LOG)
+
+        PatternSet().save(path)
+        assert PatternSet.load(path).entry_start is None
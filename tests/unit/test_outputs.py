@@ -2,8 +2,9 @@
 import pytest
 import sqlite3
 
+from log_sculptor.exceptions import OutputError
 from log_sculptor.core.patterns import learn_patterns, parse_logs, ParsedRecord
-from log_sculptor.outputs.sqlite import write_sqlite
+from log_sculptor.outputs.sqlite import SqliteWriter, write_sqlite
 from log_sculptor.outputs.jsonl import write_jsonl
 from log_sculptor.testing.generators import write_sample_logs
 
@@ -249,3 +250,54 @@ class TestSQLiteEdgeCases:
 
         count = write_sqlite(records, output, patterns=patterns, include_typed=False)
         assert count == len(records)
+
+
+class TestSqliteWriter:
+    """Tests for the incremental SQLite writer."""
+
+    def _records(self, numbers, tag):
+        return [ParsedRecord(n, f"{tag} {n}", {"value": str(n)}, "p1", True) for n in numbers]
+
+    def _raws(self, output):
+        conn = sqlite3.connect(output)
+        try:
+            return [row[0] for row in conn.execute("SELECT raw FROM logs ORDER BY rowid")]
+        finally:
+            conn.close()
+
+    def test_line_numbers_restart_after_rotation(self, tmp_path):
+        """Test records from a rotated file (line numbers from 1 again) are all kept."""
+        output = tmp_path / "out.db"
+        writer = SqliteWriter(output)
+        assert writer.write(self._records([1, 2, 3], "old")) == 3
+        assert writer.write(self._records([1, 2], "new")) == 2
+        writer.close()
+
+        assert self._raws(output) == ["old 1", "old 2", "old 3", "new 1", "new 2"]
+
+    def test_resume_after_rotation_drops_unflushed_rows(self, tmp_path):
+        """Test resuming drops exactly the rows written after the last flush."""
+        output = tmp_path / "out.db"
+        writer = SqliteWriter(output)
+        writer.write(self._records([1, 2, 3], "old"))
+        writer.write(self._records([1], "new"))
+        state = writer.flush()
+        # Written but not checkpointed before a crash.
+        writer.write(self._records([2, 3], "new"))
+        writer.close()
+
+        resumed = SqliteWriter(output, state=state)
+        resumed.write(self._records([2], "new"))
+        resumed.close()
+        assert self._raws(output) == ["old 1", "old 2", "old 3", "new 1", "new 2"]
+
+    def test_resume_state_without_rowid(self, tmp_path):
+        """Test state without a rowid is rejected rather than guessed at."""
+        output = tmp_path / "out.db"
+        writer = SqliteWriter(output)
+        writer.write(self._records([1, 2], "a"))
+        writer.close()
+
+        with pytest.raises(OutputError, match="invalid writer state"):
+            SqliteWriter(output, state={"columns": {}, "line_number": 2})
+        assert len(self._raws(output)) == 2
@@ -193,6 +193,34 @@ class TestParseLogsEdgeCases:
         assert records[0].typed_fields is None
 
 
+class TestInMemorySources:
+    """Tests for learning and parsing from line iterables."""
+
+    def test_iterable_matches_file(self, tmp_path):
+        """Test a list of lines behaves like the file it came from."""
+        lines = ["INFO user alice logged in", "", "WARN disk 91% full", "INFO user bob logged in"]
+        file = tmp_path / "test.log"
+        file.write_text("\n".join(lines) + "\n")
+
+        from_file = learn_patterns(file)
+        from_lines = learn_patterns(iter(lines))
+        assert [p.to_dict() for p in from_lines.patterns] == [p.to_dict() for p in from_file.patterns]
+        assert list(parse_logs(iter(lines), from_lines)) == list(parse_logs(file, from_file))
+
+    def test_numbered_pairs_keep_line_numbers(self):
+        """Test (line_number, line) pairs keep their numbers."""
+        entries = [(1, "INFO start"), (7, "INFO stop")]
+        patterns = learn_patterns(entries)
+        records = list(parse_logs(iter(entries), patterns))
+        assert [r.line_number for r in records] == [1, 7]
+        assert [r.raw for r in records] == ["INFO start", "INFO stop"]
+
+    def test_empty_iterable(self):
+        """Test an empty source gives no patterns or records."""
+        assert learn_patterns([]).patterns == []
+        assert list(parse_logs(iter([]), PatternSet())) == []
+
+
 class TestPatternSetUpdate:
     """Tests for PatternSet.update method."""
 
@@ -253,3 +281,118 @@ class TestGeneratePatternId:
         id1 = _generate_pattern_id(elements1)
         id2 = _generate_pattern_id(elements2)
         assert id1 != id2
+
+
+class TestNegativeMatchCache:
+    """Tests for the unmatched-signature cache in PatternSet.match."""
+
+    @pytest.fixture
+    def pattern_set(self):
+        line = "INFO started"
+        ps = PatternSet()
+        ps.add(_pattern_from_tokens(tokenize(line), line, literals={0: "INFO"}))
+        return ps
+
+    def test_structural_miss_is_cached(self, pattern_set, monkeypatch):
+        assert pattern_set.match("count 1 2 3") == (None, None)
+        assert len(pattern_set._negative) == 1
+
+        calls = []
+        original = Pattern.match
+        monkeypatch.setattr(Pattern, "match", lambda self, tokens: calls.append(1) or original(self, tokens))
+        assert pattern_set.match("total 4 5 6") == (None, None)
+        assert calls == []
+
+    def test_literal_miss_not_cached(self, pattern_set):
+        assert pattern_set.match("WARN started") == (None, None)
+        assert len(pattern_set._negative) == 0
+        pattern, fields = pattern_set.match("INFO stopped")
+        assert pattern is pattern_set.patterns[0]
+        assert "stopped" in fields.values()
+
+    def test_invalidated_on_add(self, pattern_set):
+        line = "count 1 2 3"
+        assert pattern_set.match(line) == (None, None)
+        pattern_set.add(_pattern_from_tokens(tokenize(line), line))
+        pattern, _ = pattern_set.match("total 4 5 6")
+        assert pattern is pattern_set.patterns[-1]
+
+    def test_bounded(self, pattern_set, monkeypatch):
+        import log_sculptor.core.patterns as patterns_module
+        monkeypatch.setattr(patterns_module, "NEGATIVE_CACHE_SIZE", 2)
+        for line in ["1", "1 2", "1 2 3", "1 2 3 4"]:
+            pattern_set.match(line)
+        assert len(pattern_set._negative) == 2
+
+    def test_concurrent_match(self, monkeypatch):
+        """Threads sharing one PatternSet get the same results as a serial run."""
+        import sys
+        import threading
+
+        import log_sculptor.core.patterns as patterns_module
+        monkeypatch.setattr(patterns_module, "NEGATIVE_CACHE_SIZE", 8)
+        interval = sys.getswitchinterval()
+
+        def build():
+            ps = PatternSet()
+            for i in range(40):
+                line = f"svc{i} started 1"
+                ps.add(_pattern_from_tokens(tokenize(line), line, literals={0: f"svc{i}"}))
+            return ps
+
+        lines = [f"svc{i % 40} started {i}" for i in range(200)]
+        lines += [" ".join(str(n) for n in range(k)) for k in range(1, 30)]
+        expected = [(p.id if p else None, f) for p, f in map(build().match, lines)]
+
+        shared = build()
+        results, errors = [], []
+        stop = threading.Event()
+
+        def invalidator():
+            # Force the derived structures to be rebuilt while others match.
+            while not stop.is_set():
+                shared.invalidate()
+
+        def worker(offset):
+            try:
+                order = lines[offset:] + lines[:offset]
+                for _ in range(20):
+                    got = [(p.id if p else None, f) for p, f in map(shared.match, order)]
+                    results.append(got[len(lines) - offset:] + got[:len(lines) - offset])
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        try:
+            sys.setswitchinterval(1e-6)
+            threads = [threading.Thread(target=worker, args=(k * 29,)) for k in range(8)]
+            churn = threading.Thread(target=invalidator)
+            churn.start()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            stop.set()
+            churn.join()
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+        assert len(results) == 8 * 20
+        assert all(r == expected for r in results)
+        assert len(shared._negative) <= 8 + 8
+
+    def test_entry_evicted_by_another_thread(self, pattern_set):
+        """A signature evicted between the membership check and its use is not an error."""
+        from collections import OrderedDict
+
+        class RacingCache(OrderedDict):
+            # Another thread evicts the entry right after it is found.
+            def __contains__(self, key):
+                found = super().__contains__(key)
+                if found:
+                    self.pop(key)
+                return found
+
+        assert pattern_set.match("count 1 2 3") == (None, None)
+        pattern_set._negative = RacingCache(pattern_set._negative)
+        assert pattern_set.match("total 4 5 6") == (None, None)
@@ -0,0 +1,101 @@
+"""Tests for literal-anchor prefiltering."""
+import pytest
+
+import log_sculptor.core.patterns as patterns_module
+from log_sculptor.core.models import Pattern, PatternElement
+from log_sculptor.core.patterns import PatternSet, _pattern_from_tokens
+from log_sculptor.core.prefilter import AhoCorasick, LiteralPrefilter, pattern_anchors
+from log_sculptor.core.tokenizer import tokenize, TokenType
+
+
+def _literal_pattern(line: str, literals: dict[int, str]) -> Pattern:
+    return _pattern_from_tokens(tokenize(line), line, literals=literals)
+
+
+class TestAhoCorasick:
+    """Tests for the Aho-Corasick automaton."""
+
+    def test_find_all(self):
+        ac = AhoCorasick(["he", "she", "his", "hers"])
+        found = ac.find_all("ushers")
+        assert {ac.keywords[i] for i in found} == {"he", "she", "hers"}
+
+    def test_iter_matches_overlapping(self):
+        ac = AhoCorasick(["aa"])
+        assert [end for end, _ in ac.iter_matches("aaaa")] == [2, 3, 4]
+
+    def test_no_match(self):
+        ac = AhoCorasick(["error"])
+        assert ac.find_all("all good") == set()
+
+    def test_duplicate_keyword_same_id(self):
+        ac = AhoCorasick()
+        assert ac.add("GET") == ac.add("GET")
+        assert len(ac) == 1
+
+    def test_add_after_search(self):
+        ac = AhoCorasick(["abc"])
+        assert ac.find_all("xabcx") == {0}
+        ac.add("bcx")
+        assert ac.find_all("xabcx") == {0, 1}
+
+    def test_empty_keyword_rejected(self):
+        with pytest.raises(ValueError):
+            AhoCorasick([""])
+
+
+class TestLiteralPrefilter:
+    """Tests for LiteralPrefilter."""
+
+    def test_pattern_anchors(self):
+        pattern = _literal_pattern("user alice logged in", {0: "user", 2: "logged", 3: "in"})
+        assert pattern_anchors(pattern) == {"user", "logged", "in"}
+        assert pattern_anchors(pattern, min_length=3) == {"user", "logged"}
+
+    def test_candidates_require_all_anchors(self):
+        login = _literal_pattern("user alice logged in", {0: "user", 2: "logged", 3: "in"})
+        logout = _literal_pattern("user alice logged out", {0: "user", 2: "logged", 3: "out"})
+        prefilter = LiteralPrefilter([login, logout])
+
+        assert prefilter.candidates("user bob logged out") == [logout]
+        assert prefilter.candidates("disk full") == []
+
+    def test_unanchored_always_candidates_in_order(self):
+        generic = Pattern(id="g", elements=[PatternElement(type="field", token_type=TokenType.WORD, field_name="w")])
+        specific = _literal_pattern("started", {0: "started"})
+        prefilter = LiteralPrefilter([specific, generic])
+
+        assert prefilter.candidates("started") == [specific, generic]
+        assert prefilter.candidates("stopped") == [generic]
+        assert prefilter.anchored_count == 1
+
+
+class TestPatternSetPrefilter:
+    """Tests for prefilter use in PatternSet.match."""
+
+    @pytest.fixture
+    def many_patterns(self):
+        ps = PatternSet()
+        for i in range(100):
+            line = f"INFO component{i} handled request for user{i}"
+            ps.add(_literal_pattern(line, {1: f"component{i}", 2: "handled", 3: "request", 4: "for"}))
+        return ps
+
+    def test_same_result_as_linear_scan(self, many_patterns, monkeypatch):
+        lines = [f"INFO component{i} handled request for someone{i}" for i in range(0, 100, 7)]
+        lines.append("INFO unknown handled request for nobody")
+
+        with_prefilter = [many_patterns.match(line) for line in lines]
+        monkeypatch.setattr(patterns_module, "PREFILTER_MIN_PATTERNS", 10**9)
+        linear = [many_patterns.match(line) for line in lines]
+
+        assert with_prefilter == linear
+        assert with_prefilter[-1] == (None, None)
+        assert "someone0" in with_prefilter[0][1].values()
+
+    def test_rebuilt_after_add(self, many_patterns):
+        line = "WARN disk nearly full"
+        assert many_patterns.match(line) == (None, None)
+        many_patterns.add(_literal_pattern(line, {1: "disk"}))
+        pattern, _ = many_patterns.match(line)
+        assert pattern is many_patterns.patterns[-1]
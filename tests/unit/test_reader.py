@@ -0,0 +1,66 @@
+"""Tests for the block line reader."""
+from log_sculptor.core.reader import iter_line_batches, iter_line_blocks, iter_lines, read_blocks
+
+
+def _text_mode_lines(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return [line.rstrip("\r\n") for line in f]
+
+
+class TestReadBlocks:
+    """Tests for raw block reading."""
+
+    def test_blocks_cover_file(self, tmp_path):
+        path = tmp_path / "data.log"
+        path.write_bytes(b"0123456789")
+        for use_mmap in (False, True):
+            blocks = list(read_blocks(path, block_size=4, use_mmap=use_mmap))
+            assert blocks == [b"0123", b"4567", b"89"]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.log"
+        path.write_bytes(b"")
+        assert list(read_blocks(path)) == []
+        assert list(read_blocks(path, use_mmap=True)) == []
+
+
+class TestIterLines:
+    """Tests for block-based line iteration."""
+
+    CONTENT = "first\r\nsecond\rthird\n\ncafé   x\fy\nbad \udcff\nlast".encode("utf-8", "surrogateescape")
+
+    def test_same_as_text_mode(self, tmp_path):
+        """Test lines match text-mode iteration for any block size."""
+        path = tmp_path / "mixed.log"
+        path.write_bytes(self.CONTENT)
+        expected = _text_mode_lines(path)
+        assert expected[:4] == ["first", "second", "third", ""]
+        for block_size in (1, 2, 3, 5, 64):
+            for use_mmap in (False, True):
+                assert list(iter_lines(path, block_size=block_size, use_mmap=use_mmap)) == expected
+
+    def test_crlf_split_across_blocks(self, tmp_path):
+        path = tmp_path / "crlf.log"
+        path.write_bytes(b"ab\r\ncd\r\n")
+        assert list(iter_line_blocks(path, block_size=3)) == [["ab"], ["cd"]]
+
+    def test_trailing_line_without_newline(self, tmp_path):
+        path = tmp_path / "tail.log"
+        path.write_bytes(b"one\ntwo")
+        assert list(iter_lines(path, block_size=2)) == ["one", "two"]
+
+
+class TestIterLineBatches:
+    """Tests for fixed-size line batches."""
+
+    def test_batch_sizes(self, tmp_path):
+        path = tmp_path / "many.log"
+        path.write_text("".join(f"line {i}\n" for i in range(25)))
+        batches = list(iter_line_batches(path, batch_size=10, block_size=16))
+        assert [len(b) for b in batches] == [10, 10, 5]
+        assert sum(batches, []) == [f"line {i}" for i in range(25)]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.log"
+        path.write_text("")
+        assert list(iter_line_batches(path, batch_size=10)) == []
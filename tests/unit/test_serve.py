@@ -0,0 +1,144 @@
+"""Tests for the ingestion server and rolling sink."""
+import asyncio
+import socket
+
+import orjson
+import pytest
+
+from log_sculptor.core.patterns import learn_patterns
+from log_sculptor.core.serve import LogServer, ServeStats
+from log_sculptor.outputs.rolling import RollingSink
+
+LINES = [f"INFO request {i} done in {i * 3}ms" for i in range(1, 61)]
+
+
+@pytest.fixture
+def patterns(tmp_path):
+    path = tmp_path / "train.log"
+    path.write_text("\n".join(LINES) + "\n")
+    return learn_patterns(path)
+
+
+def _read_segments(sink):
+    records = []
+    for segment in sink.segments:
+        records.extend(orjson.loads(line) for line in segment.read_bytes().splitlines())
+    return records
+
+
+async def _wait_parsed(server, count, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while server.stats.parsed < count and loop.time() < deadline:
+        await asyncio.sleep(0.01)
+
+
+class TestRollingSink:
+    """Tests for RollingSink."""
+
+    def test_rolls_by_record_count(self, tmp_path, patterns):
+        from log_sculptor.core.aio import parse_batch
+
+        sink = RollingSink(tmp_path / "out.jsonl", roll_records=25)
+        records = parse_batch(patterns, LINES, 1)
+        assert sink.write(records[:10]) == 10
+        assert sink.write(records[10:]) == 50
+        sink.close()
+
+        assert [p.name for p in sink.segments] == ["out-00000.jsonl", "out-00001.jsonl", "out-00002.jsonl"]
+        assert [len(p.read_bytes().splitlines()) for p in sink.segments] == [25, 25, 10]
+        assert [r["line_number"] for r in _read_segments(sink)] == list(range(1, 61))
+
+    def test_restart_continues_numbering(self, tmp_path, patterns):
+        """Test a new sink starts after existing segments instead of overwriting them."""
+        from log_sculptor.core.aio import parse_batch
+
+        records = parse_batch(patterns, LINES, 1)
+        first = RollingSink(tmp_path / "out.jsonl", roll_records=25)
+        first.write(records[:30])
+        first.close()
+        (tmp_path / "out-notes.jsonl").write_text("unrelated\n")
+
+        second = RollingSink(tmp_path / "out.jsonl", roll_records=25)
+        second.write(records[30:])
+        second.close()
+
+        assert [p.name for p in second.segments] == ["out-00002.jsonl", "out-00003.jsonl"]
+        assert [r["line_number"] for r in _read_segments(first) + _read_segments(second)] == list(range(1, 61))
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            RollingSink(tmp_path / "out.db", "sqlite")
+
+
+class TestLogServer:
+    """Tests for LogServer."""
+
+    def test_tcp_and_udp_ingestion(self, tmp_path, patterns):
+        sink = RollingSink(tmp_path / "out.jsonl", roll_records=1000)
+        server = LogServer(patterns, sink, tcp=("127.0.0.1", 0), udp=("127.0.0.1", 0), flush_interval=0.05)
+
+        async def main():
+            await server.start()
+            host, port = server.addresses["tcp"]
+            reader, writer = await asyncio.open_connection(host, port)
+            payload = "".join(f"<14>{line}\n" for line in LINES[:40]).encode()
+            writer.write(payload)
+            await writer.drain()
+            writer.close()
+
+            udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            for line in LINES[40:]:
+                udp.sendto(line.encode(), server.addresses["udp"])
+            udp.close()
+
+            await _wait_parsed(server, len(LINES))
+            await server.stop()
+
+        asyncio.run(main())
+        records = _read_segments(sink)
+        assert server.stats.parsed == len(LINES)
+        assert server.stats.matched == len(LINES)
+        assert server.stats.dropped == 0
+        assert all(r["matched"] for r in records)
+        assert [r["line_number"] for r in records] == list(range(1, 61))
+
+    def test_full_queue_drops_datagrams(self, tmp_path, patterns):
+        sink = RollingSink(tmp_path / "out.jsonl")
+        server = LogServer(patterns, sink, udp=("127.0.0.1", 0), queue_size=3)
+
+        async def main():
+            await server.start()
+            # No await between offers, so the consumer cannot drain the queue.
+            for line in LINES[:10]:
+                server._offer(line)
+            await server.stop()
+
+        asyncio.run(main())
+        assert server.stats.received == 10
+        assert server.stats.dropped == 7
+        assert server.stats.parsed == 3
+
+    def test_priority_stripped(self, tmp_path, patterns):
+        server = LogServer(patterns, RollingSink(tmp_path / "out.jsonl"), udp=("127.0.0.1", 0))
+        assert server._prepare("<134>INFO x\r\n") == "INFO x"
+        server.strip_priority = False
+        assert server._prepare("<134>INFO x") == "<134>INFO x"
+
+    def test_requires_listener(self, tmp_path, patterns):
+        with pytest.raises(ValueError):
+            LogServer(patterns, RollingSink(tmp_path / "out.jsonl"))
+
+
+class TestServeStats:
+    """Tests for ServeStats."""
+
+    def test_latency_summary(self):
+        stats = ServeStats()
+        for ms in range(1, 101):
+            stats.record_latency(ms / 1000)
+        stats.parsed = 100
+        data = stats.to_dict()
+        assert data["latency_ms"]["max"] == 100.0
+        assert data["latency_ms"]["p50"] == 51.0
+        assert data["latency_ms"]["avg"] == 50.5
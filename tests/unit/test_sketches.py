@@ -0,0 +1,206 @@
+"""Tests for probabilistic sketches."""
+import bisect
+import random
+from collections import Counter
+
+import pytest
+
+from log_sculptor.core.sketches import HyperLogLog, CardinalityCounter, SpaceSaving, TDigest
+
+
+class TestHyperLogLog:
+    """Tests for HyperLogLog."""
+
+    def test_empty(self):
+        assert HyperLogLog().count() == 0
+
+    def test_estimate_within_error(self):
+        hll = HyperLogLog(precision=12)
+        for i in range(20000):
+            hll.add(f"value-{i}")
+        assert abs(hll.count() - 20000) / 20000 < 0.05
+
+    def test_duplicates_not_counted(self):
+        hll = HyperLogLog()
+        for _ in range(1000):
+            hll.add("same")
+        assert hll.count() == 1
+
+    def test_merge(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(5000):
+            a.add(str(i))
+            b.add(str(i + 2500))
+        a.merge(b)
+        assert abs(a.count() - 7500) / 7500 < 0.05
+
+    def test_merge_precision_mismatch(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+    def test_invalid_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=2)
+
+
+class TestCardinalityCounter:
+    """Tests for CardinalityCounter."""
+
+    def test_exact_counts(self):
+        counter = CardinalityCounter(exact_limit=10)
+        for value in ["GET", "POST", "GET"]:
+            counter.add(value)
+        assert counter.exact
+        assert counter.cardinality == 2
+        assert counter.counts == {"GET": 2, "POST": 1}
+        assert counter.total == 3
+
+    def test_switches_to_sketch(self):
+        counter = CardinalityCounter(exact_limit=10)
+        for i in range(1000):
+            counter.add(str(i))
+        assert not counter.exact
+        assert counter.counts is None
+        assert abs(counter.cardinality - 1000) / 1000 < 0.05
+
+    def test_merge_exact(self):
+        a, b = CardinalityCounter(), CardinalityCounter()
+        a.add("x")
+        b.add("x")
+        b.add("y")
+        a.merge(b)
+        assert a.counts == {"x": 2, "y": 1}
+        assert a.total == 3
+
+    def test_merge_exact_into_sketch(self):
+        a, b = CardinalityCounter(exact_limit=5), CardinalityCounter(exact_limit=5)
+        for i in range(100):
+            a.add(str(i))
+        b.add("new")
+        a.merge(b)
+        assert not a.exact
+        assert a.total == 101
+        assert 95 <= a.cardinality <= 106
+
+    def test_merge_overflows_limit(self):
+        a, b = CardinalityCounter(exact_limit=3), CardinalityCounter(exact_limit=3)
+        for v in "ab":
+            a.add(v)
+        for v in "cd":
+            b.add(v)
+        a.merge(b)
+        assert not a.exact
+        assert a.cardinality == 4
+
+
+def _zipf_values(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [str(int(rng.paretovariate(1.2))) for _ in range(n)]
+
+
+class TestSpaceSaving:
+    """Tests for SpaceSaving."""
+
+    def test_exact_under_capacity(self):
+        sketch = SpaceSaving(capacity=10)
+        for value in ["a", "b", "a", "c", "a", "b"]:
+            sketch.add(value)
+        assert sketch.top() == [("a", 3, 0), ("b", 2, 0), ("c", 1, 0)]
+        assert sketch.top(1) == [("a", 3, 0)]
+        assert sketch.total == 6
+
+    def test_heavy_hitters_on_skewed_stream(self):
+        values = _zipf_values(50_000)
+        sketch = SpaceSaving(capacity=40)
+        for value in values:
+            sketch.add(value)
+        exact = Counter(values)
+        top = sketch.top(5)
+        assert [v for v, _, _ in top] == [v for v, _ in exact.most_common(5)]
+        for value, count, error in sketch.top():
+            # Counts overestimate by at most the recorded error.
+            assert count - error <= exact[value] <= count
+
+    def test_bounded_state(self):
+        sketch = SpaceSaving(capacity=16)
+        for i in range(10_000):
+            sketch.add(str(i))
+        assert len(sketch.counts) == 16
+        assert len(sketch._heap) <= 4 * 16
+        assert sketch.total == 10_000
+
+    def test_merge(self):
+        values = _zipf_values(20_000, seed=1)
+        a, b = SpaceSaving(capacity=40), SpaceSaving(capacity=40)
+        for value in values[:10_000]:
+            a.add(value)
+        for value in values[10_000:]:
+            b.add(value)
+        a.merge(b)
+        exact = Counter(values)
+        assert [v for v, _, _ in a.top(3)] == [v for v, _ in exact.most_common(3)]
+        assert a.total == 20_000
+        for value, count, error in a.top():
+            assert count - error <= exact[value] <= count
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            SpaceSaving(capacity=0)
+
+
+class TestTDigest:
+    """Tests for TDigest."""
+
+    def _rank_error(self, digest: TDigest, values: list[float], q: float) -> float:
+        return abs(bisect.bisect_left(values, digest.quantile(q)) / len(values) - q)
+
+    def test_empty(self):
+        digest = TDigest()
+        assert digest.quantile(0.5) is None
+        assert digest.count == 0
+
+    def test_small_inputs_exact(self):
+        digest = TDigest()
+        for value in [5, 1, 3]:
+            digest.add(value)
+        assert digest.quantile(0.5) == 3
+        assert digest.quantile(0) == 1
+        assert digest.quantile(1) == 5
+
+    def test_quantiles_within_error(self):
+        rng = random.Random(0)
+        values = [rng.lognormvariate(3, 1) for _ in range(50_000)]
+        digest = TDigest(compression=100)
+        for value in values:
+            digest.add(value)
+        values.sort()
+        for q in (0.001, 0.01, 0.5, 0.9, 0.99, 0.999):
+            assert self._rank_error(digest, values, q) < 0.005, q
+        assert digest.min == values[0] and digest.max == values[-1]
+
+    def test_bounded_size(self):
+        digest = TDigest(compression=50)
+        for i in range(100_000):
+            digest.add(i)
+        assert len(digest.centroids) <= 50
+        assert len(digest._buffer) < digest._buffer_limit
+
+    def test_merge_and_round_trip(self):
+        rng = random.Random(1)
+        values = [rng.expovariate(0.1) for _ in range(30_000)]
+        parts = [TDigest() for _ in range(3)]
+        for i, value in enumerate(values):
+            parts[i % 3].add(value)
+        merged = TDigest.from_dict(parts[0].to_dict())
+        for part in parts[1:]:
+            merged.merge(part)
+        values.sort()
+        assert merged.count == 30_000
+        for q in (0.01, 0.5, 0.99):
+            assert self._rank_error(merged, values, q) < 0.005, q
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            TDigest(compression=5)
+        with pytest.raises(ValueError):
+            TDigest().quantile(1.5)
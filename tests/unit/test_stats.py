@@ -0,0 +1,227 @@
+"""Tests for one-pass pattern and field statistics."""
+import random
+from pathlib import Path
+
+import pytest
+
+from log_sculptor.core.patterns import ParsedRecord, learn_patterns, parse_logs
+from log_sculptor.core.stats import LogStats, QuantileCollector, compute_stats
+from log_sculptor.core.streaming import stream_parse
+
+
+def _write_log(path: Path, lines: int = 1000) -> None:
+    with path.open("w") as f:
+        for i in range(lines):
+            method = "GET" if i % 4 else "POST"
+            f.write(f"2024-01-15 10:00:{i % 60:02d} {method} /api/items/{i} 200 {i % 100}\n")
+            if i % 10 == 0:
+                f.write("??? something odd\n")
+
+
+def _write_latency_log(path: Path, lines: int = 5000, seed: int = 0) -> list[int]:
+    """Request lines with a skewed duration and a size; returns the durations."""
+    rng = random.Random(seed)
+    durations = []
+    with path.open("w") as f:
+        for i in range(lines):
+            duration = int(rng.expovariate(1 / 50)) + 1
+            durations.append(duration)
+            f.write(f"2024-01-15 10:00:{i % 60:02d} GET /api/items took {duration} ms sent {rng.randint(1, 9999)} bytes\n")
+    return durations
+
+
+def _exact_quantile(values: list[int], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class TestLogStats:
+    """Tests for LogStats."""
+
+    def test_counts_and_fields(self, tmp_path: Path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file)
+        patterns = learn_patterns(log_file)
+        data = compute_stats(log_file, patterns).to_dict()
+
+        assert data["lines"] == 1100
+        assert data["unmatched"] + data["matched"] == 1100
+        top = data["patterns"][0]
+        assert top["count"] == 1000
+        fields = top["fields"]
+        methods = next(f for f in fields.values() if f["top"] and f["top"][0][0] == "GET")
+        assert methods["distinct"] == 2 and methods["distinct_exact"]
+        assert methods["top"] == [["GET", 750, 0], ["POST", 250, 0]]
+
+        # The numeric latency column: 0..99, each ten times.
+        latency = next(f for f in fields.values() if "numeric" in f and f["numeric"]["max"] == 99)
+        assert latency["numeric"]["min"] == 0
+        assert abs(latency["numeric"]["p50"] - 49.5) <= 2
+        assert abs(latency["numeric"]["p99"] - 99) <= 2
+        assert 95 <= latency["distinct"] <= 105
+
+    def test_high_cardinality_field_bounded(self, tmp_path: Path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file, lines=5000)
+        patterns = learn_patterns(log_file)
+        stats = compute_stats(log_file, patterns, top_k=3)
+        for fields in stats.fields.values():
+            for field in fields.values():
+                assert len(field.top.counts) <= 12
+                assert field.distinct.exact or field.distinct.counts is None
+        paths = [f for f in stats.to_dict()["patterns"][0]["fields"].values() if f["distinct"] > 4000]
+        assert paths and all(not f["distinct_exact"] and len(f["top"]) == 3 for f in paths)
+
+    def test_merge_matches_single_pass(self, tmp_path: Path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file)
+        patterns = learn_patterns(log_file)
+        records = list(parse_logs(log_file, patterns, detect_types=False))
+        whole = LogStats(patterns)
+        whole.update_many(records)
+        first, second = LogStats(patterns), LogStats(patterns)
+        first.update_many(records[:400])
+        second.update_many(records[400:])
+        first.merge(second)
+
+        merged, single = first.to_dict(), whole.to_dict()
+        assert merged["lines"] == single["lines"]
+        assert [p["count"] for p in merged["patterns"]] == [p["count"] for p in single["patterns"]]
+        for a, b in zip(merged["patterns"], single["patterns"]):
+            for name in b["fields"]:
+                if b["fields"][name]["distinct_exact"]:
+                    assert a["fields"][name]["top"] == b["fields"][name]["top"]
+
+    def test_merge_does_not_share_state(self, tmp_path: Path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file)
+        patterns = learn_patterns(log_file)
+        records = list(parse_logs(log_file, patterns, detect_types=False))
+        other = LogStats(patterns)
+        other.update_many(records[400:])
+        before = other.to_dict()
+
+        merged = LogStats(patterns)
+        merged.merge(other)
+        merged.update_many(records[:400])
+        merged.merge(other)
+        assert other.to_dict() == before
+
+    def test_stream_parse_callback(self, tmp_path: Path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file, lines=200)
+        patterns = learn_patterns(log_file)
+        stats = LogStats(patterns)
+        for _ in stream_parse(log_file, patterns, callback=stats):
+            pass
+        assert stats.to_dict() == compute_stats(log_file, patterns).to_dict()
+
+    def test_custom_quantiles(self, tmp_path: Path):
+        log_file = tmp_path / "app.log"
+        _write_log(log_file, lines=200)
+        patterns = learn_patterns(log_file)
+        data = compute_stats(log_file, patterns).to_dict(quantiles=[0.25, 0.999])
+        numeric = [f["numeric"] for p in data["patterns"] for f in p["fields"].values() if "numeric" in f]
+        assert numeric and all({"p25", "p99.9"} <= set(n) for n in numeric)
+
+
+class TestQuantileCollector:
+    """Tests for QuantileCollector."""
+
+    def _collect(self, tmp_path: Path, lines: int = 5000):
+        log_file = tmp_path / "latency.log"
+        durations = _write_latency_log(log_file, lines)
+        patterns = learn_patterns(log_file)
+        records = list(parse_logs(log_file, patterns, detect_types=False))
+        pattern = patterns.patterns[0]
+        # The field holding the duration: the first NUMBER field after "took".
+        duration_field = next(name for name, value in records[0].fields.items() if value == str(durations[0]))
+        return patterns, records, pattern.id, duration_field, durations
+
+    def test_quantiles_match_exact(self, tmp_path: Path):
+        patterns, records, pattern_id, field, durations = self._collect(tmp_path)
+        collector = QuantileCollector(patterns)
+        collector.update_many(records)
+
+        for q in (0.5, 0.9, 0.99):
+            estimate = collector.quantile(pattern_id, field, q)
+            rank = sum(d <= estimate for d in durations) / len(durations)
+            assert rank == pytest.approx(q, abs=0.01), q
+        summary = collector.summary()[pattern_id][field]
+        assert summary["count"] == len(durations)
+        assert (summary["min"], summary["max"]) == (min(durations), max(durations))
+        assert collector.quantile(pattern_id, "missing", 0.5) is None
+
+    def test_merge_across_chunks(self, tmp_path: Path):
+        patterns, records, pattern_id, field, durations = self._collect(tmp_path)
+        whole = QuantileCollector(patterns)
+        whole.update_many(records)
+        merged = QuantileCollector(patterns)
+        for start in range(0, len(records), 700):
+            chunk = QuantileCollector(patterns)
+            chunk.update_many(records[start:start + 700])
+            merged.merge(chunk)
+
+        digest = merged.digests[pattern_id][field]
+        assert digest.count == len(durations)
+        for q in (0.5, 0.99):
+            assert merged.quantile(pattern_id, field, q) == pytest.approx(_exact_quantile(durations, q), rel=0.05)
+        assert set(merged.digests[pattern_id]) == set(whole.digests[pattern_id])
+
+    def test_bounded_size(self, tmp_path: Path):
+        patterns, records, pattern_id, field, _ = self._collect(tmp_path, lines=20000)
+        collector = QuantileCollector(patterns, compression=50)
+        collector.update_many(records)
+        assert len(collector.digests[pattern_id][field].centroids) < 200
+
+    def test_round_trip(self, tmp_path: Path):
+        patterns, records, pattern_id, field, _ = self._collect(tmp_path)
+        collector = QuantileCollector(patterns)
+        collector.update_many(records)
+        path = tmp_path / "sketches.json"
+        collector.save(path)
+
+        loaded = QuantileCollector.load(path)
+        assert loaded.summary() == collector.summary()
+        # Loaded sketches can still be merged.
+        loaded.merge(collector)
+        assert loaded.digests[pattern_id][field].count == 2 * len(records)
+
+    def test_stream_parse_callback(self, tmp_path: Path):
+        patterns, records, _, _, _ = self._collect(tmp_path, lines=500)
+        collector = QuantileCollector(patterns)
+        for _ in stream_parse(tmp_path / "latency.log", patterns, callback=collector):
+            pass
+        expected = QuantileCollector(patterns)
+        expected.update_many(records)
+        assert collector.summary() == expected.summary()
+
+    def test_named_fields(self):
+        collector = QuantileCollector(fields=["status"])
+        collector.update_many([
+            ParsedRecord(1, "a", {"status": "200", "path": "/x"}, "p1", True),
+            ParsedRecord(2, "b", {"status": "n/a"}, "p1", True),
+            ParsedRecord(3, "c", {"status": "500"}, None, False),
+            ParsedRecord(4, "d", {"status": "404"}, "p2", True),
+        ])
+        assert set(collector.digests) == {"p1", "p2"}
+        assert list(collector.digests["p1"]) == ["status"]
+        assert collector.digests["p1"]["status"].count == 1
+        assert collector.quantile("p2", "status", 0.5) == 404
+
+    def test_non_finite_values_skipped(self, tmp_path: Path):
+        collector = QuantileCollector(fields=["duration"])
+        collector.update_many([
+            ParsedRecord(i, "x", {"duration": value}, "p1", True)
+            for i, value in enumerate(["5", "nan", "inf", "-inf", "Infinity", "7"])
+        ])
+        digest = collector.digests["p1"]["duration"]
+        assert (digest.count, digest.min, digest.max) == (2, 5, 7)
+
+        path = tmp_path / "sketches.json"
+        collector.save(path)
+        loaded = QuantileCollector.load(path)
+        loaded.add(ParsedRecord(7, "x", {"duration": "9"}, "p1", True))
+        loaded.merge(collector)
+        assert loaded.digests["p1"]["duration"].count == 5
+        assert loaded.quantile("p1", "duration", 1.0) == 9
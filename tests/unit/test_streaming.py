@@ -5,6 +5,7 @@ from log_sculptor.core.streaming import (
     stream_parse,
     parallel_learn,
     PatternCache,
+    _iter_mmap_lines,
     _read_lines_mmap,
 )
 from log_sculptor.core.patterns import learn_patterns
@@ -43,6 +44,32 @@ class TestReadLinesMmap:
         lines = list(_read_lines_mmap(log_file))
         assert len(lines) == 4
 
+    def test_block_carry_over(self, tmp_path):
+        """Test lines spanning block boundaries are stitched."""
+        log_file = tmp_path / "blocks.log"
+        log_file.write_bytes(b"alpha\r\nbeta gamma\n\ndelta")
+
+        assert list(_iter_mmap_lines(log_file, block_size=3)) == [b"alpha", b"beta gamma", b"", b"delta"]
+        assert list(_read_lines_mmap(log_file)) == ["alpha", "beta gamma", "", "delta"]
+
+    def test_universal_newlines(self, tmp_path):
+        """Test \\r, \\r\\n and \\n all end lines, at every block boundary."""
+        from log_sculptor.core.reader import iter_lines
+
+        log_file = tmp_path / "mixed.log"
+        log_file.write_bytes(b"one\rtwo\r\nthree\n\r\rfour\r\n\nfive\r")
+        expected = list(iter_lines(log_file))
+        assert expected == ["one", "two", "three", "", "", "four", "", "five"]
+        for block_size in range(1, 40):
+            lines = [line.decode() for line in _iter_mmap_lines(log_file, block_size=block_size)]
+            assert lines == expected, block_size
+
+    def test_empty_file(self, tmp_path):
+        """Test empty files yield nothing."""
+        log_file = tmp_path / "empty.log"
+        log_file.write_bytes(b"")
+        assert list(_read_lines_mmap(log_file)) == []
+
 
 class TestStreamParse:
     """Tests for stream parsing."""
@@ -215,3 +242,35 @@ class TestPatternCacheEdgeCases:
         # Either matches or doesn't
         if pattern is None:
             assert fields is None
+
+
+class TestBytesMode:
+    """Tests for bytes-mode stream parsing."""
+
+    def test_same_records_as_str_path(self, tmp_path, large_log_file):
+        """Test bytes mode yields identical records, including non-ASCII lines."""
+        log_file = tmp_path / "mixed.log"
+        log_file.write_bytes(
+            large_log_file.read_bytes()
+            + "caf\u00e9 opened\r\n\nINFO done 42\n".encode()
+            + b"bad \xff byte\n"
+        )
+        patterns = learn_patterns(log_file)
+
+        expected = list(stream_parse(log_file, patterns, use_mmap=False))
+        actual = list(stream_parse(log_file, patterns, bytes_mode=True))
+
+        assert actual == expected
+        assert any(r.matched for r in actual)
+
+    def test_cr_only_line_endings(self, tmp_path, large_log_file):
+        """Test bytes mode splits bare \\r line endings like the str path."""
+        log_file = tmp_path / "mac.log"
+        log_file.write_bytes(large_log_file.read_bytes().replace(b"\n", b"\r"))
+        patterns = learn_patterns(log_file)
+
+        expected = list(stream_parse(log_file, patterns, use_mmap=False))
+        actual = list(stream_parse(log_file, patterns, bytes_mode=True))
+
+        assert len(actual) > 1
+        assert actual == expected
@@ -0,0 +1,142 @@
+"""Tests for time-range parsing."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import log_sculptor.core.timerange as timerange
+from log_sculptor.core.index import LineIndex, sidecar_path
+from log_sculptor.core.patterns import learn_patterns
+from log_sculptor.core.timerange import (
+    find_start_offset,
+    line_time,
+    parse_duration,
+    parse_time_bound,
+    parse_time_range,
+    parse_time_zone,
+)
+
+T0 = datetime(2024, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def timed_log(tmp_path):
+    """Time-ordered log, one line per second, with a continuation every 10 lines."""
+    path = tmp_path / "timed.log"
+    lines = []
+    for i in range(3000):
+        lines.append(f"{T0 + timedelta(seconds=i):%Y-%m-%d %H:%M:%S} INFO request {i} done")
+        if i % 10 == 0:
+            lines.append("    continuation")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def small_span(monkeypatch):
+    monkeypatch.setattr(timerange, "MIN_SEARCH_SPAN", 256)
+
+
+class TestTimeParsing:
+    """Tests for time bound parsing."""
+
+    def test_parse_duration(self):
+        assert parse_duration("15m") == timedelta(minutes=15)
+        assert parse_duration("1.5h") == timedelta(hours=1.5)
+        assert parse_duration("soon") is None
+
+    def test_parse_time_bound(self):
+        now = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        assert parse_time_bound("2h", now=now) == datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+        assert parse_time_bound("2024-01-15T10:00:00Z") == T0
+        with pytest.raises(ValueError):
+            parse_time_bound("whenever")
+
+    def test_parse_time_zone(self):
+        assert parse_time_zone("UTC") is timezone.utc
+        assert parse_time_zone("local") is None
+        assert parse_time_zone("Asia/Tokyo").utcoffset(datetime(2024, 1, 15)) == timedelta(hours=9)
+        with pytest.raises(ValueError):
+            parse_time_zone("Mars/Olympus_Mons")
+
+    def test_line_time(self):
+        assert line_time("2024-01-15 10:00:00 INFO x") == T0
+        assert line_time('1.2.3.4 - - [15/Jan/2024:10:00:00 +0000] "GET /"') == T0
+        assert line_time("no time here") is None
+
+
+class TestTimeRange:
+    """Tests for binary-search time-range parsing."""
+
+    def test_find_start_offset(self, timed_log, small_span):
+        patterns = learn_patterns(timed_log)
+        offset = find_start_offset(timed_log, patterns, T0 + timedelta(seconds=2000))
+        data = timed_log.read_bytes()
+        assert 0 < offset and data[offset - 1:offset] == b"\n"
+        assert line_time(data[offset:].split(b"\n", 1)[0].decode()) <= T0 + timedelta(seconds=2000)
+
+    def test_window_matches_full_scan(self, timed_log, small_span):
+        patterns = learn_patterns(timed_log)
+        since, until = T0 + timedelta(seconds=1500), T0 + timedelta(seconds=1530)
+        records = list(parse_time_range(timed_log, patterns, since, until, detect_types=False))
+
+        all_lines = timed_log.read_text().splitlines()
+        expected_first = all_lines.index("2024-01-15 10:25:00 INFO request 1500 done") + 1
+        assert records[0].line_number == expected_first
+        assert records[0].raw == all_lines[expected_first - 1]
+        assert records[-1].raw == "2024-01-15 10:25:29 INFO request 1529 done"
+        assert sum(1 for r in records if r.raw == "    continuation") == 3
+        assert len(records) == 33
+
+    def test_line_numbers_with_index(self, timed_log, small_span):
+        LineIndex.build(timed_log, interval=100).save(sidecar_path(timed_log))
+        patterns = learn_patterns(timed_log)
+        since = T0 + timedelta(seconds=2500)
+        records = list(parse_time_range(timed_log, patterns, since, since + timedelta(seconds=1)))
+        assert [r.raw for r in records] == ["2024-01-15 10:41:40 INFO request 2500 done", "    continuation"]
+        assert [r.line_number for r in records] == [2751, 2752]
+
+    def test_out_of_order_tolerance(self, tmp_path, small_span):
+        path = tmp_path / "jitter.log"
+        lines = [f"{T0 + timedelta(seconds=i):%Y-%m-%d %H:%M:%S} INFO tick {i}" for i in range(500)]
+        # A late line inside the window, written after later lines.
+        lines.insert(305, f"{T0 + timedelta(seconds=299):%Y-%m-%d %H:%M:%S} INFO tick late")
+        path.write_text("\n".join(lines) + "\n")
+        patterns = learn_patterns(path)
+
+        since, until = T0 + timedelta(seconds=297), T0 + timedelta(seconds=300)
+        strict = [r.raw for r in parse_time_range(path, patterns, since, until)]
+        tolerant = [r.raw for r in parse_time_range(path, patterns, since, until, tolerance=timedelta(seconds=10))]
+        assert len(strict) == 3
+        assert tolerant == strict + [lines[305]]
+
+    def test_open_ended(self, timed_log):
+        patterns = learn_patterns(timed_log)
+        assert len(list(parse_time_range(timed_log, patterns, until=T0 + timedelta(seconds=5)))) == 6
+        assert len(list(parse_time_range(timed_log, patterns, since=T0 + timedelta(seconds=2995)))) == 5
+
+    def test_naive_timestamps_in_time_zone(self, timed_log, small_span):
+        from zoneinfo import ZoneInfo
+
+        patterns = learn_patterns(timed_log)
+        # The log's naive 10:25:00 is 01:25:00 UTC when written in Tokyo.
+        since = T0 - timedelta(hours=9) + timedelta(seconds=1500)
+        until = since + timedelta(seconds=30)
+        records = list(parse_time_range(timed_log, patterns, since, until, detect_types=False,
+                                        tz=ZoneInfo("Asia/Tokyo")))
+        assert records[0].raw == "2024-01-15 10:25:00 INFO request 1500 done"
+        assert len(records) == 33
+        # Taken as UTC, every line is after the window.
+        assert list(parse_time_range(timed_log, patterns, since, until)) == []
+
+    def test_naive_timestamps_in_local_time(self, timed_log, monkeypatch):
+        import time
+
+        monkeypatch.setenv("TZ", "Asia/Tokyo")
+        time.tzset()
+        try:
+            patterns = learn_patterns(timed_log)
+            since = T0 - timedelta(hours=9) + timedelta(seconds=2995)
+            assert len(list(parse_time_range(timed_log, patterns, since=since, tz=None))) == 5
+        finally:
+            monkeypatch.undo()
+            time.tzset()
@@ -1,5 +1,23 @@
 """Tokenizer tests."""
-from log_sculptor.core.tokenizer import tokenize, Token, TokenType, token_signature
+from log_sculptor.core.tokenizer import (
+    tokenize,
+    tokenize_batch,
+    tokenize_signature,
+    tokenize_spans,
+    Token,
+    TokenType,
+    TOKEN_TYPE_CODES,
+    token_signature,
+)
+
+SAMPLE_LINES = [
+    "",
+    "INFO test",
+    '2024-01-15 10:30:00 INFO [main] alice from 192.168.1.1 took 35ms "GET /x"',
+    "Jan 15 10:30:00 host sshd[123]: -4.5 caf\u00e9 \u0663 @@",
+    "unterminated \"quote and (paren",
+    "\ttabs\r\n and\x00nul",
+]
 
 
 class TestTokenize:
@@ -138,3 +156,56 @@ class TestTokenSignature:
         sig = token_signature(tokens)
 
         assert sig == (TokenType.IP, TokenType.WORD, TokenType.NUMBER)
+
+
+class TestTokenizeSignature:
+    """Tests for signature-only tokenization."""
+
+    def test_matches_token_signature(self):
+        for line in SAMPLE_LINES:
+            assert tokenize_signature(line) == token_signature(tokenize(line))
+
+    def test_empty(self):
+        assert tokenize_signature("") == ()
+
+
+class TestTokenizeSpans:
+    """Tests for span-only tokenization."""
+
+    def test_tokens_roundtrip(self):
+        for line in SAMPLE_LINES:
+            spans = tokenize_spans(line)
+            assert spans.tokens() == tokenize(line)
+            assert spans.signature() == tokenize_signature(line)
+
+    def test_lazy_values(self):
+        spans = tokenize_spans("user 42")
+        assert len(spans) == 3
+        assert spans.types[2] == TOKEN_TYPE_CODES[TokenType.NUMBER]
+        assert spans.type(0) == TokenType.WORD
+        assert spans.value(2) == "42"
+        assert (spans.starts[2], spans.ends[2]) == (5, 7)
+
+
+class TestTokenizeBatch:
+    """Tests for columnar batch tokenization."""
+
+    def test_matches_per_line_tokenize(self):
+        batch = tokenize_batch(SAMPLE_LINES)
+        assert len(batch) == len(SAMPLE_LINES)
+        for i, line in enumerate(SAMPLE_LINES):
+            assert batch.tokens(i) == tokenize(line)
+            assert batch.spans(i).tokens() == tokenize(line)
+        assert list(batch.signatures()) == [tokenize_signature(line) for line in SAMPLE_LINES]
+
+    def test_flat_columns(self):
+        batch = tokenize_batch(["a 1", "b"])
+        assert batch.token_count == 4
+        assert list(batch.line_offsets) == [0, 3, 4]
+        assert batch.starts.typecode == "i"
+        assert (batch.starts[3], batch.ends[3]) == (0, 1)
+
+    def test_empty(self):
+        batch = tokenize_batch([])
+        assert len(batch) == 0
+        assert list(batch.line_offsets) == [0]